@@ -23,6 +23,7 @@ the classes contained therein.
 import collections
 import collections.abc
 import copy
+import hashlib
 from importlib import import_module
 import inspect
 import logging
@@ -31,6 +32,7 @@ import os
 
 from django.conf import settings
 from django.conf.urls import include
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.urls import re_path
 from django.urls import reverse
@@ -62,25 +64,19 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
-# FIXME(lhcheng): We need to find a better way to cache the result.
-# Rather than storing it in the session, we could leverage the Django
-# session. Currently, this has been causing issue with cookie backend,
-# adding 1600+ in the cookie size.
-def access_cached(func):
-    def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
-
-        key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
-    return inner
+def _get_access_cache_key(request):
+    session = getattr(request, 'session', None) or {}
+    token_id = getattr(session.get('token'), 'id', None)
+    if not token_id:
+        return None
+    # The domain panels are only accessible with a domain scoped token, and
+    # the panels of a service depend on the region, which can be switched
+    # with the same token.
+    domain_token = session.get('domain_token')
+    scope = (token_id, getattr(domain_token, 'auth_token', None),
+             session.get('region_endpoint'), session.get('services_region'))
+    return 'horizon-access:%s' % hashlib.sha256(
+        repr(scope).encode('utf-8')).hexdigest()
 
 
 def _wrapped_include(arg):
@@ -135,15 +131,11 @@ class HorizonComponent(object):
                 urlpatterns = []
         return urlpatterns
 
-    # FIXME(lhcheng): Removed the access_cached decorator for now until
-    # a better implementation has been figured out. This has been causing
-    # issue with cookie backend, adding 1600+ in the cookie size.
-    # @access_cached
     def can_access(self, context):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The result of the method is cached by token for the navigation.
         """
         return self.allowed(context)
 
@@ -697,6 +689,41 @@ class LazyURLPattern(SimpleLazyObject):
         return self._wrapped[idx]
 
 
+class NavigationAccess(object):
+    """Which dashboards and panels the user can access.
+
+    The ``can_access`` results of the navigation are kept in the Django
+    cache for ``NAVIGATION_ACCESS_CACHE_TIMEOUT`` seconds by token, rather
+    than in the session, so that the navigation is only checked component
+    by component on the first page rendered with a token.
+    """
+
+    def __init__(self, request):
+        self.timeout = settings.NAVIGATION_ACCESS_CACHE_TIMEOUT
+        self.key = _get_access_cache_key(request) if self.timeout else None
+        self.results = (cache.get(self.key) if self.key else None) or {}
+        self.changed = False
+
+    def can_access(self, context, component, dashboard=None):
+        """Returns whether the user can access a dashboard or a panel.
+
+        :param dashboard: the dashboard of the component if it is a panel.
+        """
+        key = component.slug
+        if dashboard is not None:
+            key = '%s/%s' % (dashboard.slug, key)
+        if key not in self.results:
+            self.results[key] = component.can_access(context)
+            self.changed = True
+        return self.results[key]
+
+    def save(self):
+        """Caches the results computed since the last save, if any."""
+        if self.changed and self.key:
+            cache.set(self.key, self.results, self.timeout)
+        self.changed = False
+
+
 class Site(Registry, HorizonComponent):
     """The overarching class which encompasses all dashboards and panels."""
 
@@ -774,6 +801,15 @@ class Site(Registry, HorizonComponent):
             return dashboards
         return sorted(self._registry.values())
 
+    def get_access(self, context):
+        """Returns the :class:`NavigationAccess` of the user of a request."""
+        request = context['request']
+        access = getattr(request, '_horizon_access', None)
+        if access is None:
+            access = NavigationAccess(request)
+            request._horizon_access = access
+        return access
+
     def get_default_dashboard(self):
         """Returns the default :class:`~horizon.Dashboard` instance.
 
@@ -54,6 +54,18 @@ SESSION_COOKIE_MAX_SIZE = 4093
 # memory usage when caching. It should at least be 2 x the number of threads
 # with a little bit of extra buffer.
 MEMOIZED_MAX_SIZE_DEFAULT = 25
+# Batch actions with a concurrency greater than 1 (e.g. deleting the selected
+# instances or volumes) are taken on the objects in a pool of at most
+# BATCH_ACTION_MAX_WORKERS threads shared by all requests.
+BATCH_ACTION_MAX_WORKERS = 10
+# Function called as function(request, action, objects) to take a batch
+# action with a background_threshold in a background job, where objects is
+# a list of (object id, object display name) tuples. Batch actions are
+# always taken in the request if it is not set.
+BATCH_ACTION_JOB_QUEUE = None
+# Number of seconds the dashboards and panels shown in the navigation for a
+# token are cached for, in the Django cache. 0 disables the cache.
+NAVIGATION_ACCESS_CACHE_TIMEOUT = 300
 HORIZON_COMPRESS_OFFLINE_CONTEXT_BASE = {}
 
 SITE_BRANDING = _("Horizon")
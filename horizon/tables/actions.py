@@ -17,6 +17,8 @@ from collections import OrderedDict
 import copy
 import functools
 import logging
+import os
+import threading
 import types
 
 from django.conf import settings
@@ -25,7 +27,10 @@ from django.template.loader import render_to_string
 from django import urls
 from django.utils.functional import Promise
 from django.utils.http import urlencode
+from django.utils import translation
 from django.utils.translation import gettext_lazy as _
+import futurist
+from futurist import waiters
 
 from horizon import exceptions
 from horizon import messages
@@ -38,6 +43,27 @@ LOG = logging.getLogger(__name__)
 
 STRING_SEPARATOR = "__"
 
+_batch_executor = None
+_batch_executor_pid = None
+_batch_executor_lock = threading.Lock()
+
+
+def _get_batch_executor():
+    """Return the process-wide pool running concurrent batch actions.
+
+    It has at most BATCH_ACTION_MAX_WORKERS threads shared by all the
+    requests, and is created again in a forked child process.
+    """
+    global _batch_executor, _batch_executor_pid
+    pid = os.getpid()
+    if _batch_executor is None or _batch_executor_pid != pid:
+        with _batch_executor_lock:
+            if _batch_executor is None or _batch_executor_pid != pid:
+                _batch_executor = futurist.ThreadPoolExecutor(
+                    max_workers=settings.BATCH_ACTION_MAX_WORKERS)
+                _batch_executor_pid = pid
+    return _batch_executor
+
 
 class BaseActionMetaClass(type):
     """Metaclass for adding all actions options from inheritance tree to action.
@@ -650,10 +676,32 @@ class BatchAction(Action):
        Optional message for providing an appropriate help text for
        the horizon user.
 
+    .. attribute:: concurrency
+
+       Optional maximum number of objects the action is taken on at the
+       same time. Defaults to ``1``, which takes the action on the objects
+       one after the other. With a greater value ``action`` is called in
+       threads of a pool shared by the whole process (see the
+       ``BATCH_ACTION_MAX_WORKERS`` setting), so ``action`` must not rely
+       on the state ``allowed`` stores on the action for each object.
+       ``allowed`` and ``update`` are still called in the request thread.
+
+    .. attribute:: background_threshold
+
+       Optional minimum number of selected objects for which the action is
+       taken in a background job rather than in the request. Defaults to
+       ``None``, which never uses a background job. The job is handed to
+       the function set in the ``BATCH_ACTION_JOB_QUEUE`` setting, and
+       nothing is run in the background if it is not set. As with
+       ``concurrency``, ``action`` must not rely on the state ``allowed``
+       stores on the action, and ``update`` is not called.
+
     """
 
     help_text = _("This action cannot be undone.")
     default_message_level = "success"
+    concurrency = 1
+    background_threshold = None
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -680,6 +728,9 @@ class BatchAction(Action):
         self.success_ids = []
 
         self.help_text = kwargs.get('help_text', self.help_text)
+        self.concurrency = kwargs.get('concurrency', self.concurrency)
+        self.background_threshold = kwargs.get('background_threshold',
+                                               self.background_threshold)
 
     def _allowed(self, request, datum=None):
         # Override the default internal action method to prevent batch
@@ -752,30 +803,116 @@ class BatchAction(Action):
         attrs.update({'data-batch-action': 'true'})
         return attrs
 
-    def handle(self, table, request, obj_ids):
-        action_success = []
-        action_failure = []
-        action_not_allowed = []
+    def _check_allowed(self, table, request, obj_ids):
         for datum_id in obj_ids:
             datum = table.get_object_by_id(datum_id)
             datum_display = table.get_object_display(datum) or datum_id
-            if not table._filter_action(self, request, datum):
-                action_not_allowed.append(datum_display)
+            allowed = table._filter_action(self, request, datum)
+            if not allowed:
                 LOG.warning('Permission denied to %(name)s: "%(dis)s"', {
                     'name': self._get_action_name(past=True).lower(),
                     'dis': datum_display
                 })
+            yield datum_id, datum, datum_display, allowed
+
+    def _take_action_serially(self, table, request, obj_ids):
+        # Each object is checked and the action taken on it before the next
+        # object is checked, since allowed() may store per-object state on
+        # the action.
+        for datum_id, datum, datum_display, allowed in self._check_allowed(
+                table, request, obj_ids):
+            if not allowed:
+                yield datum_id, datum_display, False, None
                 continue
             try:
                 self.action(request, datum_id)
                 # Call update to invoke changes if needed
                 self.update(request, datum)
+            except Exception as ex:
+                yield datum_id, datum_display, True, ex
+            else:
+                yield datum_id, datum_display, True, None
+
+    def _take_action_concurrently(self, table, request, obj_ids):
+        allowed = []
+        for datum_id, datum, datum_display, is_allowed in self._check_allowed(
+                table, request, obj_ids):
+            if not is_allowed:
+                yield datum_id, datum_display, False, None
+                continue
+            allowed.append((datum_id, datum, datum_display))
+
+        language = translation.get_language()
+
+        def action(datum_id):
+            with translation.override(language):
+                self.action(request, datum_id)
+
+        # No more than self.concurrency objects of this action are
+        # submitted to the shared pool at a time.
+        executor = _get_batch_executor()
+        futures = []
+        not_done = set()
+        for datum_id, datum, datum_display in allowed:
+            if len(not_done) >= self.concurrency:
+                not_done = waiters.wait_for_any(not_done).not_done
+            future = executor.submit(action, datum_id)
+            futures.append(future)
+            not_done.add(future)
+        waiters.wait_for_all(not_done)
+
+        for (datum_id, datum, datum_display), future in zip(allowed, futures):
+            ex = future.exception()
+            if ex is None:
+                try:
+                    # Call update to invoke changes if needed
+                    self.update(request, datum)
+                except Exception as update_ex:
+                    ex = update_ex
+            yield datum_id, datum_display, True, ex
+
+    def _enqueue(self, enqueue, table, request, obj_ids):
+        objects = []
+        action_not_allowed = []
+        for datum_id, datum, datum_display, allowed in self._check_allowed(
+                table, request, obj_ids):
+            if allowed:
+                objects.append((datum_id, datum_display))
+            else:
+                action_not_allowed.append(datum_display)
+        self._add_messages(request, [], [], action_not_allowed)
+        if objects:
+            enqueue(request, self, objects)
+            msg = _('%(action)s: %(count)s items will be processed in the '
+                    'background.')
+            params = {"action": self._get_action_name(objects),
+                      "count": len(objects)}
+            messages.info(request, msg % params)
+        return shortcuts.redirect(self.get_success_url(request))
+
+    def handle(self, table, request, obj_ids):
+        job_queue = utils_settings.import_setting("BATCH_ACTION_JOB_QUEUE")
+        if (job_queue and self.background_threshold and
+                len(obj_ids) >= self.background_threshold):
+            return self._enqueue(job_queue, table, request, obj_ids)
+
+        action_success = []
+        action_failure = []
+        action_not_allowed = []
+        if self.concurrency > 1 and len(obj_ids) > 1:
+            results = self._take_action_concurrently(table, request, obj_ids)
+        else:
+            results = self._take_action_serially(table, request, obj_ids)
+        for datum_id, datum_display, allowed, ex in results:
+            if not allowed:
+                action_not_allowed.append(datum_display)
+            elif ex is None:
                 action_success.append(datum_display)
                 self.success_ids.append(datum_id)
                 LOG.info('%(action)s: "%(datum_display)s"',
                          {'action': self._get_action_name(past=True),
                           'datum_display': datum_display})
-            except Exception as ex:
+            else:
                 handled_exc = isinstance(ex, exceptions.HandledException)
                 if handled_exc:
                     # In case of HandledException, an error message should be
@@ -798,6 +935,12 @@ class BatchAction(Action):
                     'Action %(action)s Failed for %(reason)s', {
                         'action': action_description, 'reason': ex})
 
+        self._add_messages(request, action_success, action_failure,
+                           action_not_allowed)
+        return shortcuts.redirect(self.get_success_url(request))
+
+    def _add_messages(self, request, action_success, action_failure,
+                      action_not_allowed):
         success_message_level = getattr(messages, self.default_message_level)
         if action_not_allowed:
             msg = _('You are not allowed to %(action)s: %(objs)s')
@@ -819,8 +962,6 @@ class BatchAction(Action):
                       "objs": functions.lazy_join(", ", action_success)}
             success_message_level(request, msg % params)
 
-        return shortcuts.redirect(self.get_success_url(request))
-
 
 class DeleteAction(BatchAction):
     """A table action used to perform delete operations on table data.
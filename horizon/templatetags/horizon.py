@@ -57,6 +57,7 @@ def horizon_nav(context):
     current_dashboard = context['request'].horizon.get('dashboard', None)
     current_panel_group = None
     current_panel = context['request'].horizon.get('panel', None)
+    access = Horizon.get_access(context)
     dashboards = []
     for dash in Horizon.get_dashboards():
         panel_groups = dash.get_panel_groups()
@@ -65,21 +66,22 @@ def horizon_nav(context):
             allowed_panels = []
             for panel in group:
                 if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
+                        access.can_access(context, panel, dash)):
                     allowed_panels.append(panel)
                 elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
+                        access.can_access(context, panel, dash)):
                     allowed_panels.append(panel)
                 if panel == current_panel:
                     current_panel_group = group.slug
             if allowed_panels:
                 non_empty_groups.append((group, allowed_panels))
         if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
+                access.can_access(context, dash)):
             dashboards.append((dash, OrderedDict(non_empty_groups)))
         elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
+                access.can_access(context, dash)):
             dashboards.append((dash, OrderedDict(non_empty_groups)))
+    access.save()
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -94,13 +96,15 @@ def horizon_main_nav(context):
     if 'request' not in context:
         return {}
     current_dashboard = context['request'].horizon.get('dashboard', None)
+    access = Horizon.get_access(context)
     dashboards = []
     for dash in Horizon.get_dashboards():
-        if dash.can_access(context):
+        if access.can_access(context, dash):
             if callable(dash.nav) and dash.nav(context):
                 dashboards.append(dash)
             elif dash.nav:
                 dashboards.append(dash)
+    access.save()
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -114,22 +118,24 @@ def horizon_dashboard_nav(context):
         return {}
     dashboard = context['request'].horizon['dashboard']
     panel_groups = dashboard.get_panel_groups()
+    access = Horizon.get_access(context)
     non_empty_groups = []
 
     for group in panel_groups.values():
         allowed_panels = []
         for panel in group:
             if (callable(panel.nav) and panel.nav(context) and
-                    panel.can_access(context)):
+                    access.can_access(context, panel, dashboard)):
                 allowed_panels.append(panel)
             elif (not callable(panel.nav) and panel.nav and
-                    panel.can_access(context)):
+                    access.can_access(context, panel, dashboard)):
                 allowed_panels.append(panel)
         if allowed_panels:
             if group.name is None:
                 non_empty_groups.append((dashboard.name, allowed_panels))
             else:
                 non_empty_groups.append((group.name, allowed_panels))
+    access.save()
 
     return {'components': OrderedDict(non_empty_groups),
             'user': context['request'].user,
@@ -15,6 +15,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 import unittest
 from unittest import mock
 import uuid
@@ -1429,6 +1430,127 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(req.session.get(self.fil_field_param), 'status')
 
 
+class MyConcurrentBatchAction(MyBatchAction):
+    name = "concurrent"
+    concurrency = 2
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        # the first two objects are only done if they run at the same time
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def allowed(self, request, datum=None):
+        return datum is None or datum.id != '3'
+
+    def action(self, request, obj_id):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if obj_id in ('1', '2'):
+                self.barrier.wait()
+            if obj_id == '2':
+                raise Exception('failed')
+            if obj_id == '4':
+                raise exceptions.HandledException(
+                    (Exception, Exception('handled'), None))
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+class MyConcurrentTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        table_actions = (MyConcurrentBatchAction,)
+
+
+class ConcurrentBatchActionTests(test.TestCase):
+
+    def test_concurrent_batch_action(self):
+        req = self.factory.post('/my_url/', {
+            'action': 'my_table__concurrent',
+            'object_ids': ['1', '2', '3', '4']})
+        self.table = MyConcurrentTable(req, TEST_DATA)
+        handled = self.table.maybe_handle()
+        self.assertEqual(302, handled.status_code)
+
+        action = self.table.base_actions['concurrent']
+        self.assertEqual(2, action.max_running)
+        self.assertEqual(['1'], action.success_ids)
+        self.assertEqual(
+            ['You are not allowed to batch item: object_3',
+             'Unable to batch item: object_2',
+             'Batched Item: object_1'],
+            [str(m.message) for m in req._messages])
+
+    def test_single_object_taken_serially(self):
+        req = self.factory.post('/my_url/', {
+            'action': 'my_table__concurrent__3'})
+        self.table = MyConcurrentTable(req, TEST_DATA)
+        with mock.patch.object(actions, '_get_batch_executor') as executor:
+            self.table.maybe_handle()
+        executor.assert_not_called()
+        self.assertEqual(['You are not allowed to batch item: object_3'],
+                         [str(m.message) for m in req._messages])
+
+
+class MyBackgroundBatchAction(MyBatchAction):
+    name = "background"
+    background_threshold = 3
+
+    def allowed(self, request, datum=None):
+        return datum is None or datum.id != '3'
+
+
+class MyBackgroundTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        table_actions = (MyBackgroundBatchAction,)
+
+
+class BackgroundBatchActionTests(test.TestCase):
+
+    def _post(self, obj_ids):
+        req = self.factory.post('/my_url/', {
+            'action': 'my_table__background', 'object_ids': obj_ids})
+        self.table = MyBackgroundTable(req, TEST_DATA)
+        return req, self.table.maybe_handle()
+
+    def test_enqueued(self):
+        enqueue = mock.Mock()
+        with override_settings(BATCH_ACTION_JOB_QUEUE=enqueue), \
+                mock.patch.object(MyBackgroundBatchAction,
+                                  'action') as mock_action:
+            req, handled = self._post(['1', '2', '3', '4'])
+        self.assertEqual(302, handled.status_code)
+        mock_action.assert_not_called()
+        action = self.table.base_actions['background']
+        enqueue.assert_called_once_with(
+            req, action,
+            [('1', 'object_1'), ('2', 'object_2'), ('4', 'öbject_4')])
+        self.assertEqual(
+            ['You are not allowed to batch item: object_3',
+             'Batch Items: 3 items will be processed in the background.'],
+            [str(m.message) for m in req._messages])
+
+    def test_below_threshold_not_enqueued(self):
+        enqueue = mock.Mock()
+        with override_settings(BATCH_ACTION_JOB_QUEUE=enqueue):
+            req, handled = self._post(['1', '2'])
+        enqueue.assert_not_called()
+        self.assertEqual(['Batched Items: object_1, object_2'],
+                         [str(m.message) for m in req._messages])
+
+    def test_no_job_queue(self):
+        req, handled = self._post(['1', '2', '4'])
+        self.assertEqual(['Batched Items: object_1, object_2, öbject_4'],
+                         [str(m.message) for m in req._messages])
+
+
 class FormsetTableTests(test.TestCase):
 
     def test_populate(self):
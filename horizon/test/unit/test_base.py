@@ -18,9 +18,11 @@
 #    under the License.
 
 import importlib
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.test.utils import override_settings
 from django import urls
@@ -563,3 +565,68 @@ class RbacHorizonTests(test.TestCase):
                                  transform=repr)
 
         self.assertTrue(dogs.can_access(context))
+
+    def _can_access_all(self, request):
+        context = {'request': request}
+        access = base.Horizon.get_access(context)
+        results = {}
+        for dash in base.Horizon.get_dashboards():
+            results[dash.slug] = access.can_access(context, dash)
+            for panel in dash.get_panels():
+                results[panel.slug] = access.can_access(context, panel, dash)
+        access.save()
+        return results
+
+    def test_rbac_access_cached(self):
+        cache.clear()
+        self.request.session['token'] = mock.Mock(id='token-1')
+
+        results = self._can_access_all(self.request)
+        self.assertFalse(results['rbac_panel_no'])
+        self.assertTrue(results['dogs'])
+        self.assertTrue(results['rbac_panel_yes'])
+
+        # Another request with the same token uses the cached results.
+        request = self.factory.get('/')
+        request.session = self.request.session
+        with mock.patch.object(RbacYesAccessPanel, 'allowed') as allowed:
+            self.assertEqual(results, self._can_access_all(request))
+        allowed.assert_not_called()
+
+        # A new token does not.
+        request = self.factory.get('/')
+        request.session = {'token': mock.Mock(id='token-2')}
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=False) as allowed:
+            results = self._can_access_all(request)
+        allowed.assert_called_with({'request': request})
+        self.assertFalse(results['rbac_panel_yes'])
+        self.assertNotIn('allowed', request.session)
+
+    def test_rbac_access_cached_by_region(self):
+        cache.clear()
+        self.request.session['token'] = mock.Mock(id='token-1')
+        self.request.session['services_region'] = 'RegionOne'
+        self._can_access_all(self.request)
+
+        # Switching the region keeps the token but not the cached results.
+        request = self.factory.get('/')
+        request.session = dict(self.request.session,
+                               services_region='RegionTwo')
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as allowed:
+            self._can_access_all(request)
+        self.assertTrue(allowed.called)
+
+    @override_settings(NAVIGATION_ACCESS_CACHE_TIMEOUT=0)
+    def test_rbac_access_not_cached(self):
+        cache.clear()
+        self.request.session['token'] = mock.Mock(id='token-1')
+        self._can_access_all(self.request)
+
+        request = self.factory.get('/')
+        request.session = self.request.session
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as allowed:
+            self._can_access_all(request)
+        self.assertTrue(allowed.called)
@@ -0,0 +1,39 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.test import RequestFactory
+
+from horizon.test import helpers as test
+from horizon.utils import csvbase
+
+
+class RowsCsvStreamingResponse(csvbase.BaseCsvStreamingResponse):
+    columns = ['name', 'value']
+
+    def get_row_data(self):
+        yield ('first', 1)
+        yield ('second', 2)
+
+
+class CsvStreamingResponseTests(test.TestCase):
+    def test_streaming_content(self):
+        request = RequestFactory().get('/')
+        response = RowsCsvStreamingResponse(request, None, {}, 'text/csv',
+                                            filename='rows.csv')
+
+        content = b''.join(response.streaming_content).decode()
+
+        self.assertEqual('"name","value"\r\n'
+                         '"first","1"\r\n'
+                         '"second","2"\r\n', content)
+        self.assertEqual('attachment; filename="rows.csv"',
+                         response['Content-Disposition'])
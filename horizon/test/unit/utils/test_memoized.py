@@ -10,6 +10,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import functools
+import threading
+import timeit
+import weakref
+
 from horizon.test import helpers as test
 from horizon.utils import memoized
 
@@ -80,3 +86,129 @@ class MemoizedTests(test.TestCase):
         cache_calls(4)
         self.assertEqual(9, len(values_list))
         # 4 is readded, 5 is dropped
+
+    def test_memoized_decorator_cache_none(self):
+        values_list = []
+
+        @memoized.memoized
+        def cache_calls(param):
+            values_list.append(param)
+
+        cache_calls(1)
+        cache_calls(1)
+        self.assertEqual([1], values_list)
+
+    def test_memoized_decorator_weakref_removed(self):
+        values_list = []
+
+        class Request(object):
+            pass
+
+        @memoized.memoized
+        def cache_calls(request):
+            values_list.append(request)
+            return len(values_list)
+
+        request = Request()
+        self.assertEqual(1, cache_calls(request))
+        self.assertEqual(1, cache_calls(request))
+        self.assertEqual(2, cache_calls(Request()))
+        # The value cached for a request is removed with the request.
+        self.assertEqual(3, cache_calls(Request()))
+        self.assertEqual(1, cache_calls(request))
+
+    def test_memoized_decorator_single_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+        values_list = []
+
+        @memoized.memoized
+        def cache_calls(param):
+            values_list.append(param)
+            started.set()
+            release.wait(5)
+            return param
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            cache_calls('a'))) for x in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(['a'], values_list)
+        self.assertEqual(['a'] * 5, results)
+
+    def test_memoized_decorator_exception_not_cached(self):
+        values_list = []
+
+        @memoized.memoized
+        def cache_calls(param):
+            values_list.append(param)
+            raise ValueError(param)
+
+        self.assertRaises(ValueError, cache_calls, 1)
+        self.assertRaises(ValueError, cache_calls, 1)
+        self.assertEqual([1, 1], values_list)
+
+
+def _locked_memoized(func):
+    """The memoizer before the lock-free hit path, as a baseline."""
+    cache = collections.OrderedDict()
+    locks = collections.defaultdict(threading.Lock)
+
+    @functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        key = None
+
+        def remove(ref):
+            cache.pop(key, None)
+            locks.pop(key, None)
+
+        def try_weakref(arg):
+            try:
+                return weakref.ref(arg, remove)
+            except TypeError:
+                return arg
+
+        key = (tuple(try_weakref(arg) for arg in args),
+               tuple(sorted((name, try_weakref(value))
+                            for (name, value) in kwargs.items())))
+        with locks[key]:
+            try:
+                value = cache[key] = cache.pop(key)
+            except KeyError:
+                value = cache[key] = func(*args, **kwargs)
+        while len(cache) > 25:
+            popped_tuple = cache.popitem(last=False)
+            locks.pop(popped_tuple[0], None)
+        return value
+    return wrapped
+
+
+class MemoizedBenchmarkTests(test.TestCase):
+
+    def _time_hits(self, memoize):
+        class Request(object):
+            pass
+
+        @memoize
+        def client(request, service, version=None):
+            return service
+
+        request = Request()
+        client(request, 'compute', version='2.1')
+        return min(timeit.repeat(
+            lambda: client(request, 'compute', version='2.1'),
+            number=20000, repeat=5))
+
+    def test_cache_hit_faster_than_locked_baseline(self):
+        baseline = self._time_hits(_locked_memoized)
+        lock_free = self._time_hits(memoized.memoized)
+        self.assertLess(lock_free, baseline,
+                        "cache hits took %.4fs, %.4fs before"
+                        % (lock_free, baseline))
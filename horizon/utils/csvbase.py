@@ -111,12 +111,15 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
             header_template = django_template.loader.get_template(template)
             self.header = header_template.render(self.context, request)
 
-        self._closable_objects.append(self.out)
+        self._resource_closers.append(self.out.close)
 
         self.streaming_content = self.get_content()
 
     def buffer(self):
         buf = self.out.getvalue()
+        # Rewind as well, as truncate() keeps the position and the next
+        # write would pad the buffer with null characters.
+        self.out.seek(0)
         self.out.truncate(0)
         return buf
 
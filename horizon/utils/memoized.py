@@ -25,21 +25,39 @@ class UnhashableKeyWarning(RuntimeWarning):
     """Raised when trying to memoize a function with an unhashable argument."""
 
 
-def _try_weakref(arg, remove_callback):
+# Arguments of these types cannot have a weakref, so they are used as they
+# are without trying, which is costly for the common case of strings.
+_NOT_WEAKREFABLE = frozenset((str, bytes, int, float, bool, type(None),
+                              tuple, frozenset))
+_MISSING = object()
+
+
+def _try_weakref(arg, remove_callback=None):
     """Return a weak reference to arg if possible, or arg itself if not."""
+    if type(arg) in _NOT_WEAKREFABLE:
+        return arg
     try:
-        arg = weakref.ref(arg, remove_callback)
+        # Without a callback, the existing weak reference to arg is reused.
+        if remove_callback is None:
+            return weakref.ref(arg)
+        return weakref.ref(arg, remove_callback)
     except TypeError:
-        # Not all types can have a weakref. That includes strings
-        # and floats and such, so just pass them through directly.
-        pass
-    return arg
+        # Not all types can have a weakref. That includes lists and dicts
+        # and such, so just pass them through directly.
+        return arg
+
 
+def _get_key(args, kwargs, remove_callback=None):
+    """Calculate the cache key, using weak references where possible.
 
-def _get_key(args, kwargs, remove_callback):
-    """Calculate the cache key, using weak references where possible."""
+    The weak references of a key calculated without remove_callback are
+    equal to the ones calculated with it while their referents are alive,
+    so such a key finds the cached value without creating new references.
+    """
     # Use tuples, because lists are not hashable.
-    weak_args = tuple(_try_weakref(arg, remove_callback) for arg in args)
+    weak_args = tuple([_try_weakref(arg, remove_callback) for arg in args])
+    if not kwargs:
+        return weak_args, ()
     # Use a tuple of (key, values) pairs, because dict is not hashable.
     # Sort it, so that we don't depend on the order of keys.
     weak_kwargs = tuple(sorted(
@@ -60,6 +78,10 @@ def memoized(func=None, max_size=None):
 
     The cache uses weak references to the passed arguments, so it doesn't keep
     them alive in memory forever.
+
+    A cache hit does not take any lock. Concurrent calls which miss the
+    cache with the same arguments call the decorated function only once,
+    the other callers waiting for and returning its result.
     """
 
     def decorate(func):
@@ -68,14 +90,16 @@ def memoized(func=None, max_size=None):
         # separate instance for every decorated function, and it's stored in a
         # closure of the wrapped function.
         cache = collections.OrderedDict()
-        locks = collections.defaultdict(threading.Lock)
+        # The locks of the keys being calculated, which exist only while
+        # the decorated function is called for them.
+        in_flight = {}
+        in_flight_lock = threading.Lock()
         if max_size:
             max_cache_size = max_size
         else:
             max_cache_size = settings.MEMOIZED_MAX_SIZE_DEFAULT
 
-        @functools.wraps(func)
-        def wrapped(*args, **kwargs):
+        def miss(args, kwargs):
             # We need to have defined key early, to be able to use it in the
             # remove() function, but we calculate the actual value of the key
             # later on, because we need the remove() function for that.
@@ -83,30 +107,50 @@ def memoized(func=None, max_size=None):
 
             def remove(ref):
                 """A callback to remove outdated items from cache."""
+                # The key here is from closure, and is calculated later.
+                # Some other weak reference might have already removed that
+                # key -- in that case we don't need to do anything.
+                cache.pop(key, None)
+
+            key = _get_key(args, kwargs, remove)
+            with in_flight_lock:
+                lock = in_flight.get(key)
+                owner = lock is None
+                if owner:
+                    lock = in_flight[key] = threading.Lock()
+                    lock.acquire()
+            if not owner:
+                # Another thread is calling the function with the same
+                # arguments, wait for it and use its result if it has one.
+                with lock:
+                    pass
+                value = cache.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                return func(*args, **kwargs)
+            try:
+                value = cache[key] = func(*args, **kwargs)
+            finally:
+                with in_flight_lock:
+                    del in_flight[key]
+                lock.release()
+            while len(cache) > max_cache_size:
                 try:
-                    # The key here is from closure, and is calculated later.
-                    del cache[key]
-                    del locks[key]
+                    cache.popitem(last=False)
                 except KeyError:
-                    # Some other weak reference might have already removed that
-                    # key -- in that case we don't need to do anything.
                     pass
+            return value
 
-            key = _get_key(args, kwargs, remove)
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
             try:
-                with locks[key]:
-                    try:
-                        # We want cache hit to be as fast as possible, and
-                        # don't really care much about the speed of a cache
-                        # miss, because it will only happen once and likely
-                        # calls some external API, database, or some other slow
-                        # thing. That's why the hit is in straightforward code,
-                        # and the miss is in an exception.
-                        # We also want to pop the key and reset it to make sure
-                        # the position it has in the order updates.
-                        value = cache[key] = cache.pop(key)
-                    except KeyError:
-                        value = cache[key] = func(*args, **kwargs)
+                # We want cache hit to be as fast as possible, and don't
+                # really care much about the speed of a cache miss, because
+                # it will only happen once and likely calls some external
+                # API, database, or some other slow thing. That's why the
+                # hit reuses the existing weak references and takes no lock.
+                key = _get_key(args, kwargs)
+                value = cache.get(key, _MISSING)
             except TypeError:
                 # The calculated key may be unhashable when an unhashable
                 # object, such as a list, is passed as one of the arguments. In
@@ -116,15 +160,15 @@ def memoized(func=None, max_size=None):
                     "The key of %s %s is not hashable and cannot be memoized: "
                     "%r\n" % (func.__module__, func.__name__, key),
                     UnhashableKeyWarning, 2)
-                value = func(*args, **kwargs)
-
-            while len(cache) > max_cache_size:
-                try:
-                    popped_tuple = cache.popitem(last=False)
-                    locks.pop(popped_tuple[0], None)
-                except KeyError:
-                    pass
-
+                return func(*args, **kwargs)
+            if value is _MISSING:
+                return miss(args, kwargs)
+            try:
+                # Mark the key as the most recently used one.
+                cache.move_to_end(key)
+            except KeyError:
+                # The key has been evicted or removed meanwhile.
+                pass
             return value
         return wrapped
     if func and callable(func):
@@ -178,5 +178,9 @@ POLICY_FILES_PATH = ''
 POLICY_FILES = {}
 POLICY_DIRS = {}
 DEFAULT_POLICY_FILES = {}
+# Directory where the default policies parsed from DEFAULT_POLICY_FILES are
+# kept as JSON, so that new processes do not parse the YAML files again. It
+# must only be writable by the user running Horizon. None disables the cache.
+POLICY_CACHE_DIR = None
 
 OPENSTACK_KEYSTONE_MFA_TOTP_ENABLED = False
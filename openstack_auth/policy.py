@@ -13,8 +13,14 @@
 
 """Policy engine for openstack_auth"""
 
+import collections
+import hashlib
+import json
 import logging
+import os
 import os.path
+import tempfile
+import threading
 
 from django.conf import settings
 from oslo_config import cfg
@@ -28,8 +34,34 @@ from openstack_auth import utils as auth_utils
 LOG = logging.getLogger(__name__)
 
 _ENFORCER = None
+_ENFORCER_LOCK = threading.Lock()
 _BASE_PATH = settings.POLICY_FILES_PATH
 
+_DOMAIN_ID_KEYS = (
+    'domain_id',
+    'project.domain_id',
+    'user.domain_id',
+    'group.domain_id',
+)
+
+# Credentials of the domain scoped tokens, by token id.
+_DOMAIN_CREDENTIALS = collections.OrderedDict()
+_DOMAIN_CREDENTIALS_LOCK = threading.Lock()
+_DOMAIN_CREDENTIALS_SIZE = 1000
+
+# The fields of the default policies kept in POLICY_CACHE_DIR.
+_DEFAULT_POLICY_FIELDS = (
+    'name',
+    'check_str',
+    'description',
+    'scope_types',
+    'operations',
+    'deprecated_rule',
+    'deprecated_for_removal',
+    'deprecated_reason',
+    'deprecated_since',
+)
+
 
 def _get_policy_conf(policy_file, policy_dirs=None):
     conf = cfg.ConfigOpts()
@@ -83,6 +115,51 @@ def _convert_to_ruledefault(p):
     )
 
 
+def _parse_default_policies(data):
+    policies = yaml.safe_load(data.decode('utf-8'))
+    return [{key: p[key] for key in _DEFAULT_POLICY_FIELDS if key in p}
+            for p in policies]
+
+
+def _get_cache_path(data):
+    cache_dir = settings.POLICY_CACHE_DIR
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir,
+                        '%s.json' % hashlib.sha256(data).hexdigest())
+
+
+def _load_cached_defaults(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return [_convert_to_ruledefault(p) for p in json.load(f)]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        LOG.warning('Failed to load the parsed default policies %(path)s: '
+                    '%(reason)s', {'path': cache_path, 'reason': e})
+        return None
+
+
+def _store_cached_defaults(cache_path, policies):
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # The file is renamed once written so that the other processes
+        # never read a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(policies, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        LOG.warning('Failed to store the parsed default policies in '
+                    '%(path)s: %(reason)s', {'path': cache_dir, 'reason': e})
+
+
 def _load_default_rules(service, enforcer):
     policy_files = settings.DEFAULT_POLICY_FILES
     try:
@@ -93,64 +170,98 @@ def _load_default_rules(service, enforcer):
         return
 
     try:
-        with open(policy_file, encoding="utf-8") as f:
-            policies = yaml.safe_load(f)
+        with open(policy_file, 'rb') as f:
+            data = f.read()
     except IOError as e:
         LOG.error('Failed to open the policy file for %(service)s %(path)s: '
                   '%(reason)s',
                   {'service': service, 'path': policy_file, 'reason': e})
         return
-    except yaml.YAMLError as e:
-        LOG.error('Failed to load the default policies for %(service)s: '
-                  '%(reason)s', {'service': service, 'reason': e})
-        return
 
-    defaults = [_convert_to_ruledefault(p) for p in policies]
+    # Parsing the YAML default policies of all the services takes seconds,
+    # so they are kept in POLICY_CACHE_DIR as JSON, by the hash of the
+    # content of the file.
+    cache_path = _get_cache_path(data)
+    defaults = cache_path and _load_cached_defaults(cache_path)
+    if defaults is None:
+        try:
+            policies = _parse_default_policies(data)
+        except (UnicodeDecodeError, yaml.YAMLError) as e:
+            LOG.error('Failed to load the default policies for %(service)s: '
+                      '%(reason)s', {'service': service, 'reason': e})
+            return
+        defaults = [_convert_to_ruledefault(p) for p in policies]
+        if cache_path:
+            _store_cached_defaults(cache_path, policies)
     enforcer.register_defaults(defaults)
 
 
+def init():
+    """Load the policy rules of all the services.
+
+    The rules are otherwise loaded on the first policy check of the
+    process. The WSGI application calls this when it starts, so that the
+    first requests of a worker do not wait for the rules.
+    """
+    _get_enforcer()
+
+
 def _get_enforcer():
+    enforcer = _ENFORCER
+    if enforcer is not None:
+        return enforcer
+    with _ENFORCER_LOCK:
+        # the enforcer may have been built while waiting for the lock
+        if _ENFORCER is None:
+            _build_enforcer()
+        return _ENFORCER
+
+
+def _build_enforcer():
     global _ENFORCER
-    if not _ENFORCER:
-        _ENFORCER = {}
-        policy_files = settings.POLICY_FILES
-        for service in policy_files.keys():
-            policy_file, policy_dirs = _get_policy_file_with_full_path(service)
-            conf = _get_policy_conf(policy_file, policy_dirs)
-            enforcer = policy.Enforcer(conf)
-            enforcer.suppress_default_change_warnings = True
-            _load_default_rules(service, enforcer)
-            try:
-                enforcer.load_rules()
-            except IOError:
-                # Just in case if we have permission denied error which is not
-                # handled by oslo.policy now. It will handled in the code like
-                # we don't have any policy file: allow action from the Horizon
-                # side.
-                LOG.warning("Cannot load a policy file '%s' for service '%s' "
-                            "due to IOError. One possible reason is "
-                            "permission denied.", policy_file, service)
-            except ValueError:
-                LOG.warning("Cannot load a policy file '%s' for service '%s' "
-                            "due to ValueError. The file might be wrongly "
-                            "formatted.", policy_file, service)
-
-            # Ensure enforcer.rules is populated.
-            if enforcer.rules:
-                LOG.debug("adding enforcer for service: %s", service)
-                _ENFORCER[service] = enforcer
-            else:
-                locations = policy_file
-                if policy_dirs:
-                    locations += ' and files under %s' % policy_dirs
-                LOG.warning("No policy rules for service '%s' in %s",
-                            service, locations)
-    return _ENFORCER
+    # The enforcers are only published once all of them are loaded.
+    enforcers = {}
+    policy_files = settings.POLICY_FILES
+    for service in policy_files.keys():
+        policy_file, policy_dirs = _get_policy_file_with_full_path(service)
+        conf = _get_policy_conf(policy_file, policy_dirs)
+        enforcer = policy.Enforcer(conf)
+        enforcer.suppress_default_change_warnings = True
+        _load_default_rules(service, enforcer)
+        try:
+            enforcer.load_rules()
+        except IOError:
+            # Just in case if we have permission denied error which is not
+            # handled by oslo.policy now. It will handled in the code like
+            # we don't have any policy file: allow action from the Horizon
+            # side.
+            LOG.warning("Cannot load a policy file '%s' for service '%s' "
+                        "due to IOError. One possible reason is "
+                        "permission denied.", policy_file, service)
+        except ValueError:
+            LOG.warning("Cannot load a policy file '%s' for service '%s' "
+                        "due to ValueError. The file might be wrongly "
+                        "formatted.", policy_file, service)
+
+        # Ensure enforcer.rules is populated.
+        if enforcer.rules:
+            LOG.debug("adding enforcer for service: %s", service)
+            enforcers[service] = enforcer
+        else:
+            locations = policy_file
+            if policy_dirs:
+                locations += ' and files under %s' % policy_dirs
+            LOG.warning("No policy rules for service '%s' in %s",
+                        service, locations)
+    _ENFORCER = enforcers
 
 
 def reset():
     global _ENFORCER
-    _ENFORCER = None
+    with _ENFORCER_LOCK:
+        _ENFORCER = None
+    with _DOMAIN_CREDENTIALS_LOCK:
+        _DOMAIN_CREDENTIALS.clear()
 
 
 def check(actions, request, target=None):
@@ -193,7 +304,7 @@ def check(actions, request, target=None):
     """
     if target is None:
         target = {}
-    user = auth_utils.get_user(request)
+    user = _get_user(request)
 
     # Several service policy engines default to a project id check for
     # ownership. Since the user is already scoped to a project, if a
@@ -223,25 +334,72 @@ def check(actions, request, target=None):
     if target.get('user.id') is None:
         target['user.id'] = user.id
 
-    domain_id_keys = [
-        'domain_id',
-        'project.domain_id',
-        'user.domain_id',
-        'group.domain_id'
-    ]
     # populates domain id keys with user's current domain id
-    for key in domain_id_keys:
+    for key in _DOMAIN_ID_KEYS:
         if target.get(key) is None:
             target[key] = user.user_domain_id
 
-    credentials = _user_to_credentials(user)
-    domain_credentials = _domain_to_credentials(request, user)
-    # if there is a domain token use the domain_id instead of the user's domain
-    if domain_credentials:
-        credentials['domain_id'] = domain_credentials.get('domain_id')
+    credentials, domain_credentials, credentials_key = \
+        _get_credentials(request, user)
 
     enforcer = _get_enforcer()
 
+    # Tables check the same actions against the same targets for many
+    # rows, so the results are remembered for the rest of the request.
+    results = _get_check_results(request, enforcer)
+    try:
+        key = (credentials_key, tuple(tuple(action) for action in actions),
+               tuple(sorted(target.items())))
+        hash(key)
+    except TypeError:
+        # a target with unhashable values is not remembered
+        key = None
+    if results is not None and key is not None:
+        try:
+            return results[key]
+        except KeyError:
+            pass
+
+    allowed = _check_actions(enforcer, actions, target, credentials,
+                             domain_credentials)
+    if results is not None and key is not None:
+        results[key] = allowed
+    return allowed
+
+
+def _get_user(request):
+    # The user is built from the session token each time it is
+    # retrieved, so it is built once per request and token only.
+    session = getattr(request, 'session', None) or {}
+    token = session.get('token')
+    token_id = getattr(token, 'id', token)
+    cached = getattr(request, '_policy_user', None)
+    if isinstance(cached, tuple) and cached[0] == token_id:
+        return cached[1]
+    user = auth_utils.get_user(request)
+    try:
+        request._policy_user = (token_id, user)
+    except AttributeError:
+        pass
+    return user
+
+
+def _get_check_results(request, enforcer):
+    if request is None:
+        return None
+    results = getattr(request, '_policy_check_results', None)
+    # the results are forgotten when the policy rules are reloaded
+    if not isinstance(results, tuple) or results[0] is not enforcer:
+        results = (enforcer, {})
+        try:
+            request._policy_check_results = results
+        except AttributeError:
+            return None
+    return results[1]
+
+
+def _check_actions(enforcer, actions, target, credentials,
+                   domain_credentials):
     for action in actions:
         scope, action = action[0], action[1]
         if scope in enforcer:
@@ -283,6 +441,31 @@ def _check_credentials(enforcer_scope, action, target, credentials):
     return is_valid
 
 
+def _get_credentials(request, user):
+    """Return the credentials of the user for the policy checks.
+
+    The credentials, the domain credentials and a hashable key built
+    from them are computed once and kept on the user object.
+    """
+    if not hasattr(user, "_policy_credentials"):
+        credentials = _user_to_credentials(user)
+        domain_credentials = _domain_to_credentials(request, user)
+        # if there is a domain token use the domain_id instead of the
+        # user's domain
+        if domain_credentials:
+            credentials['domain_id'] = domain_credentials.get('domain_id')
+        credentials_key = tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(credentials.items()))
+        if domain_credentials:
+            credentials_key += (
+                ('domain', domain_credentials['domain_id'],
+                 tuple(domain_credentials['roles'])),)
+        user._policy_credentials = (credentials, domain_credentials,
+                                    credentials_key)
+    return user._policy_credentials
+
+
 def _user_to_credentials(user):
     if not hasattr(user, "_credentials"):
         roles = [role['name'] for role in user.roles]
@@ -305,15 +488,32 @@ def _domain_to_credentials(request, user):
             # no domain role or not running on V3
             if not domain_auth_ref:
                 return None
-            domain_user = auth_user.create_user_from_token(
-                request, auth_user.Token(domain_auth_ref),
-                domain_auth_ref.service_catalog.url_for(interface=None))
-            user._domain_credentials = _user_to_credentials(domain_user)
 
-            # uses the domain_id associated with the domain_user
-            user._domain_credentials['domain_id'] = domain_user.domain_id
+            # The user is built again from the session on each request,
+            # so the credentials of a domain token are kept for the
+            # lifetime of the token.
+            token_id = getattr(domain_auth_ref, 'auth_token', None)
+            domain_credentials = _DOMAIN_CREDENTIALS.get(token_id)
+            if domain_credentials is None:
+                domain_user = auth_user.create_user_from_token(
+                    request, auth_user.Token(domain_auth_ref),
+                    domain_auth_ref.service_catalog.url_for(interface=None))
+                domain_credentials = _user_to_credentials(domain_user)
+
+                # uses the domain_id associated with the domain_user
+                domain_credentials['domain_id'] = domain_user.domain_id
+                if token_id:
+                    _remember_domain_credentials(token_id, domain_credentials)
+            user._domain_credentials = domain_credentials
 
         except Exception:
             LOG.warning("Failed to create user from domain scoped token.")
             return None
     return user._domain_credentials
+
+
+def _remember_domain_credentials(token_id, domain_credentials):
+    with _DOMAIN_CREDENTIALS_LOCK:
+        _DOMAIN_CREDENTIALS[token_id] = domain_credentials
+        while len(_DOMAIN_CREDENTIALS) > _DOMAIN_CREDENTIALS_SIZE:
+            _DOMAIN_CREDENTIALS.popitem(last=False)
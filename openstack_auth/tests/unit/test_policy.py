@@ -11,10 +11,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent import futures
+import json
+import os
+import shutil
+import tempfile
 from unittest import mock
 
 from django import http
 from django import test
+import yaml
 
 from openstack_auth import policy
 from openstack_auth import user
@@ -45,6 +51,96 @@ class PolicyLoaderTestCase(test.TestCase):
         policy.reset()
         self.assertIsNone(policy._ENFORCER)
 
+    def test_policy_init(self):
+        policy.reset()
+        policy.init()
+        self.assertEqual(2, len(policy._ENFORCER))
+
+    def test_policy_file_load_concurrent(self):
+        policy.reset()
+        with mock.patch.object(policy, '_build_enforcer',
+                               wraps=policy._build_enforcer) as build:
+            with futures.ThreadPoolExecutor(max_workers=4) as executor:
+                enforcers = list(executor.map(
+                    lambda i: policy._get_enforcer(), range(8)))
+
+        build.assert_called_once_with()
+        for enforcer in enforcers:
+            self.assertIs(policy._ENFORCER, enforcer)
+
+
+@test.override_settings(POLICY_FILES={'identity': 'keystone_policy.json'})
+class PolicyCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.cache_dir = os.path.join(tmp_dir, 'cache')
+        self.default_file = os.path.join(tmp_dir, 'keystone.yaml')
+        self._write_defaults('rule:admin_required')
+        patcher = test.override_settings(
+            POLICY_CACHE_DIR=self.cache_dir,
+            DEFAULT_POLICY_FILES={'identity': self.default_file})
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+        self.addCleanup(policy.reset)
+
+    def _write_defaults(self, check_str):
+        with open(self.default_file, 'w', encoding='utf-8') as f:
+            yaml.safe_dump([{'name': 'identity:get_thing',
+                             'check_str': check_str,
+                             'description': 'Get a thing.',
+                             'scope_types': ['project']}], f)
+
+    def _get_check_str(self):
+        policy.reset()
+        enforcer = policy._get_enforcer()['identity']
+        return enforcer.registered_rules['identity:get_thing'].check_str
+
+    def test_defaults_cached(self):
+        self.assertEqual('rule:admin_required', self._get_check_str())
+        cache_files = os.listdir(self.cache_dir)
+        self.assertEqual(1, len(cache_files))
+        with open(os.path.join(self.cache_dir, cache_files[0]),
+                  encoding='utf-8') as f:
+            self.assertEqual([{'name': 'identity:get_thing',
+                               'check_str': 'rule:admin_required',
+                               'description': 'Get a thing.',
+                               'scope_types': ['project']}], json.load(f))
+
+        with mock.patch.object(policy, '_parse_default_policies') as parse:
+            self.assertEqual('rule:admin_required', self._get_check_str())
+        parse.assert_not_called()
+
+    def test_defaults_changed(self):
+        self._get_check_str()
+        self._write_defaults('role:reader')
+
+        self.assertEqual('role:reader', self._get_check_str())
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+    def test_defaults_cache_corrupted(self):
+        self._get_check_str()
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), 'wb') as f:
+                f.write(b'garbage')
+
+        self.assertEqual('rule:admin_required', self._get_check_str())
+
+    def test_defaults_cache_invalid(self):
+        self._get_check_str()
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), 'w') as f:
+                json.dump([{'name': 'identity:get_thing'}], f)
+
+        self.assertEqual('rule:admin_required', self._get_check_str())
+
+    @test.override_settings(POLICY_CACHE_DIR=None)
+    def test_defaults_not_cached(self):
+        self.assertEqual('rule:admin_required', self._get_check_str())
+        self.assertFalse(os.path.exists(self.cache_dir))
+
 
 class PolicyTestCase(test.TestCase):
     _roles = []
@@ -152,6 +248,64 @@ class PolicyTestCheckCredentials(PolicyTestCase):
         self.assertFalse(is_valid)
 
 
+class PolicyTestCaseCheckResults(PolicyTestCase):
+    _roles = [{'id': '1', 'name': 'member'}]
+
+    def _enforce_count(self):
+        return sum(e.enforce.call_count
+                   for e in policy._get_enforcer().values())
+
+    def setUp(self):
+        super().setUp()
+        policy.reset()
+        for enforcer in policy._get_enforcer().values():
+            patcher = mock.patch.object(enforcer, 'enforce',
+                                        wraps=enforcer.enforce)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_check_results_remembered(self):
+        for i in range(3):
+            self.assertFalse(policy.check(
+                (("identity", "admin_required"),), request=self.request))
+            self.assertFalse(policy.check(
+                (("compute", "context_is_admin"),),
+                request=self.request, target={'project_id': 'p1'}))
+        self.assertEqual(1, self.MockClass.call_count)
+        enforce_count = self._enforce_count()
+
+        # the same action with another target is checked again
+        self.assertFalse(policy.check(
+            (("compute", "context_is_admin"),),
+            request=self.request, target={'project_id': 'p2'}))
+        self.assertGreater(self._enforce_count(), enforce_count)
+
+    def test_check_results_per_request(self):
+        policy.check((("identity", "admin_required"),), request=self.request)
+        enforce_count = self._enforce_count()
+        policy.check((("identity", "admin_required"),),
+                     request=http.HttpRequest())
+        self.assertEqual(2 * enforce_count, self._enforce_count())
+
+    def test_check_results_unhashable_target(self):
+        target = {'project_id': 'p1', 'tags': ['a']}
+        policy.check((("compute", "context_is_admin"),),
+                     request=self.request, target=target)
+        enforce_count = self._enforce_count()
+        policy.check((("compute", "context_is_admin"),),
+                     request=self.request, target=target)
+        self.assertEqual(2 * enforce_count, self._enforce_count())
+
+    def test_check_results_forgotten_on_reset(self):
+        self.assertFalse(policy.check((("identity", "admin_required"),),
+                                      request=self.request))
+        policy.reset()
+        with mock.patch.object(policy, '_check_credentials',
+                               return_value=True):
+            self.assertTrue(policy.check((("identity", "admin_required"),),
+                                         request=self.request))
+
+
 class PolicyTestCaseAdmin(PolicyTestCase):
     _roles = [{'id': '1', 'name': 'admin'}]
 
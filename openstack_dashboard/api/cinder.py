@@ -37,6 +37,8 @@ from openstack_dashboard.api import _nova
 from openstack_dashboard.api import base
 from openstack_dashboard.api import microversions
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import api_cache
+from openstack_dashboard.utils import quota_cache
 from openstack_dashboard.utils import settings as utils
 
 
@@ -389,6 +391,7 @@ def volume_get(request, volume_id):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def volume_create(request, size, name, description, volume_type,
                   snapshot_id=None, metadata=None, image_id=None,
                   availability_zone=None, source_volid=None,
@@ -409,6 +412,7 @@ def volume_create(request, size, name, description, volume_type,
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def volume_extend(request, volume_id, new_size):
     client = _cinderclient_with_features(request,
                                          'extend_in_use_volume')
@@ -416,6 +420,7 @@ def volume_extend(request, volume_id, new_size):
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def volume_delete(request, volume_id):
     return cinderclient(request).volumes.delete(volume_id)
 
@@ -527,6 +532,7 @@ def volume_snapshot_list_paged(request, search_opts=None, marker=None,
 
 
 @profiler.trace
+@quota_cache.invalidates
 def volume_snapshot_create(request, volume_id, name,
                            description=None, force=False):
     data = {'name': name,
@@ -538,6 +544,7 @@ def volume_snapshot_create(request, volume_id, name,
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def volume_snapshot_delete(request, snapshot_id):
     return cinderclient(request).volume_snapshots.delete(snapshot_id)
 
@@ -658,6 +665,7 @@ def volume_backup_list_paged(request, marker=None, paginate=False,
 
 
 @profiler.trace
+@quota_cache.invalidates
 def volume_backup_create(request,
                          volume_id,
                          container_name,
@@ -681,6 +689,7 @@ def volume_backup_create(request,
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def volume_backup_delete(request, backup_id, force=None):
     return cinderclient(request).backups.delete(backup_id, force=force)
 
@@ -735,7 +744,9 @@ def tenant_quota_get(request, tenant_id):
 
 @profiler.trace
 def tenant_quota_update(request, tenant_id, **kwargs):
-    return cinderclient(request).quotas.update(tenant_id, **kwargs)
+    quotas = cinderclient(request).quotas.update(tenant_id, **kwargs)
+    quota_cache.invalidate(tenant_id)
+    return quotas
 
 
 @profiler.trace
@@ -786,20 +797,25 @@ def volume_type_get_with_qos_association(request, volume_type_id):
 @profiler.trace
 def default_quota_update(request, **kwargs):
     cinderclient(request).quota_classes.update(DEFAULT_QUOTA_NAME, **kwargs)
+    quota_cache.invalidate_all()
 
 
 @profiler.trace
+@api_cache.cached(
+    300, manager=lambda request: cinderclient(request).volume_types)
 def volume_type_list(request):
     return cinderclient(request).volume_types.list()
 
 
 @profiler.trace
+@api_cache.invalidates('cinder.volume_type_list')
 def volume_type_create(request, name, description=None, is_public=True):
     return cinderclient(request).volume_types.create(name, description,
                                                      is_public)
 
 
 @profiler.trace
+@api_cache.invalidates('cinder.volume_type_list')
 def volume_type_update(request, volume_type_id, name=None, description=None,
                        is_public=None):
     return cinderclient(request).volume_types.update(volume_type_id,
@@ -815,6 +831,7 @@ def volume_type_default(request):
 
 
 @profiler.trace
+@api_cache.invalidates('cinder.volume_type_list')
 def volume_type_delete(request, volume_type_id):
     try:
         return cinderclient(request).volume_types.delete(volume_type_id)
@@ -865,6 +882,7 @@ def volume_type_extra_get(request, type_id, raw=False):
             key, value in extras.items()]
 
 
+@api_cache.invalidates('cinder.volume_type_list')
 def volume_type_extra_set(request, type_id, metadata):
     vol_type = volume_type_get(request, type_id)
     if not metadata:
@@ -872,6 +890,7 @@ def volume_type_extra_set(request, type_id, metadata):
     return vol_type.set_keys(metadata)
 
 
+@api_cache.invalidates('cinder.volume_type_list')
 def volume_type_extra_delete(request, type_id, keys):
     vol_type = volume_type_get(request, type_id)
     return vol_type.unset_keys(keys)
@@ -968,6 +987,9 @@ def service_list(request):
 
 
 @profiler.trace
+@api_cache.cached(
+    300,
+    manager=lambda request: cinderclient(request).availability_zones)
 def availability_zone_list(request, detailed=False):
     return cinderclient(request).availability_zones.list(detailed=detailed)
 
@@ -1060,11 +1082,13 @@ def volume_type_access_list(request, volume_type):
     return cinderclient(request).volume_type_access.list(volume_type)
 
 
+@api_cache.invalidates('cinder.volume_type_list')
 def volume_type_add_project_access(request, volume_type, project_id):
     return cinderclient(request).volume_type_access.add_project_access(
         volume_type, project_id)
 
 
+@api_cache.invalidates('cinder.volume_type_list')
 def volume_type_remove_project_access(request, volume_type, project_id):
     return cinderclient(request).volume_type_access.remove_project_access(
         volume_type, project_id)
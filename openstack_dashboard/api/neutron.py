@@ -22,6 +22,7 @@ from collections.abc import Sequence
 import copy
 import itertools
 import logging
+import threading
 import types
 
 import netaddr
@@ -47,6 +48,9 @@ from openstack_dashboard.api import base
 from openstack_dashboard.api import nova
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard import policy
+from openstack_dashboard.utils import api_cache
+from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import quota_cache
 from openstack_dashboard.utils import settings as setting_utils
 
 
@@ -990,6 +994,115 @@ def networkclient(request):
     return c.network
 
 
+# The maximum length of the filter query string accepted by each neutron
+# endpoint, learned from RequestURITooLong errors.
+_filter_len_limits = {}
+_filter_len_limits_lock = threading.Lock()
+
+
+def _is_uri_too_long(exc):
+    if isinstance(exc, neutron_exc.RequestURITooLong):
+        return True
+    return (isinstance(exc, sdk_exceptions.HttpException) and
+            exc.status_code == 414)
+
+
+def _as_sequence(filter_values):
+    if isinstance(filter_values, str):
+        return [filter_values]
+    if not isinstance(filter_values, Sequence):
+        return list(filter_values)
+    return filter_values
+
+
+def _filter_len(filter_attr, filter_values):
+    # Length of each query filter is:
+    # <key>=<value>& (e.g., id=<uuid>)
+    # The length will be key_len + value_len + 2
+    return sum(len(filter_attr) + len(val) + 2 for val in filter_values)
+
+
+def _list_method_endpoint(list_method, params):
+    request = (params.get('request') or
+               getattr(getattr(list_method, '__self__', None),
+                       'request', None))
+    if request is None:
+        return None
+    try:
+        return base.url_for(request, 'network')
+    except Exception:
+        return None
+
+
+def _learn_filter_len_limit(endpoint, filter_attr, filter_values,
+                            uri_len_exc):
+    all_filter_len = _filter_len(filter_attr, filter_values)
+    excess = getattr(uri_len_exc, 'excess', None)
+    if excess:
+        # Use the excess attribute of the exception to know how many
+        # filter values can be inserted into a single request.
+        allowed_filter_len = all_filter_len - excess
+    else:
+        # The SDK does not tell how long the URI may be, so try with
+        # half of the filter values.
+        allowed_filter_len = all_filter_len // 2
+    if endpoint is None:
+        return allowed_filter_len
+    with _filter_len_limits_lock:
+        limit = _filter_len_limits.get(endpoint)
+        if limit is None or allowed_filter_len < limit:
+            _filter_len_limits[endpoint] = allowed_filter_len
+        else:
+            # A shorter limit was already learned, possibly concurrently,
+            # but it has to split these filter values at least.
+            allowed_filter_len = min(limit, all_filter_len - 1)
+    return allowed_filter_len
+
+
+def _list_chunk(list_method, filter_attr, filter_values, endpoint, params):
+    try:
+        return list_method(**dict(params, **{filter_attr: filter_values}))
+    except (neutron_exc.RequestURITooLong,
+            sdk_exceptions.HttpException) as exc:
+        # The URI is too long because of too many filter values.
+        filter_values = _as_sequence(filter_values)
+        if not _is_uri_too_long(exc) or len(filter_values) < 2:
+            raise
+        limit = _learn_filter_len_limit(endpoint, filter_attr,
+                                        filter_values, exc)
+    return _list_chunks(list_method, filter_attr, filter_values,
+                        limit, endpoint, params)
+
+
+def _list_chunks(list_method, filter_attr, filter_values, limit, endpoint,
+                 params):
+    # We consider only the filter condition from (filter_attr,
+    # filter_values) and do not consider other filter conditions
+    # which may be specified in **params.
+    val_maxlen = max(len(val) for val in filter_values)
+    filter_maxlen = len(filter_attr) + val_maxlen + 2
+    chunk_size = max(limit // filter_maxlen, 1)
+
+    results = futurist_utils.call_functions_parallel(
+        *[(_list_chunk,
+           [list_method, filter_attr, filter_values[i:i + chunk_size],
+            endpoint, params])
+          for i in range(0, len(filter_values), chunk_size)])
+
+    # The chunks do not overlap, but the same resource may still be
+    # returned twice if it matches several filter values.
+    resources = []
+    seen = set()
+    for resource in itertools.chain.from_iterable(results):
+        resource_id = getattr(resource, 'id', None)
+        if resource_id is not None:
+            if resource_id in seen:
+                continue
+            seen.add(resource_id)
+        resources.append(resource)
+    return resources
+
+
 @profiler.trace
 def list_resources_with_long_filters(list_method,
                                      filter_attr, filter_values, **params):
@@ -998,7 +1111,12 @@ def list_resources_with_long_filters(list_method,
     If filter parameters are long, list resources API request leads to
     414 error (URL is too long). For such case, this method split
     list parameters specified by a list_field argument into chunks
-    and call the specified list_method repeatedly.
+    and call the specified list_method for each chunk in parallel.
+    The results of the chunks are merged and de-duplicated by ID.
+
+    The maximum filter length accepted by the neutron endpoint is
+    remembered, so that later calls with long filters are split into
+    chunks at once instead of failing with 414 error first.
 
     :param list_method: Method used to retrieve resource list.
     :param filter_attr: attribute name to be filtered. The value corresponding
@@ -1013,39 +1131,17 @@ def list_resources_with_long_filters(list_method,
         without any changes. You can specify more filter conditions
         in addition to a pair of filter_attr and filter_values.
     """
-    try:
-        params[filter_attr] = filter_values
-        return list_method(**params)
-    except neutron_exc.RequestURITooLong as uri_len_exc:
-        # The URI is too long because of too many filter values.
-        # Use the excess attribute of the exception to know how many
-        # filter values can be inserted into a single request.
-
-        # We consider only the filter condition from (filter_attr,
-        # filter_values) and do not consider other filter conditions
-        # which may be specified in **params.
-
-        if isinstance(filter_values, str):
-            filter_values = [filter_values]
-        elif not isinstance(filter_values, Sequence):
-            filter_values = list(filter_values)
-
-        # Length of each query filter is:
-        # <key>=<value>& (e.g., id=<uuid>)
-        # The length will be key_len + value_maxlen + 2
-        all_filter_len = sum(len(filter_attr) + len(val) + 2
-                             for val in filter_values)
-        allowed_filter_len = all_filter_len - uri_len_exc.excess
-
-        val_maxlen = max(len(val) for val in filter_values)
-        filter_maxlen = len(filter_attr) + val_maxlen + 2
-        chunk_size = allowed_filter_len // filter_maxlen
-
-        resources = []
-        for i in range(0, len(filter_values), chunk_size):
-            params[filter_attr] = filter_values[i:i + chunk_size]
-            resources.extend(list_method(**params))
-        return resources
+    endpoint = _list_method_endpoint(list_method, params)
+    limit = _filter_len_limits.get(endpoint) if endpoint else None
+    if (limit is not None and not isinstance(filter_values, str) and
+            _filter_len(filter_attr, filter_values) > limit):
+        # Skip the request which is known to fail with 414 error.
+        filter_values = _as_sequence(filter_values)
+        if len(filter_values) > 1:
+            return _list_chunks(list_method, filter_attr, filter_values,
+                                limit, endpoint, params)
+    return _list_chunk(list_method, filter_attr, filter_values, endpoint,
+                       params)
 
 
 @profiler.trace
@@ -1191,57 +1287,61 @@ def _network_list_paged(request, page_data, params):
 @profiler.trace
 def network_list(request, single_page=False, **params):
     LOG.debug("network_list(): params=%s", params)
-    list_values = []
-    if 'id' in params and isinstance(params['id'], frozenset):
-        list_values = list(params['id'])
-    if 'id' in params and isinstance(params['id'], list):
-        list_values = params['id']
+    if 'id' in params and isinstance(params['id'], (frozenset, set, tuple)):
+        params['id'] = list(params['id'])
     if single_page is True:
         params['retrieve_all'] = False
 
-    networks = []
     if 'tenant_id' in params:
         params['project_id'] = params.pop('tenant_id')
-    for value in list_values:
-        params['id'] = value
-        for net in networkclient(request).networks(**params):
-            networks.append(net)
-    if not list_values:
-        networks = networkclient(request).networks(**params)
-
-    # Get subnet list to expand subnet info in network list.
-    subnets = subnet_list(request)
-    subnet_dict = dict((s['id'], s) for s in subnets)
+    # A list of IDs is sent as a single request with repeated id filters.
+    networks = networkclient(request).networks(**params)
 
     if not isinstance(networks, (list, types.GeneratorType)):
         networks = [networks]
-    nets_with_subnet = []
+    nets = []
     net_ids = set()
 
-    # Expand subnet list from subnet_id to values.
-    subnet_l_ready = False
+    nets_l_ready = False
     runs = 0
     max_runs = 3
-    while not subnet_l_ready and runs < max_runs:
+    while not nets_l_ready and runs < max_runs:
         networks, cp_nets = itertools.tee(networks, 2)
         try:
             for n in cp_nets:
-                # Due to potential timing issues, we can't assume the
-                # subnet_dict data is in sync with the network data.
                 net_dict = n.to_dict()
-                net_dict['subnets'] = [
-                    subnet_dict[s] for s in net_dict.get('subnet_ids', [])
-                    if s in subnet_dict
-                ]
                 if net_dict['id'] not in net_ids:
-                    nets_with_subnet.append(net_dict)
+                    nets.append(net_dict)
                     net_ids.add(net_dict['id'])
-            subnet_l_ready = True
+            nets_l_ready = True
         except (requests.exceptions.SSLError, ks_exceptions.SSLError):
             LOG.warning('Retry due to SSLError')
             runs += 1
             continue
-    return [Network(n) for n in nets_with_subnet]
+
+    # Get the subnets of the networks to expand subnet info in network list.
+    # All the subnets are listed at once only when all the networks are.
+    subnet_ids = tuple(dict.fromkeys(
+        subnet_id for net_dict in nets
+        for subnet_id in net_dict.get('subnet_ids', [])))
+    if not subnet_ids:
+        subnets = []
+    elif set(params) - {'retrieve_all'}:
+        subnets = list_resources_with_long_filters(
+            subnet_list, 'id', subnet_ids, request=request)
+    else:
+        subnets = subnet_list(request)
+    subnet_dict = dict((s['id'], s) for s in subnets)
+
+    # Expand subnet list from subnet_id to values.
+    for net_dict in nets:
+        # Due to potential timing issues, we can't assume the
+        # subnet_dict data is in sync with the network data.
+        net_dict['subnets'] = [
+            subnet_dict[s] for s in net_dict.get('subnet_ids', [])
+            if s in subnet_dict
+        ]
+    return [Network(n) for n in nets]
 
 
 def _is_auto_allocated_network_supported(request):
@@ -1660,6 +1760,7 @@ def network_get(request, network_id, expand_subnet=True, **params):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def network_create(request, **kwargs):
     """Create a  network object.
 
@@ -1685,6 +1786,7 @@ def network_update(request, network_id, **kwargs):
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def network_delete(request, network_id):
     LOG.debug("network_delete(): netid=%s", network_id)
     networkclient(request).delete_network(network_id)
@@ -1710,6 +1812,7 @@ def subnet_get(request, subnet_id, **params):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def subnet_create(request, network_id, **kwargs):
     """Create a subnet on a specified network.
 
@@ -1748,6 +1851,7 @@ def subnet_update(request, subnet_id, **kwargs):
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def subnet_delete(request, subnet_id):
     LOG.debug("subnet_delete(): subnetid=%s", subnet_id)
     networkclient(request).delete_subnet(subnet_id)
@@ -1892,6 +1996,7 @@ def unescape_port_kwargs(**kwargs):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def port_create(request, network_id, **kwargs):
     """Create a port on a specified network.
 
@@ -1913,6 +2018,7 @@ def port_create(request, network_id, **kwargs):
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def port_delete(request, port_id):
     LOG.debug("port_delete(): portid=%s", port_id)
     networkclient(request).delete_port(port_id)
@@ -1928,6 +2034,7 @@ def port_update(request, port_id, **kwargs):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def router_create(request, **kwargs):
     LOG.debug("router_create():, kwargs=%s", kwargs)
     if 'tenant_id' not in kwargs:
@@ -1968,6 +2075,7 @@ def router_list_on_l3_agent(request, l3_agent_id, **params):
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def router_delete(request, router_id):
     networkclient(request).delete_router(router_id)
 
@@ -2044,10 +2152,29 @@ def tenant_quota_get(request, tenant_id):
     return base.QuotaSet(neutronclient(request).show_quota(tenant_id)['quota'])
 
 
+@profiler.trace
+def tenant_quota_list(request):
+    """Return the quotas of all the projects in a single call.
+
+    Neutron only lists the projects whose quotas differ from the default
+    quotas returned by default_quota_get().
+
+    :returns: a dict mapping a project id to its QuotaSet
+    """
+    quotas = {}
+    for quota in neutronclient(request).list_quotas()['quotas']:
+        tenant_id = quota.pop('project_id', None)
+        tenant_id = quota.pop('tenant_id', tenant_id)
+        quotas[tenant_id] = base.QuotaSet(quota)
+    return quotas
+
+
 @profiler.trace
 def tenant_quota_update(request, tenant_id, **kwargs):
     quotas = {'quota': kwargs}
-    return neutronclient(request).update_quota(tenant_id, quotas)
+    quotas = neutronclient(request).update_quota(tenant_id, quotas)
+    quota_cache.invalidate(tenant_id)
+    return quotas
 
 
 @profiler.trace
@@ -2143,10 +2270,12 @@ def tenant_floating_ip_get(request, floating_ip_id):
     return FloatingIpManager(request).get(floating_ip_id)
 
 
+@quota_cache.invalidates
 def tenant_floating_ip_allocate(request, pool=None, tenant_id=None, **params):
     return FloatingIpManager(request).allocate(pool, tenant_id, **params)
 
 
+@quota_cache.invalidates_owner
 def tenant_floating_ip_release(request, floating_ip_id):
     return FloatingIpManager(request).release(floating_ip_id)
 
@@ -2185,10 +2314,12 @@ def security_group_get(request, sg_id):
     return SecurityGroupManager(request).get(sg_id)
 
 
+@quota_cache.invalidates
 def security_group_create(request, name, desc):
     return SecurityGroupManager(request).create(name, desc)
 
 
+@quota_cache.invalidates_owner
 def security_group_delete(request, sg_id):
     return SecurityGroupManager(request).delete(sg_id)
 
@@ -2197,6 +2328,7 @@ def security_group_update(request, sg_id, name, desc):
     return SecurityGroupManager(request).update(sg_id, name, desc)
 
 
+@quota_cache.invalidates
 def security_group_rule_create(request, parent_group_id,
                                direction, ethertype,
                                ip_protocol, from_port, to_port,
@@ -2206,6 +2338,7 @@ def security_group_rule_create(request, parent_group_id,
         from_port, to_port, cidr, group_id, description)
 
 
+@quota_cache.invalidates_owner
 def security_group_rule_delete(request, sgr_id):
     return SecurityGroupManager(request).rule_delete(sgr_id)
 
@@ -2332,6 +2465,7 @@ def _server_get_addresses(request, server, ports, floating_ips, network_names):
 
 @profiler.trace
 @memoized
+@api_cache.cached(3600)
 def list_extensions(request):
     """List neutron extensions.
 
@@ -36,7 +36,10 @@ from openstack_dashboard.api import _nova
 from openstack_dashboard.api import base
 from openstack_dashboard.api import cinder
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import api_cache
+from openstack_dashboard.utils import quota_cache
 from openstack_dashboard.utils import settings as utils
+from openstack_dashboard.utils import usage_cache
 
 LOG = logging.getLogger(__name__)
 
@@ -230,6 +233,7 @@ def server_mks_console(request, instance_id):
 
 
 @profiler.trace
+@api_cache.invalidates('nova.flavor_list')
 def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                   ephemeral=0, swap=0, metadata=None, is_public=True):
     flavor = _nova.novaclient(request).flavors.create(name, memory, vcpu, disk,
@@ -243,6 +247,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 
 
 @profiler.trace
+@api_cache.invalidates('nova.flavor_list')
 def flavor_delete(request, flavor_id):
     _nova.novaclient(request).flavors.delete(flavor_id)
 
@@ -257,6 +262,8 @@ def flavor_get(request, flavor_id, get_extras=False):
 
 @profiler.trace
 @memoized.memoized
+@api_cache.cached(
+    300, manager=lambda request: _nova.novaclient(request).flavors)
 def flavor_list(request, is_public=True, get_extras=False):
     """Get the list of available instance sizes (flavors)."""
     flavors = _nova.novaclient(request).flavors.list(is_public=is_public)
@@ -326,6 +333,7 @@ def flavor_access_list(request, flavor=None):
 
 
 @profiler.trace
+@api_cache.invalidates('nova.flavor_list')
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
     return _nova.novaclient(request).flavor_access.add_tenant_access(
@@ -333,6 +341,7 @@ def add_tenant_to_flavor(request, flavor, tenant):
 
 
 @profiler.trace
+@api_cache.invalidates('nova.flavor_list')
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
     return _nova.novaclient(request).flavor_access.remove_tenant_access(
@@ -352,6 +361,7 @@ def flavor_get_extras(request, flavor_id, raw=False, flavor=None):
 
 
 @profiler.trace
+@api_cache.invalidates('nova.flavor_list')
 def flavor_extra_delete(request, flavor_id, keys):
     """Unset the flavor extra spec keys."""
     flavor = _nova.novaclient(request).flavors.get(flavor_id)
@@ -359,6 +369,7 @@ def flavor_extra_delete(request, flavor_id, keys):
 
 
 @profiler.trace
+@api_cache.invalidates('nova.flavor_list')
 def flavor_extra_set(request, flavor_id, metadata):
     """Set the flavor extra spec keys."""
     flavor = _nova.novaclient(request).flavors.get(flavor_id)
@@ -373,6 +384,7 @@ def snapshot_create(request, instance_id, name):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def keypair_create(request, name, key_type='ssh'):
     microversion = get_microversion(request, 'key_types')
     return _nova.novaclient(request, microversion).\
@@ -380,6 +392,7 @@ def keypair_create(request, name, key_type='ssh'):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def keypair_import(request, name, public_key, key_type='ssh'):
     microversion = get_microversion(request, 'key_types')
     return _nova.novaclient(request, microversion).\
@@ -387,6 +400,7 @@ def keypair_import(request, name, public_key, key_type='ssh'):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def keypair_delete(request, name):
     _nova.novaclient(request).keypairs.delete(name)
 
@@ -403,6 +417,7 @@ def keypair_get(request, name):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def server_create(request, name, image, flavor, key_name, user_data,
                   security_groups, block_device_mapping=None,
                   block_device_mapping_v2=None, nics=None,
@@ -442,6 +457,7 @@ def server_create(request, name, image, flavor, key_name, user_data,
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def server_delete(request, instance_id):
     _nova.novaclient(request).servers.delete(instance_id)
     # Session is available and consistent for the current view
@@ -614,6 +630,7 @@ def server_live_migrate(request, instance_id, host, block_migration=False,
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def server_resize(request, instance_id, flavor, disk_config=None, **kwargs):
     _nova.novaclient(request).servers.resize(instance_id, flavor,
                                              disk_config, **kwargs)
@@ -685,6 +702,7 @@ def tenant_quota_get(request, tenant_id):
 def tenant_quota_update(request, tenant_id, **kwargs):
     if kwargs:
         _nova.novaclient(request).quotas.update(tenant_id, **kwargs)
+        quota_cache.invalidate(tenant_id)
 
 
 @profiler.trace
@@ -696,6 +714,7 @@ def default_quota_get(request, tenant_id):
 def default_quota_update(request, **kwargs):
     _nova.novaclient(request).quota_classes.update(DEFAULT_QUOTA_NAME,
                                                    **kwargs)
+    quota_cache.invalidate_all()
 
 
 def _get_usage_marker(usage):
@@ -729,6 +748,7 @@ def _merge_usage_list(usages, next_usage_list):
 
 
 @profiler.trace
+@usage_cache.cached(NovaUsage)
 def usage_get(request, tenant_id, start, end):
     client = upgrade_api(request, _nova.novaclient(request), '2.40')
     usage = client.usage.get(tenant_id, start, end)
@@ -746,6 +766,7 @@ def usage_get(request, tenant_id, start, end):
 
 
 @profiler.trace
+@usage_cache.cached(NovaUsage)
 def usage_list(request, start, end):
     client = upgrade_api(request, _nova.novaclient(request), '2.40')
     usage_list = client.usage.list(start, end, True)
@@ -766,6 +787,34 @@ def usage_list(request, start, end):
     return [NovaUsage(u) for u in usage_list]
 
 
+@profiler.trace
+def usage_list_pages(request, start, end):
+    """Yield the usage of all projects one page at a time.
+
+    Unlike usage_list(), the pages returned by Nova are not merged: Nova
+    splits the usage by server, so the usage of a project may be spread
+    across several pages. The usage of a closed period is read from the
+    cache shared with usage_list() and is yielded as a single page when
+    cached. It is not stored from here, since that would mean keeping the
+    usage of every server in memory: the warm_usage_cache command of the
+    custom_reports dashboard fills the cache instead.
+    """
+    usages = usage_cache.get(request, 'nova.usage_list', (start, end),
+                             NovaUsage)
+    if usages is not None:
+        yield usages
+        return
+    client = upgrade_api(request, _nova.novaclient(request), '2.40')
+    paginated = client.api_version >= api_versions.APIVersion('2.40')
+    usage_list = client.usage.list(start, end, True)
+    while usage_list:
+        yield [NovaUsage(u) for u in usage_list]
+        marker = _get_usage_list_marker(usage_list) if paginated else None
+        if not marker:
+            break
+        usage_list = client.usage.list(start, end, True, marker=marker)
+
+
 @profiler.trace
 def get_password(request, instance_id, private_key=None):
     return _nova.novaclient(request).servers.get_password(instance_id,
@@ -911,6 +960,9 @@ def tenant_absolute_limits(request, reserved=False, tenant_id=None):
 
 
 @profiler.trace
+@api_cache.cached(
+    300,
+    manager=lambda request: _nova.novaclient(request).availability_zones)
 def availability_zone_list(request, detailed=False):
     nc = _nova.novaclient(request)
     zones = nc.availability_zones.list(detailed=detailed)
@@ -924,6 +976,7 @@ def server_group_list(request):
 
 
 @profiler.trace
+@quota_cache.invalidates
 def server_group_create(request, **kwargs):
     microversion = get_microversion(request, "servergroup_soft_policies")
     nc = _nova.novaclient(request, version=microversion)
@@ -931,6 +984,7 @@ def server_group_create(request, **kwargs):
 
 
 @profiler.trace
+@quota_cache.invalidates_owner
 def server_group_delete(request, servergroup_id):
     _nova.novaclient(request).server_groups.delete(servergroup_id)
 
@@ -970,11 +1024,13 @@ def aggregate_details_list(request):
 
 
 @profiler.trace
+@api_cache.invalidates('nova.availability_zone_list')
 def aggregate_create(request, name, availability_zone=None):
     return _nova.novaclient(request).aggregates.create(name, availability_zone)
 
 
 @profiler.trace
+@api_cache.invalidates('nova.availability_zone_list')
 def aggregate_delete(request, aggregate_id):
     return _nova.novaclient(request).aggregates.delete(aggregate_id)
 
@@ -985,6 +1041,7 @@ def aggregate_get(request, aggregate_id):
 
 
 @profiler.trace
+@api_cache.invalidates('nova.availability_zone_list')
 def aggregate_update(request, aggregate_id, values):
     _nova.novaclient(request).aggregates.update(aggregate_id, values)
 
@@ -996,11 +1053,13 @@ def aggregate_set_metadata(request, aggregate_id, metadata):
 
 
 @profiler.trace
+@api_cache.invalidates('nova.availability_zone_list')
 def add_host_to_aggregate(request, aggregate_id, host):
     _nova.novaclient(request).aggregates.add_host(aggregate_id, host)
 
 
 @profiler.trace
+@api_cache.invalidates('nova.availability_zone_list')
 def remove_host_from_aggregate(request, aggregate_id, host):
     _nova.novaclient(request).aggregates.remove_host(aggregate_id, host)
 
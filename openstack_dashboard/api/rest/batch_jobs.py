@@ -0,0 +1,50 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""API over the background jobs of the batch actions."""
+
+from django.views import generic
+
+from openstack_dashboard.api.rest import urls
+from openstack_dashboard.api.rest import utils as rest_utils
+from openstack_dashboard.utils import batch_jobs
+
+
+@urls.register
+class BatchJobs(generic.View):
+    """API for the background jobs of the current user."""
+    url_regex = r'batch_jobs/$'
+
+    @rest_utils.ajax()
+    def get(self, request):
+        """Get the jobs of the user whose end was not reported yet.
+
+        The result is an object with property "items", each item being
+        a job with its "status" ("queued", "running" or "finished"), the
+        "total" number of items and the number "done", and the display
+        names of the items for which the action "succeeded" or "failed",
+        with the reason of the failure. A finished job is returned once.
+        """
+        return {'items': batch_jobs.get_jobs(request)}
+
+
+@urls.register
+class BatchJob(generic.View):
+    """API for a single background job of the current user."""
+    url_regex = r'batch_jobs/(?P<job_id>[^/]+)/$'
+
+    @rest_utils.ajax()
+    def get(self, request, job_id):
+        """Get the progress and the results of a job by its id."""
+        job = batch_jobs.get_job(request, job_id)
+        if job is None:
+            raise rest_utils.AjaxError(404, 'job %s not found' % job_id)
+        return job
@@ -25,6 +25,7 @@ from django.conf import settings
 
 from horizon import conf
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import batch_jobs
 
 
 def openstack(request):
@@ -39,6 +40,10 @@ def openstack(request):
 
         A dictionary containing information about region support, the current
         region, and available regions.
+
+    ``batch_jobs_pending``
+        Whether the background jobs of the batch actions of the user
+        have to be polled for their progress.
     """
     context = {}
 
@@ -87,6 +92,7 @@ def openstack(request):
     context['WEBROOT'] = settings.WEBROOT
 
     context['USER_MENU_LINKS'] = settings.USER_MENU_LINKS
+    context['batch_jobs_pending'] = batch_jobs.has_jobs(request)
     context['LOGOUT_URL'] = settings.LOGOUT_URL
 
     # Adding profiler support flag
@@ -26,7 +26,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
 
     @test.create_mocks({
         api.nova: ['server_list'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['tenant_get'],
         api.neutron: ['network_list',
                       'is_extension_supported',
                       'tenant_floating_ip_list']})
@@ -37,7 +37,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
         self.mock_server_list.return_value = [servers, False]
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(tenants)
         self.mock_network_list.return_value = self.networks.list()
         self.mock_is_extension_supported.return_value = True
 
@@ -59,7 +59,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_tenant_get.assert_called_once_with(
+            test.IsHttpRequest(), fips[0].tenant_id, admin=True)
         params = {"router:external": True}
         self.mock_network_list.assert_called_once_with(
             test.IsHttpRequest(), **params)
@@ -214,7 +215,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
                       'is_extension_supported',
                       'network_list'],
         api.nova: ['server_list'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['tenant_get']})
     def test_admin_disassociate_floatingip(self):
         # Use neutron test data
         fips = self.floating_ips.list()
@@ -223,7 +224,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
         self.mock_server_list.return_value = [servers, False]
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(tenants)
         self.mock_network_list.return_value = self.networks.list()
         self.mock_floating_ip_disassociate.return_value = None
         self.mock_is_extension_supported.return_value = True
@@ -240,7 +241,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_tenant_get.assert_called_once_with(
+            test.IsHttpRequest(), fips[0].tenant_id, admin=True)
         params = {"router:external": True}
         self.mock_network_list.assert_called_once_with(
             test.IsHttpRequest(), **params)
@@ -254,7 +256,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
                       'is_extension_supported',
                       'network_list'],
         api.nova: ['server_list'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['tenant_get']})
     def test_admin_delete_floatingip(self):
         # Use neutron test data
         fips = self.floating_ips.list()
@@ -263,7 +265,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
         self.mock_server_list.return_value = [servers, False]
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(tenants)
         self.mock_network_list.return_value = self.networks.list()
         self.mock_is_extension_supported.return_value = True
 
@@ -279,7 +281,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_tenant_get.assert_called_once_with(
+            test.IsHttpRequest(), fips[0].tenant_id, admin=True)
         params = {"router:external": True}
         self.mock_network_list.assert_called_once_with(
             test.IsHttpRequest(), **params)
@@ -291,7 +294,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
                       'is_extension_supported',
                       'network_list'],
         api.nova: ['server_list'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['tenant_get']})
     def test_floating_ip_table_actions(self):
         # Use neutron test data
         fips = self.floating_ips.list()
@@ -299,7 +302,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
         self.mock_server_list.return_value = [servers, False]
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(tenants)
         self.mock_network_list.return_value = self.networks.list()
         self.mock_is_extension_supported.return_value = True
 
@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from collections import OrderedDict
-
 from django.urls import reverse
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
@@ -34,6 +32,7 @@ from openstack_dashboard.dashboards.admin.floating_ips \
     import tables as fip_tables
 from openstack_dashboard.dashboards.project.floating_ips \
     import tables as project_tables
+from openstack_dashboard.utils import project_names
 
 
 def get_floatingip_pools(request):
@@ -87,8 +86,13 @@ class IndexView(tables.DataTableView):
                     _('Unable to retrieve instance list.'))
             instances_dict = dict((obj.id, obj.name) for obj in instances)
 
-            tenants = get_tenant_list(self.request)
-            tenant_dict = OrderedDict([(t.id, t) for t in tenants])
+            try:
+                tenant_names = project_names.get_names(
+                    self.request, [ip.tenant_id for ip in floating_ips])
+            except Exception:
+                tenant_names = {}
+                exceptions.handle(self.request,
+                                  _('Unable to retrieve project list.'))
 
             pools = get_floatingip_pools(self.request)
             pool_dict = dict((obj.id, obj.name) for obj in pools)
@@ -96,8 +100,7 @@ class IndexView(tables.DataTableView):
             for ip in floating_ips:
                 ip.instance_name = instances_dict.get(ip.instance_id)
                 ip.pool_name = pool_dict.get(ip.pool, ip.pool)
-                tenant = tenant_dict.get(ip.tenant_id, None)
-                ip.tenant_name = getattr(tenant, "name", None)
+                ip.tenant_name = tenant_names.get(ip.tenant_id)
 
         return floating_ips
 
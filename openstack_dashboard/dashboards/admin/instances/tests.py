@@ -39,16 +39,23 @@ class InstanceViewTest(test.BaseAdminViewTests):
             return [[image for image in images if
                      image.visibility != 'community']]
 
+    def _assert_tenant_get_called(self, servers):
+        self.mock_tenant_get.assert_has_calls(
+            [mock.call(test.IsHttpRequest(), tenant_id, admin=True)
+             for tenant_id in {s.tenant_id for s in servers}],
+            any_order=True)
+
     @test.create_mocks({
         api.nova: ['flavor_list', 'server_list_paged'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['tenant_get'],
         api.glance: ['image_list_detailed'],
         api.cinder: ['volume_list']
     })
     def test_index(self):
         servers = self.servers.list()
         # TODO(vmarkov) instances_img_ids should be in test_data
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
 
         self.mock_image_list_detailed.side_effect =\
             self._mock_image_list_detailed_side_effect
@@ -61,7 +68,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
         instances = res.context['table'].data
         self.assertCountEqual(instances, servers)
 
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self._assert_tenant_get_called(servers)
         self.assertEqual(self.mock_image_list_detailed.call_count, 4)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
         search_opts = {'marker': None, 'paginate': True, 'all_tenants': True}
@@ -72,7 +79,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_mocks({
         api.nova: ['flavor_list', 'flavor_get', 'server_list_paged'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['tenant_get'],
         api.glance: ['image_list_detailed'],
         api.cinder: ['volume_list']
     })
@@ -82,7 +89,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         full_flavors = OrderedDict([(f.id, f) for f in flavors])
         self.mock_server_list_paged.return_value = [servers, False, False]
         self.mock_flavor_list.side_effect = self.exceptions.nova
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
 
         def _get_full_flavor(request, id):
             return full_flavors[id]
@@ -103,7 +111,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
             sort_dir='desc',
             search_opts=search_opts)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self._assert_tenant_get_called(servers)
         self.mock_flavor_get.assert_has_calls(
             [mock.call(test.IsHttpRequest(), s.flavor['id']) for s in servers])
         self.assertEqual(len(servers), self.mock_flavor_get.call_count)
@@ -111,7 +119,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_mocks({
         api.nova: ['flavor_list', 'flavor_get', 'server_list_paged'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['tenant_get'],
         api.glance: ['image_list_detailed'],
         api.cinder: ['volume_list']
     })
@@ -127,7 +135,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.mock_volume_list.return_value = self.cinder_volumes.list()
         self.mock_flavor_list.return_value = self.flavors.list()
         self.mock_server_list_paged.return_value = [servers, False, False]
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
         self.mock_flavor_get.side_effect = self.exceptions.nova
 
         res = self.client.get(INDEX_URL)
@@ -142,21 +151,22 @@ class InstanceViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest(),
             sort_dir='desc',
             search_opts=search_opts)
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self._assert_tenant_get_called(servers)
         self.mock_flavor_get.assert_has_calls(
             [mock.call(test.IsHttpRequest(), s.flavor['id']) for s in servers])
         self.assertEqual(len(servers), self.mock_flavor_get.call_count)
 
     @test.create_mocks({
         api.nova: ['server_list_paged', 'flavor_list'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['tenant_get'],
         api.glance: ['image_list_detailed'],
         api.cinder: ['volume_list']
     })
     def test_index_server_list_exception(self):
         self.mock_server_list_paged.side_effect = self.exceptions.nova
         self.mock_flavor_list.return_value = self.flavors.list()
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
         self.mock_image_list_detailed.side_effect =\
             self._mock_image_list_detailed_side_effect
         self.mock_volume_list.return_value = self.cinder_volumes.list()
@@ -170,7 +180,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest(),
             sort_dir='desc',
             search_opts=search_opts)
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_tenant_get.assert_not_called()
         self.assertEqual(self.mock_image_list_detailed.call_count, 4)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
 
@@ -213,12 +223,13 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_mocks({
         api.nova: ['flavor_list', 'server_list_paged'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['tenant_get'],
         api.glance: ['image_list_detailed'],
         api.cinder: ['volume_list']
     })
     def test_index_options_before_migrate(self):
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
         self.mock_image_list_detailed.side_effect =\
             self._mock_image_list_detailed_side_effect
         self.mock_volume_list.return_value = self.cinder_volumes.list()
@@ -230,7 +241,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.assertNotContains(res, "instances__confirm")
         self.assertNotContains(res, "instances__revert")
 
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self._assert_tenant_get_called(self.servers.list())
         self.assertEqual(self.mock_image_list_detailed.call_count, 4)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
         search_opts = {'marker': None, 'paginate': True, 'all_tenants': True}
@@ -241,7 +252,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_mocks({
         api.nova: ['flavor_list', 'server_list_paged'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['tenant_get'],
         api.glance: ['image_list_detailed'],
         api.cinder: ['volume_list']
     })
@@ -251,7 +262,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         server1.status = "VERIFY_RESIZE"
         server2 = servers[2]
         server2.status = "VERIFY_RESIZE"
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
         self.mock_image_list_detailed.side_effect =\
             self._mock_image_list_detailed_side_effect
         self.mock_volume_list.return_value = self.cinder_volumes.list()
@@ -263,7 +275,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.assertContains(res, "instances__revert")
         self.assertNotContains(res, "instances__migrate")
 
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self._assert_tenant_get_called(servers)
         self.assertEqual(self.mock_image_list_detailed.call_count, 4)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
         search_opts = {'marker': None, 'paginate': True, 'all_tenants': True}
@@ -459,7 +471,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
         api.nova: ['flavor_list',
                    'flavor_get',
                    'server_list_paged'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['tenant_get'],
         api.glance: ['image_list_detailed'],
         api.cinder: ['volume_list']
     })
@@ -480,7 +492,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.mock_image_list_detailed.side_effect =\
             self._mock_image_list_detailed_side_effect
         self.mock_volume_list.return_value = self.cinder_volumes.list()
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(tenants)
         self.mock_flavor_get.side_effect = self.exceptions.nova
 
         if marker:
@@ -491,7 +503,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.assertTemplateUsed(res, INDEX_TEMPLATE)
         self.assertEqual(res.status_code, 200)
 
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self._assert_tenant_get_called(servers)
         self.assertEqual(self.mock_image_list_detailed.call_count, 4)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
         search_opts = {'marker': marker, 'paginate': True, 'all_tenants': True}
@@ -39,6 +39,7 @@ from openstack_dashboard.dashboards.project.instances import views
 from openstack_dashboard.dashboards.project.instances.workflows \
     import update_instance
 from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import project_names
 from openstack_dashboard.utils import settings as setting_utils
 
 
@@ -95,6 +96,16 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
             exceptions.handle(self.request, msg)
             return {}
 
+    def _get_tenant_names(self, instances):
+        # Look up the names of the projects of the listed instances only
+        try:
+            return project_names.get_names(
+                self.request, [inst.tenant_id for inst in instances])
+        except Exception:
+            msg = _('Unable to retrieve instance project information.')
+            exceptions.handle(self.request, msg)
+            return {}
+
     def _get_images(self):
         # Gather our images to correlate our instances to them
         try:
@@ -176,17 +187,21 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
 
         self._needs_filter_first = False
 
-        results = futurist_utils.call_functions_parallel(
-            self._get_images,
-            self._get_volumes,
-            self._get_flavors,
-            self._get_tenants)
-        image_dict, volume_dict, flavor_dict, tenant_dict = results
+        # All the projects are only needed to filter the instances by the
+        # name of their project.
+        filter_by_project = 'project' in search_opts
+        functions = [self._get_images, self._get_volumes, self._get_flavors]
+        if filter_by_project:
+            functions.append(self._get_tenants)
+        results = futurist_utils.call_functions_parallel(*functions)
+        image_dict, volume_dict, flavor_dict = results[:3]
 
         non_api_filter_info = [
-            ('project', 'tenant_id', tenant_dict.values()),
             ('flavor_name', 'flavor', flavor_dict.values()),
         ]
+        if filter_by_project:
+            non_api_filter_info.append(
+                ('project', 'tenant_id', results[3].values()))
 
         filter_by_image_name = 'image_name' in search_opts
         if filter_by_image_name:
@@ -203,6 +218,7 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
 
         if not filter_by_image_name:
             image_dict = self._get_images()
+        tenant_names = self._get_tenant_names(instances)
 
         # Loop through instances to get image, flavor and tenant info.
         for inst in instances:
@@ -220,8 +236,7 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
             inst.full_flavor = instance_utils.resolve_flavor(self.request,
                                                              inst, flavor_dict)
 
-            tenant = tenant_dict.get(inst.tenant_id, None)
-            inst.tenant_name = getattr(tenant, "name", None)
+            inst.tenant_name = tenant_names.get(inst.tenant_id)
         return instances
 
     def _populate_image_info(self, instance, image_dict, volume_dict):
@@ -17,7 +17,9 @@
 #    under the License.
 
 import datetime
+from unittest import mock
 
+from django import http
 from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils import encoding
@@ -61,15 +63,16 @@ class UsageViewTests(test.BaseAdminViewTests):
         return start_day, now
 
     @test.create_mocks({api.nova: ('usage_list',),
-                        api.keystone: ('tenant_list',)})
+                        api.keystone: ('tenant_get',)})
     def _test_usage(self, nova_stu_enabled=True, tenant_deleted=False,
                     overview_days_range=1):
         usage_list = [api.nova.NovaUsage(u) for u in self.usages.list()]
         if tenant_deleted:
-            self.mock_tenant_list.return_value = [[self.tenants.first()],
-                                                  False]
+            self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+                [self.tenants.first()])
         else:
-            self.mock_tenant_list.return_value = [self.tenants.list(), False]
+            self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+                self.tenants.list())
         self.mock_usage_list.return_value = usage_list
 
         res = self.client.get(reverse('horizon:admin:overview:index'))
@@ -124,8 +127,10 @@ class UsageViewTests(test.BaseAdminViewTests):
         else:
             self.assertNotContains(res, usage_table, html=True)
 
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
         if nova_stu_enabled:
+            self.mock_tenant_get.assert_has_calls(
+                [mock.call(test.IsHttpRequest(), u.tenant_id, admin=True)
+                 for u in usage_list], any_order=True)
             start_day, now = self._get_start_end_range(overview_days_range)
             self.mock_usage_list.assert_called_once_with(
                 test.IsHttpRequest(),
@@ -136,6 +141,7 @@ class UsageViewTests(test.BaseAdminViewTests):
                                   now.month,
                                   now.day, 23, 59, 59, 0))
         else:
+            self.mock_tenant_get.assert_not_called()
             self.mock_usage_list.assert_not_called()
 
     @override_settings(OVERVIEW_DAYS_RANGE=None)
@@ -152,34 +158,43 @@ class UsageViewTests(test.BaseAdminViewTests):
     def test_usage_csv_disabled(self):
         self._test_usage_csv(nova_stu_enabled=False, overview_days_range=None)
 
-    @test.create_mocks({api.nova: ('usage_list',),
-                        api.keystone: ('tenant_list',)})
+    @test.create_mocks({api.nova: ('usage_list_pages',),
+                        api.keystone: ('tenant_get',)})
     def _test_usage_csv(self, nova_stu_enabled=True, overview_days_range=1):
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
         usage_obj = [api.nova.NovaUsage(u) for u in self.usages.list()]
-        self.mock_usage_list.return_value = usage_obj
+        # The usage of the first project is split across two pages.
+        self.mock_usage_list_pages.return_value = iter([usage_obj,
+                                                        usage_obj[:1]])
+        names = {tenant.id: tenant.name for tenant in self.tenants.list()}
 
         csv_url = reverse('horizon:admin:overview:index') + "?format=csv"
         res = self.client.get(csv_url)
+        self.assertIsInstance(res, http.StreamingHttpResponse)
         self.assertTemplateUsed(res, 'admin/overview/usage.csv')
         self.assertIsInstance(res.context['usage'], usage.GlobalUsage)
+        content = b''.join(res.streaming_content).decode()
         hdr = '"Project Name","vCPUs","RAM (MB)","Disk (GB)","Usage (Hours)"'
-        self.assertContains(res, '%s\r\n' % hdr)
+        self.assertIn('%s\r\n' % hdr, content)
 
         if nova_stu_enabled:
-            for obj in usage_obj:
+            for i, obj in enumerate(usage_obj):
+                factor = 2 if i == 0 else 1
                 row = '"{0}","{1}","{2}","{3}","{4:.2f}"\r\n'.format(
-                    obj.project_name,
-                    obj.vcpus,
-                    obj.memory_mb,
-                    obj.disk_gb_hours,
-                    obj.vcpu_hours)
-                self.assertContains(res, row)
-
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+                    names.get(obj.tenant_id, '%s (Deleted)' % obj.tenant_id),
+                    obj.vcpus * factor,
+                    obj.memory_mb * factor,
+                    obj.local_gb * factor,
+                    obj.vcpu_hours * factor)
+                self.assertIn(row, content)
+
         if nova_stu_enabled:
+            self.mock_tenant_get.assert_has_calls(
+                [mock.call(test.IsHttpRequest(), u.tenant_id, admin=True)
+                 for u in usage_obj], any_order=True)
             start_day, now = self._get_start_end_range(overview_days_range)
-            self.mock_usage_list.assert_called_once_with(
+            self.mock_usage_list_pages.assert_called_once_with(
                 test.IsHttpRequest(),
                 datetime.datetime(start_day.year,
                                   start_day.month,
@@ -189,4 +204,5 @@ class UsageViewTests(test.BaseAdminViewTests):
                                   now.month,
                                   now.day, 23, 59, 59, 0))
         else:
-            self.mock_usage_list.assert_not_called()
+            self.mock_tenant_get.assert_not_called()
+            self.mock_usage_list_pages.assert_not_called()
@@ -24,11 +24,11 @@ from django.utils.translation import gettext_lazy as _
 from horizon import exceptions
 from horizon.utils import csvbase
 
-from openstack_dashboard import api
 from openstack_dashboard import usage
+from openstack_dashboard.utils import project_names
 
 
-class GlobalUsageCsvRenderer(csvbase.BaseCsvResponse):
+class GlobalUsageCsvRenderer(csvbase.BaseCsvStreamingResponse):
 
     columns = [_("Project Name"), _("vCPUs"), _("RAM (MB)"),
                _("Disk (GB)"), _("Usage (Hours)")]
@@ -58,17 +58,17 @@ class GlobalOverview(usage.UsageView):
         data = super().get_data()
         # Pre-fill project names
         try:
-            projects, has_more = api.keystone.tenant_list(self.request)
+            names = project_names.get_names(
+                self.request, [instance.tenant_id for instance in data])
         except Exception:
-            projects = []
+            names = {}
             exceptions.handle(self.request,
                               _('Unable to retrieve project list.'))
         for instance in data:
-            project = [t for t in projects if t.id == instance.tenant_id]
             # If we could not get the project name, show the tenant_id with
             # a 'Deleted' identifier instead.
-            if project:
-                instance.project_name = getattr(project[0], "name", None)
+            if instance.tenant_id in names:
+                instance.project_name = names[instance.tenant_id]
             else:
                 deleted = _("Deleted")
                 instance.project_name = format_lazy(
@@ -42,7 +42,7 @@ class VolumeTests(test.BaseAdminViewTests):
     @test.create_mocks({
         api.nova: ['server_list'],
         api.cinder: ['volume_snapshot_list', 'volume_list_paged'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['tenant_get']})
     def _test_index(self, instanceless_volumes):
         volumes = self.cinder_volumes.list()
         if instanceless_volumes:
@@ -55,8 +55,6 @@ class VolumeTests(test.BaseAdminViewTests):
         if not instanceless_volumes:
             self.mock_server_list.return_value = [self.servers.list(), False]
 
-        self.mock_tenant_list.return_value = [[self.tenants.list(), False]]
-
         res = self.client.get(INDEX_URL)
         if not instanceless_volumes:
             self.mock_server_list.assert_called_once_with(
@@ -67,7 +65,8 @@ class VolumeTests(test.BaseAdminViewTests):
             search_opts={'all_tenants': True})
         self.mock_volume_snapshot_list.assert_called_once_with(
             test.IsHttpRequest(), search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once()
+        # The test volumes have no project to look up.
+        self.mock_tenant_get.assert_not_called()
         self.assertTemplateUsed(res, 'horizon/common/_data_table_view.html')
         volumes = res.context['volumes_table'].data
         self.assertCountEqual(volumes, self.cinder_volumes.list())
@@ -81,7 +80,7 @@ class VolumeTests(test.BaseAdminViewTests):
     @test.create_mocks({
         api.nova: ['server_list'],
         api.cinder: ['volume_snapshot_list', 'volume_list_paged'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['tenant_get']})
     def _test_index_paginated(self, marker, sort_dir, volumes, url,
                               has_more, has_prev):
         vol_snaps = self.cinder_volume_snapshots.list()
@@ -90,7 +89,6 @@ class VolumeTests(test.BaseAdminViewTests):
             [volumes, has_more, has_prev]
         self.mock_volume_snapshot_list.return_value = vol_snaps
         self.mock_server_list.return_value = [self.servers.list(), False]
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
 
         res = self.client.get(parse.unquote(url))
 
@@ -104,7 +102,8 @@ class VolumeTests(test.BaseAdminViewTests):
                 'all_tenants': True})
         self.mock_volume_snapshot_list.assert_called_once_with(
             test.IsHttpRequest(), search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once()
+        # The test volumes have no project to look up.
+        self.mock_tenant_get.assert_not_called()
 
         self.assertTemplateUsed(res, 'horizon/common/_data_table_view.html')
         self.assertEqual(res.status_code, 200)
@@ -36,6 +36,7 @@ from openstack_dashboard.dashboards.admin.volumes \
 from openstack_dashboard.dashboards.project.volumes \
     import views as volumes_views
 from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import project_names
 from openstack_dashboard.utils import settings as setting_utils
 
 
@@ -64,16 +65,14 @@ class VolumesView(tables.PagedTableMixin, volumes_views.VolumeTableMixIn,
         volumes = []
         attached_instance_ids = []
         tenants = []
-        tenant_dict = {}
         instances = []
         volume_ids_with_snapshots = []
 
         def _task_get_tenants():
-            # Gather our tenants to correlate against IDs
+            # Gather our tenants to filter the volumes by project name
             try:
                 tmp_tenants, __ = keystone.tenant_list(self.request)
                 tenants.extend(tmp_tenants)
-                tenant_dict.update([(t.id, t) for t in tenants])
             except Exception:
                 msg = _('Unable to retrieve volume project information.')
                 exceptions.handle(self.request, msg)
@@ -126,7 +125,6 @@ class VolumesView(tables.PagedTableMixin, volumes_views.VolumeTableMixIn,
         else:
             futurist_utils.call_functions_parallel(
                 _task_get_volumes,
-                _task_get_tenants,
                 _task_get_instances,
                 _task_get_volumes_snapshots
             )
@@ -134,10 +132,17 @@ class VolumesView(tables.PagedTableMixin, volumes_views.VolumeTableMixIn,
         self._set_volume_attributes(
             volumes, instances, volume_ids_with_snapshots)
 
-        for volume in volumes:
-            tenant_id = getattr(volume, "os-vol-tenant-attr:tenant_id", None)
-            tenant = tenant_dict.get(tenant_id, None)
-            volume.tenant_name = getattr(tenant, "name", None)
+        # Look up the names of the projects of the listed volumes only
+        tenant_ids = [getattr(volume, "os-vol-tenant-attr:tenant_id", None)
+                      for volume in volumes]
+        try:
+            tenant_names = project_names.get_names(self.request, tenant_ids)
+        except Exception:
+            tenant_names = {}
+            msg = _('Unable to retrieve volume project information.')
+            exceptions.handle(self.request, msg)
+        for volume, tenant_id in zip(volumes, tenant_ids):
+            volume.tenant_name = tenant_names.get(tenant_id)
 
         return volumes
 
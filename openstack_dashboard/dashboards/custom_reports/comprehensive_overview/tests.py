@@ -0,0 +1,277 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import json
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from openstack_dashboard import api
+from openstack_dashboard.dashboards.custom_reports import models
+from openstack_dashboard.dashboards.custom_reports import rollup
+from openstack_dashboard.dashboards.custom_reports import tests as report_tests
+from openstack_dashboard.test import helpers as test
+
+
+INDEX_URL = reverse('horizon:custom_reports:comprehensive_overview:index')
+HISTORY_URL = reverse('horizon:custom_reports:comprehensive_overview:history')
+EXPORT_URL = reverse('horizon:custom_reports:comprehensive_overview:export')
+
+
+class ComprehensiveOverviewViewTests(test.TestCase):
+
+    def _stub_api_calls(self):
+        self.mock_nova_tenant_absolute_limits.return_value = \
+            self.limits['absolute']
+        self.mock_cinder_tenant_absolute_limits.return_value = \
+            self.cinder_limits['absolute']
+        self.mock_tenant_quota_get.return_value = \
+            self.neutron_quotas.first()
+        self.mock_network_list_for_tenant.return_value = \
+            self.networks.list()
+        self.mock_tenant_floating_ip_list.return_value = \
+            self.floating_ips.list()
+        self.mock_router_list.return_value = self.routers.list()
+        self.mock_security_group_list.return_value = \
+            self.security_groups.list()
+        self.mock_server_list.return_value = [self.servers.list(), False]
+        self.mock_flavor_list.return_value = self.flavors.list()
+
+    @test.create_mocks({
+        api.nova: [('tenant_absolute_limits', 'nova_tenant_absolute_limits'),
+                   'server_list', 'flavor_list', 'flavor_get'],
+        api.cinder: [('tenant_absolute_limits',
+                      'cinder_tenant_absolute_limits')],
+        api.neutron: ['tenant_quota_get', 'network_list_for_tenant',
+                      'tenant_floating_ip_list', 'router_list',
+                      'security_group_list'],
+    })
+    def test_index(self):
+        self._stub_api_calls()
+
+        res = self.client.get(INDEX_URL)
+
+        self.assertTemplateUsed(
+            res, 'custom_reports/comprehensive_overview/index.html')
+        self.assertTrue(res.context['has_data'])
+        self.assertEqual(2, res.context['compute_data']['instances']['used'])
+        self.assertEqual(20, res.context['storage_data']['volumes']['limit'])
+        self.assertEqual(len(self.networks.list()),
+                         res.context['network_data']['networks']['used'])
+        self.assertEqual(10, res.context['network_data']['networks']['limit'])
+        self.assertEqual(len(self.servers.list()),
+                         len(res.context['instance_details']))
+        self.assertNotEqual("未知", res.context['instance_details'][0]['uptime'])
+        self.assertFalse(res.context['has_history'])
+
+        self.mock_nova_tenant_absolute_limits.assert_called_once_with(
+            test.IsHttpRequest(), reserved=False, tenant_id=self.tenant.id)
+        self.mock_cinder_tenant_absolute_limits.assert_called_once_with(
+            test.IsHttpRequest(), self.tenant.id)
+        self.mock_tenant_quota_get.assert_called_once_with(
+            test.IsHttpRequest(), self.tenant.id)
+        self.mock_server_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_flavor_get.assert_not_called()
+        # Snapshots are written by the collect_snapshots command only.
+        self.assertFalse(models.TenantResourceSnapshot.objects.exists())
+
+    @test.create_mocks({
+        api.nova: [('tenant_absolute_limits', 'nova_tenant_absolute_limits'),
+                   'server_list', 'flavor_list', 'flavor_get'],
+        api.cinder: [('tenant_absolute_limits',
+                      'cinder_tenant_absolute_limits')],
+        api.neutron: ['tenant_quota_get', 'network_list_for_tenant',
+                      'tenant_floating_ip_list', 'router_list',
+                      'security_group_list'],
+    })
+    def test_index_flavor_not_in_flavor_list(self):
+        self._stub_api_calls()
+        flavor = self.flavors.first()
+        self.mock_flavor_list.return_value = self.flavors.list()[1:]
+        self.mock_flavor_get.return_value = flavor
+
+        res = self.client.get(INDEX_URL)
+
+        for detail in res.context['instance_details']:
+            self.assertEqual(flavor.vcpus, detail['vcpus'])
+            self.assertEqual(flavor.ram, detail['ram'])
+        # All servers share one flavor, so it is fetched only once.
+        self.mock_flavor_get.assert_called_once_with(test.IsHttpRequest(),
+                                                     flavor.id)
+
+    @test.create_mocks({
+        api.nova: [('tenant_absolute_limits', 'nova_tenant_absolute_limits'),
+                   'server_list', 'flavor_list', 'flavor_get'],
+        api.cinder: [('tenant_absolute_limits',
+                      'cinder_tenant_absolute_limits')],
+        api.neutron: ['tenant_quota_get', 'network_list_for_tenant',
+                      'tenant_floating_ip_list', 'router_list',
+                      'security_group_list'],
+    })
+    def test_index_collector_failure(self):
+        self._stub_api_calls()
+        self.mock_cinder_tenant_absolute_limits.side_effect = \
+            self.exceptions.cinder
+        self.mock_router_list.side_effect = self.exceptions.neutron
+
+        res = self.client.get(INDEX_URL)
+
+        self.assertTrue(res.context['has_data'])
+        self.assertIsNotNone(res.context['compute_data'])
+        self.assertIsNone(res.context['storage_data'])
+        self.assertIsNone(res.context['network_data'])
+        self.assertEqual(len(self.servers.list()),
+                         len(res.context['instance_details']))
+
+    @override_settings(CUSTOM_REPORTS_SNAPSHOT_INTERVAL=600,
+                       CUSTOM_REPORTS_HISTORY_MIN_POINTS=10000)
+    @test.create_mocks({
+        api.nova: [('tenant_absolute_limits', 'nova_tenant_absolute_limits'),
+                   'server_list', 'flavor_list', 'flavor_get'],
+        api.cinder: [('tenant_absolute_limits',
+                      'cinder_tenant_absolute_limits')],
+        api.neutron: ['tenant_quota_get', 'network_list_for_tenant',
+                      'tenant_floating_ip_list', 'router_list',
+                      'security_group_list'],
+    })
+    def test_index_trend_data(self):
+        self._stub_api_calls()
+        now = timezone.now()
+        for hours in (3, 2, 1):
+            report_tests.create_snapshot(
+                self.tenant.id, now - datetime.timedelta(hours=hours),
+                used=hours)
+
+        res = self.client.get(INDEX_URL)
+
+        self.assertTrue(res.context['has_history'])
+        trend_data = res.context['trend_data']
+        self.assertEqual(3, len(trend_data['dates']))
+        self.assertEqual((3, 2, 1), trend_data['cores'])
+        self.assertEqual((3, 2, 1), trend_data['floatingips'])
+
+
+class HistoryViewTests(test.TestCase):
+
+    def test_history_no_data(self):
+        res = self.client.get(HISTORY_URL)
+        self.assertFalse(res.context['has_history'])
+
+    @override_settings(CUSTOM_REPORTS_HISTORY_MIN_POINTS=100)
+    def test_history_reads_hourly_rollup(self):
+        now = timezone.now()
+        for hours in (50, 49, 2):
+            report_tests.create_snapshot(
+                self.tenant.id, now - datetime.timedelta(hours=hours),
+                used=hours)
+        report_tests.create_snapshot('other', now, used=1)
+        rollup.rollup_all()
+
+        res = self.client.get(HISTORY_URL)
+
+        self.assertTemplateUsed(
+            res, 'custom_reports/comprehensive_overview/history.html')
+        self.assertTrue(res.context['has_history'])
+        self.assertEqual('hourly', res.context['resolution'])
+        self.assertEqual(3, res.context['record_count'])
+        self.assertEqual(3, len(res.context['history_rows']))
+        self.assertEqual(
+            res.context['record_count'],
+            len(res.context['detailed_history']['compute']['instances']))
+        self.assertAlmostEqual(
+            sum((50, 49, 2)) / 3.0,
+            res.context['avg_usage']['compute']['instances'], delta=0.01)
+
+    def test_history_daily_window(self):
+        report_tests.create_snapshot(self.tenant.id, timezone.now(), used=1)
+        rollup.rollup_all()
+
+        res = self.client.get(HISTORY_URL, {'days': 365})
+
+        self.assertEqual('daily', res.context['resolution'])
+        self.assertEqual(1, res.context['record_count'])
+
+
+class ExportViewTests(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.day = timezone.now().replace(hour=12, minute=0, second=0,
+                                          microsecond=0)
+        for days, used in ((10, 1), (5, 2), (0, 3)):
+            report_tests.create_snapshot(
+                self.tenant.id, self.day - datetime.timedelta(days=days),
+                used=used)
+        report_tests.create_snapshot('other', self.day, used=4)
+
+    def _content(self, res):
+        return b''.join(res.streaming_content).decode()
+
+    def test_export_csv(self):
+        start = (self.day - datetime.timedelta(days=5)).date()
+
+        res = self.client.get(EXPORT_URL, {'start': start.isoformat()})
+
+        self.assertEqual('text/csv', res['Content-Type'])
+        lines = self._content(res).splitlines()
+        self.assertEqual('"tenant_id","created_at","instances_used"',
+                         lines[0][:len('"tenant_id","created_at",'
+                                       '"instances_used"')])
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[1].startswith('"%s","%s","2"' % (
+            self.tenant.id,
+            (self.day - datetime.timedelta(days=5)).isoformat())))
+        self.assertTrue(lines[2].startswith('"%s","%s","3"' % (
+            self.tenant.id, self.day.isoformat())))
+
+    def test_export_ndjson(self):
+        end = (self.day - datetime.timedelta(days=5)).date()
+
+        res = self.client.get(EXPORT_URL, {'format': 'ndjson',
+                                           'end': end.isoformat()})
+
+        self.assertEqual('application/x-ndjson', res['Content-Type'])
+        rows = [json.loads(line)
+                for line in self._content(res).splitlines()]
+        self.assertEqual([1, 2], [row['instances_used'] for row in rows])
+        self.assertEqual({self.tenant.id}, {row['tenant_id'] for row in rows})
+        self.assertEqual(10, rows[0]['cores_limit'])
+
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    def test_export_all_tenants_forbidden(self):
+        res = self.client.get(EXPORT_URL, {'tenant': 'all'})
+        self.assertEqual(403, res.status_code)
+
+    def test_export_invalid_parameters(self):
+        res = self.client.get(EXPORT_URL, {'format': 'xml'})
+        self.assertEqual(400, res.status_code)
+        res = self.client.get(EXPORT_URL, {'start': '2024-13-01'})
+        self.assertEqual(400, res.status_code)
+
+
+class AdminExportViewTests(test.BaseAdminViewTests):
+
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    def test_export_all_tenants(self):
+        report_tests.create_snapshot(self.tenant.id, timezone.now())
+        report_tests.create_snapshot('other', timezone.now())
+
+        res = self.client.get(EXPORT_URL, {'format': 'ndjson',
+                                           'tenant': 'all'})
+
+        rows = [json.loads(line) for line in
+                b''.join(res.streaming_content).decode().splitlines()]
+        self.assertEqual({self.tenant.id, 'other'},
+                         {row['tenant_id'] for row in rows})
@@ -17,4 +17,5 @@ from openstack_dashboard.dashboards.custom_reports.comprehensive_overview import
 urlpatterns = [
     re_path(r'^$', views.IndexView.as_view(), name='index'),
     re_path(r'^history/$', views.HistoryView.as_view(), name='history'),
+    re_path(r'^export/$', views.ExportView.as_view(), name='export'),
 ]
@@ -10,19 +10,45 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+from datetime import timedelta
+import json
 import logging
-from datetime import datetime, timedelta
 
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django import http
+from django.utils import dateparse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Avg
+from django.views import generic
 
+from horizon.utils import csvbase
+from horizon.utils import filters
 from horizon import views
 
 from openstack_dashboard import api
-from openstack_dashboard.dashboards.custom_reports.models import TenantResourceSnapshot
+from openstack_dashboard.dashboards.custom_reports import models
+from openstack_dashboard.dashboards.custom_reports import rollup
+from openstack_dashboard.dashboards.project.instances \
+    import utils as instance_utils
+from openstack_dashboard import policy
+from openstack_dashboard.usage import quotas
+from openstack_dashboard.utils import futurist_utils
 
 LOG = logging.getLogger(__name__)
 
+# 综合概览页面7天趋势图使用的指标
+TREND_METRICS = ('instances', 'cores', 'ram', 'volumes', 'gigabytes',
+                 'floatingips')
+
+# 历史趋势页面使用的指标（按资源类型分组）
+HISTORY_METRICS = {
+    'compute': ('instances', 'cores', 'ram'),
+    'storage': ('volumes', 'gigabytes', 'snapshots'),
+    'network': ('networks', 'floatingips', 'routers', 'security_groups'),
+}
+
 
 class IndexView(views.HorizonTemplateView):
     template_name = 'custom_reports/comprehensive_overview/index.html'
@@ -40,154 +66,164 @@ class IndexView(views.HorizonTemplateView):
             return 0
         return int((numerator / denominator) * 100)
 
+    def _collect(self, name, func, *args, **kwargs):
+        """Call an API function, returning None instead of raising."""
+        try:
+            return func(self.request, *args, **kwargs)
+        except Exception as e:
+            LOG.error("Error retrieving %s: %s", name, e)
+            return None
+
+    def _build_section(self, items):
+        """Build a {key: {'used', 'limit', 'percent'}} section."""
+        section = {}
+        for key, used, limit in items:
+            limit = self._normalize_quota(limit)
+            section[key] = {
+                'used': used,
+                'limit': limit,
+                'percent': self._safe_divide(used, limit),
+            }
+        return section
+
+    def _get_flavors(self, request):
+        flavors = api.nova.flavor_list(request)
+        return dict((str(flavor.id), flavor) for flavor in flavors)
+
+    def _get_instance_details(self, instances, flavors):
+        """Build the instance table rows in a single pass.
+
+        Flavors are resolved from the bulk flavor map (or the flavor
+        embedded in the server with Nova API >=2.47) and only a flavor
+        missing from the map is fetched, once per flavor id.
+        """
+        now = timezone.now()
+        instance_details = []
+
+        for instance in instances:
+            # 获取实例的 flavor 信息
+            flavor_id = instance.flavor.get('id')
+            flavor = instance_utils.resolve_flavor(self.request, instance,
+                                                   flavors)
+            if flavor_id:
+                flavors.setdefault(flavor_id, flavor)
+
+            # 计算运行时长
+            created_dt = filters.parse_isotime(
+                getattr(instance, 'created', None))
+            if created_dt:
+                uptime = now - created_dt
+                uptime_str = f"{uptime.days}天 {uptime.seconds//3600}小时"
+            else:
+                uptime_str = "未知"
+
+            instance_details.append({
+                'id': instance.id,
+                'name': instance.name,
+                'status': instance.status,
+                'vcpus': flavor.vcpus,
+                'ram': flavor.ram,  # MB
+                'disk': flavor.disk,  # GB
+                'uptime': uptime_str,
+            })
+        return instance_details
+
+    def _collect_all(self, tenant_id):
+        """Run the independent API collectors concurrently.
+
+        A collector which fails or does not finish within
+        CUSTOM_REPORTS_COLLECTOR_TIMEOUT seconds returns None so that
+        only its section is left empty. The quota limits are read through
+        the project's quota limits cache.
+        """
+        results = futurist_utils.call_functions_parallel(
+            (self._collect, ['compute limits', quotas.get_compute_limits],
+             {'reserved': False}),
+            (self._collect, ['storage limits', quotas.get_volume_limits]),
+            (self._collect, ['network quotas', quotas.get_network_quotas,
+                             tenant_id]),
+            (self._collect, ['networks', api.neutron.network_list_for_tenant,
+                             tenant_id]),
+            (self._collect, ['floating IPs',
+                             api.neutron.tenant_floating_ip_list]),
+            (self._collect, ['routers', api.neutron.router_list],
+             {'tenant_id': tenant_id}),
+            (self._collect, ['security groups',
+                             api.neutron.security_group_list],
+             {'tenant_id': tenant_id}),
+            (self._collect, ['instances', api.nova.server_list]),
+            (self._collect, ['flavors', self._get_flavors]),
+            timeout=settings.CUSTOM_REPORTS_COLLECTOR_TIMEOUT)
+        return dict(zip(('compute_limits', 'volume_limits', 'neutron_quotas',
+                         'networks', 'floatingips', 'routers',
+                         'security_groups', 'instances', 'flavors'), results))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        
+
         try:
             tenant_id = self.request.user.tenant_id
-            
+            results = self._collect_all(tenant_id)
+
             # ===== 1. 计算资源 =====
-            try:
-                compute_limits = api.nova.tenant_absolute_limits(self.request, reserved=False)
-                compute_data = {
-                    'instances': {
-                        'used': compute_limits.get('totalInstancesUsed', 0),
-                        'limit': self._normalize_quota(compute_limits.get('maxTotalInstances', 0)),
-                    },
-                    'cores': {
-                        'used': compute_limits.get('totalCoresUsed', 0),
-                        'limit': self._normalize_quota(compute_limits.get('maxTotalCores', 0)),
-                    },
-                    'ram': {
-                        'used': compute_limits.get('totalRAMUsed', 0),
-                        'limit': self._normalize_quota(compute_limits.get('maxTotalRAMSize', 0)),
-                    },
-                }
-                # 计算使用率
-                compute_data['instances']['percent'] = self._safe_divide(
-                    compute_data['instances']['used'], compute_data['instances']['limit'])
-                compute_data['cores']['percent'] = self._safe_divide(
-                    compute_data['cores']['used'], compute_data['cores']['limit'])
-                compute_data['ram']['percent'] = self._safe_divide(
-                    compute_data['ram']['used'], compute_data['ram']['limit'])
-            except Exception as e:
-                LOG.error("Error retrieving compute data: %s", e)
+            compute_limits = results['compute_limits']
+            if compute_limits is not None:
+                compute_data = self._build_section((
+                    ('instances', compute_limits.get('totalInstancesUsed', 0),
+                     compute_limits.get('maxTotalInstances', 0)),
+                    ('cores', compute_limits.get('totalCoresUsed', 0),
+                     compute_limits.get('maxTotalCores', 0)),
+                    ('ram', compute_limits.get('totalRAMUsed', 0),
+                     compute_limits.get('maxTotalRAMSize', 0)),
+                ))
+            else:
                 compute_data = None
-            
+
             # ===== 2. 存储资源 =====
-            try:
-                volume_limits = api.cinder.tenant_absolute_limits(self.request)
-                storage_data = {
-                    'volumes': {
-                        'used': volume_limits.get('totalVolumesUsed', 0),
-                        'limit': self._normalize_quota(volume_limits.get('maxTotalVolumes', 0)),
-                    },
-                    'gigabytes': {
-                        'used': volume_limits.get('totalGigabytesUsed', 0),
-                        'limit': self._normalize_quota(volume_limits.get('maxTotalVolumeGigabytes', 0)),
-                    },
-                    'snapshots': {
-                        'used': volume_limits.get('totalSnapshotsUsed', 0),
-                        'limit': self._normalize_quota(volume_limits.get('maxTotalSnapshots', 0)),
-                    },
-                }
-                storage_data['volumes']['percent'] = self._safe_divide(
-                    storage_data['volumes']['used'], storage_data['volumes']['limit'])
-                storage_data['gigabytes']['percent'] = self._safe_divide(
-                    storage_data['gigabytes']['used'], storage_data['gigabytes']['limit'])
-                storage_data['snapshots']['percent'] = self._safe_divide(
-                    storage_data['snapshots']['used'], storage_data['snapshots']['limit'])
-            except Exception as e:
-                LOG.error("Error retrieving storage data: %s", e)
+            volume_limits = results['volume_limits']
+            if volume_limits is not None:
+                storage_data = self._build_section((
+                    ('volumes', volume_limits.get('totalVolumesUsed', 0),
+                     volume_limits.get('maxTotalVolumes', 0)),
+                    ('gigabytes', volume_limits.get('totalGigabytesUsed', 0),
+                     volume_limits.get('maxTotalVolumeGigabytes', 0)),
+                    ('snapshots', volume_limits.get('totalSnapshotsUsed', 0),
+                     volume_limits.get('maxTotalSnapshots', 0)),
+                ))
+            else:
                 storage_data = None
-            
+
             # ===== 3. 网络资源 =====
-            try:
-                neutron_quotas = api.neutron.tenant_quota_get(self.request, tenant_id)
-                
-                # 获取实际使用数量
-                networks = api.neutron.network_list_for_tenant(self.request, tenant_id)
-                floatingips = api.neutron.tenant_floating_ip_list(self.request)
-                routers = api.neutron.router_list(self.request, tenant_id=tenant_id)
-                security_groups = api.neutron.security_group_list(self.request, tenant_id=tenant_id)
-                
-                network_data = {
-                    'networks': {
-                        'used': len(networks),
-                        'limit': self._normalize_quota(neutron_quotas.get('network', 0)),
-                    },
-                    'floatingips': {
-                        'used': len(floatingips),
-                        'limit': self._normalize_quota(neutron_quotas.get('floatingip', 0)),
-                    },
-                    'routers': {
-                        'used': len(routers),
-                        'limit': self._normalize_quota(neutron_quotas.get('router', 0)),
-                    },
-                    'security_groups': {
-                        'used': len(security_groups),
-                        'limit': self._normalize_quota(neutron_quotas.get('security_group', 0)),
-                    },
-                }
-                network_data['networks']['percent'] = self._safe_divide(
-                    network_data['networks']['used'], network_data['networks']['limit'])
-                network_data['floatingips']['percent'] = self._safe_divide(
-                    network_data['floatingips']['used'], network_data['floatingips']['limit'])
-                network_data['routers']['percent'] = self._safe_divide(
-                    network_data['routers']['used'], network_data['routers']['limit'])
-                network_data['security_groups']['percent'] = self._safe_divide(
-                    network_data['security_groups']['used'], network_data['security_groups']['limit'])
-            except Exception as e:
-                LOG.error("Error retrieving network data: %s", e)
+            neutron_quotas = results['neutron_quotas']
+            network_results = [results[key] for key in (
+                'networks', 'floatingips', 'routers', 'security_groups')]
+            if (neutron_quotas is not None and
+                    all(r is not None for r in network_results)):
+                networks, floatingips, routers, security_groups = \
+                    network_results
+                # QuotaSet.get() 返回 Quota 对象，配额值在 limit 属性中
+                network_data = self._build_section((
+                    ('networks', len(networks),
+                     neutron_quotas.get('network', 0).limit),
+                    ('floatingips', len(floatingips),
+                     neutron_quotas.get('floatingip', 0).limit),
+                    ('routers', len(routers),
+                     neutron_quotas.get('router', 0).limit),
+                    ('security_groups', len(security_groups),
+                     neutron_quotas.get('security_group', 0).limit),
+                ))
+            else:
                 network_data = None
-            
+
             # ===== 4. 实例详情列表 =====
-            try:
-                # api.nova.server_list 返回 (servers, has_more_data) 元组
-                instances, has_more = api.nova.server_list(self.request)
-                instance_details = []
-                
-                for instance in instances:
-                    # 获取实例的 flavor 信息
-                    try:
-                        flavor = api.nova.flavor_get(self.request, instance.flavor['id'])
-                        vcpus = flavor.vcpus
-                        ram = flavor.ram
-                        disk = flavor.disk
-                    except Exception:
-                        vcpus = 0
-                        ram = 0
-                        disk = 0
-                    
-                    # 计算运行时长
-                    try:
-                        created_time = getattr(instance, 'created', None)
-                        if created_time:
-                            if isinstance(created_time, str):
-                                created_dt = datetime.strptime(created_time.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                            else:
-                                created_dt = created_time
-                            uptime = datetime.now() - created_dt.replace(tzinfo=None)
-                            uptime_str = f"{uptime.days}天 {uptime.seconds//3600}小时"
-                        else:
-                            uptime_str = "未知"
-                    except Exception:
-                        uptime_str = "未知"
-                    
-                    instance_details.append({
-                        'id': instance.id,
-                        'name': instance.name,
-                        'status': instance.status,
-                        'vcpus': vcpus,
-                        'ram': ram,  # MB
-                        'disk': disk,  # GB
-                        'uptime': uptime_str,
-                    })
-                
-            except Exception as e:
-                LOG.error("Error retrieving instance details: %s", e)
+            # api.nova.server_list 返回 (servers, has_more_data) 元组
+            if results['instances'] is not None:
+                instances, has_more = results['instances']
+                instance_details = self._get_instance_details(
+                    instances, results['flavors'] or {})
+            else:
                 instance_details = []
-            
+
             # ===== 5. 资源健康度评分 =====
             health_warnings = []
             if compute_data:
@@ -206,38 +242,6 @@ class IndexView(views.HorizonTemplateView):
                 if network_data['floatingips']['percent'] > 80:
                     health_warnings.append(_("浮动IP配额使用超过80%，建议释放未使用的IP"))
 
-            # 保存资源快照到数据库（用于历史趋势分析）
-            try:
-                snapshot = TenantResourceSnapshot(
-                    tenant_id=tenant_id,
-                    instances_used=compute_data['instances']['used'],
-                    instances_limit=compute_data['instances']['limit'],
-                    cores_used=compute_data['cores']['used'],
-                    cores_limit=compute_data['cores']['limit'],
-                    ram_used=compute_data['ram']['used'],
-                    ram_limit=compute_data['ram']['limit'],
-                    volumes_used=storage_data['volumes']['used'] if storage_data else 0,
-                    volumes_limit=storage_data['volumes']['limit'] if storage_data else 0,
-                    gigabytes_used=storage_data['gigabytes']['used'] if storage_data else 0,
-                    gigabytes_limit=storage_data['gigabytes']['limit'] if storage_data else 0,
-                    snapshots_used=storage_data['snapshots']['used'] if storage_data else 0,
-                    snapshots_limit=storage_data['snapshots']['limit'] if storage_data else 0,
-                    networks_used=network_data['networks']['used'] if network_data else 0,
-                    networks_limit=network_data['networks']['limit'] if network_data else 0,
-                    floatingips_used=network_data['floatingips']['used'] if network_data else 0,
-                    floatingips_limit=network_data['floatingips']['limit'] if network_data else 0,
-                    routers_used=network_data['routers']['used'] if network_data else 0,
-                    routers_limit=network_data['routers']['limit'] if network_data else 0,
-                    security_groups_used=network_data['security_groups']['used'] if network_data else 0,
-                    security_groups_limit=network_data['security_groups']['limit'] if network_data else 0,
-                )
-                snapshot.save()
-                LOG.info("Resource snapshot saved for tenant %s", tenant_id)
-            except Exception as e:
-                LOG.error("Error saving tenant resource snapshot: %s", e)
-                import traceback
-                LOG.error("Traceback: %s", traceback.format_exc())
-
             context.update({
                 'compute_data': compute_data,
                 'storage_data': storage_data,
@@ -249,23 +253,18 @@ class IndexView(views.HorizonTemplateView):
 
             # 获取最近7天的历史数据用于趋势展示
             try:
-                seven_days_ago = datetime.now() - timedelta(days=7)
-                history_data = TenantResourceSnapshot.objects.filter(
-                    tenant_id=tenant_id,
-                    created_at__gte=seven_days_ago
-                ).order_by('created_at')
+                window = timedelta(days=7)
+                resolution = rollup.select_resolution(window)
+                series = resolution.series(
+                    tenant_id, timezone.now() - window, TREND_METRICS)
 
-                if history_data.exists():
+                if series['time']:
                     # 将数据转换为前端可用的格式
                     trend_data = {
-                        'dates': [h.created_at.strftime('%m-%d') for h in history_data],
-                        'instances': [h.instances_used for h in history_data],
-                        'cores': [h.cores_used for h in history_data],
-                        'ram': [h.ram_used for h in history_data],
-                        'volumes': [h.volumes_used for h in history_data],
-                        'gigabytes': [h.gigabytes_used for h in history_data],
-                        'floatingips': [h.floatingips_used for h in history_data],
+                        'dates': [t.strftime('%m-%d') for t in series['time']],
                     }
+                    trend_data.update(
+                        (metric, series[metric]) for metric in TREND_METRICS)
                     context['trend_data'] = trend_data
                     context['has_history'] = True
                 else:
@@ -295,65 +294,66 @@ class HistoryView(views.HorizonTemplateView):
         try:
             tenant_id = self.request.user.tenant_id
 
-            # 获取最近30天的历史数据
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            history_data = TenantResourceSnapshot.objects.filter(
-                tenant_id=tenant_id,
-                created_at__gte=thirty_days_ago
-            ).order_by('created_at')
+            # 获取最近N天（默认30天）的历史数据，按时间窗口选择汇总粒度
+            try:
+                days = int(self.request.GET.get('days', 30))
+            except ValueError:
+                days = 30
+            window = timedelta(days=max(days, 1))
+            resolution = rollup.select_resolution(window)
+            series = resolution.series(
+                tenant_id, timezone.now() - window,
+                [metric for group in HISTORY_METRICS.values()
+                 for metric in group], limits=True)
 
-            if history_data.exists():
-                # 准备详细的历史数据
+            if series['time']:
+                # 准备详细的历史数据（各指标为一列数组）
                 detailed_history = {
-                    'dates': [h.created_at.strftime('%Y-%m-%d %H:%M') for h in history_data],
-                    'compute': {
-                        'instances': [h.instances_used for h in history_data],
-                        'instances_limit': [h.instances_limit for h in history_data],
-                        'cores': [h.cores_used for h in history_data],
-                        'cores_limit': [h.cores_limit for h in history_data],
-                        'ram': [h.ram_used for h in history_data],
-                        'ram_limit': [h.ram_limit for h in history_data],
-                    },
-                    'storage': {
-                        'volumes': [h.volumes_used for h in history_data],
-                        'volumes_limit': [h.volumes_limit for h in history_data],
-                        'gigabytes': [h.gigabytes_used for h in history_data],
-                        'gigabytes_limit': [h.gigabytes_limit for h in history_data],
-                        'snapshots': [h.snapshots_used for h in history_data],
-                        'snapshots_limit': [h.snapshots_limit for h in history_data],
-                    },
-                    'network': {
-                        'networks': [h.networks_used for h in history_data],
-                        'networks_limit': [h.networks_limit for h in history_data],
-                        'floatingips': [h.floatingips_used for h in history_data],
-                        'floatingips_limit': [h.floatingips_limit for h in history_data],
-                        'routers': [h.routers_used for h in history_data],
-                        'routers_limit': [h.routers_limit for h in history_data],
-                        'security_groups': [h.security_groups_used for h in history_data],
-                        'security_groups_limit': [h.security_groups_limit for h in history_data],
-                    }
+                    'dates': [t.strftime('%Y-%m-%d %H:%M')
+                              for t in series['time']],
                 }
+                for group, metrics in HISTORY_METRICS.items():
+                    detailed_history[group] = {}
+                    for metric in metrics:
+                        detailed_history[group][metric] = series[metric]
+                        detailed_history[group][metric + '_limit'] = \
+                            series[metric + '_limit']
+
+                # 计算平均值用于分析（直接使用已获取的数据，无需额外查询）
+                def average(metric):
+                    values = series[metric]
+                    return sum(values) / len(values)
 
-                # 计算平均值用于分析
                 avg_usage = {
                     'compute': {
-                        'instances': history_data.aggregate(avg=Avg('instances_used'))['avg'],
-                        'cores': history_data.aggregate(avg=Avg('cores_used'))['avg'],
-                        'ram': history_data.aggregate(avg=Avg('ram_used'))['avg'],
+                        'instances': average('instances'),
+                        'cores': average('cores'),
+                        'ram': average('ram'),
                     },
                     'storage': {
-                        'volumes': history_data.aggregate(avg=Avg('volumes_used'))['avg'],
-                        'gigabytes': history_data.aggregate(avg=Avg('gigabytes_used'))['avg'],
+                        'volumes': average('volumes'),
+                        'gigabytes': average('gigabytes'),
                     },
                     'network': {
-                        'floatingips': history_data.aggregate(avg=Avg('floatingips_used'))['avg'],
+                        'floatingips': average('floatingips'),
                     }
                 }
 
+                # 详细数据表格的每一行
+                history_rows = list(zip(
+                    detailed_history['dates'],
+                    *(series[metric] for metric in (
+                        'instances', 'cores', 'ram', 'volumes', 'gigabytes',
+                        'floatingips', 'routers'))))
+
                 context['detailed_history'] = detailed_history
+                context['history_rows'] = history_rows
                 context['avg_usage'] = avg_usage
                 context['has_history'] = True
-                context['record_count'] = history_data.count()
+                context['record_count'] = len(series['time'])
+                context['resolution'] = resolution.name
+                context['export_start'] = (
+                    timezone.localdate() - window).isoformat()
             else:
                 context['has_history'] = False
                 context['record_count'] = 0
@@ -367,3 +367,96 @@ class HistoryView(views.HorizonTemplateView):
 
         return context
 
+
+# 导出的快照字段（每个指标的使用量和配额）
+EXPORT_FIELDS = ['tenant_id', 'created_at'] + [
+    metric + suffix for metric in rollup.METRICS
+    for suffix in ('_used', '_limit')]
+
+
+class SnapshotCsvStreamingResponse(csvbase.BaseCsvStreamingResponse):
+    columns = EXPORT_FIELDS
+
+    def __init__(self, request, rows, **kwargs):
+        self.rows = rows
+        super().__init__(request, None, {}, 'text/csv', **kwargs)
+
+    def get_row_data(self):
+        return self.rows
+
+
+class ExportView(generic.View):
+    """Stream the snapshot history as CSV or NDJSON.
+
+    Query parameters:
+
+    * format: "csv" (default) or "ndjson"
+    * start, end: inclusive YYYY-MM-DD dates, both optional
+    * tenant: the project to export, the current one by default;
+      "all" or another project requires the admin role
+    """
+
+    def _parse_day(self, name):
+        value = self.request.GET.get(name)
+        if not value:
+            return None
+        try:
+            day = dateparse.parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValueError(name)
+        return timezone.make_aware(
+            datetime.datetime.combine(day, datetime.time.min))
+
+    def get_queryset(self):
+        queryset = models.TenantResourceSnapshot.objects.all()
+        tenant = self.request.GET.get('tenant') or \
+            self.request.user.tenant_id
+        if tenant != self.request.user.tenant_id and not policy.check(
+                (("compute", "context_is_admin"),), self.request):
+            raise PermissionDenied
+        if tenant != 'all':
+            queryset = queryset.filter(tenant_id=tenant)
+        start = self._parse_day('start')
+        if start is not None:
+            queryset = queryset.filter(created_at__gte=start)
+        end = self._parse_day('end')
+        if end is not None:
+            queryset = queryset.filter(created_at__lt=end + timedelta(days=1))
+        return queryset.order_by('created_at', 'id')
+
+    def iter_rows(self, queryset):
+        # values_list() 避免构造模型实例，iterator() 使用服务端游标分块读取
+        rows = queryset.values_list(*EXPORT_FIELDS).iterator(
+            chunk_size=settings.CUSTOM_REPORTS_EXPORT_CHUNK_SIZE)
+        created_at = EXPORT_FIELDS.index('created_at')
+        for row in rows:
+            row = list(row)
+            row[created_at] = row[created_at].isoformat()
+            yield row
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in ('csv', 'ndjson'):
+            return http.HttpResponseBadRequest(
+                _("不支持的导出格式: %s") % export_format)
+        try:
+            queryset = self.get_queryset()
+        except ValueError as e:
+            return http.HttpResponseBadRequest(
+                _("无效的日期参数: %s") % e)
+
+        rows = self.iter_rows(queryset)
+        filename = 'resource_snapshots.%s' % export_format
+        if export_format == 'csv':
+            return SnapshotCsvStreamingResponse(request, rows,
+                                                filename=filename)
+
+        response = http.StreamingHttpResponse(
+            (json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n'
+             for row in rows),
+            content_type='application/x-ndjson')
+        response['Content-Disposition'] = \
+            'attachment; filename="%s"' % filename
+        return response
@@ -19,7 +19,7 @@ import horizon
 class CustomReports(horizon.Dashboard):
     name = _("自定义报表")
     slug = "custom_reports"
-    panels = ('comprehensive_overview', 'resource_usage',)
+    panels = ('comprehensive_overview', 'resource_usage', 'project_capacity',)
     default_panel = 'comprehensive_overview'
     policy_rules = (("compute", "compute:get_all"),)
 
@@ -11,12 +11,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from datetime import datetime, timedelta
+import datetime
+import time
 
 from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Min
 from django.utils import timezone
 
-from openstack_dashboard.dashboards.custom_reports.models import TenantResourceSnapshot
+from openstack_dashboard.dashboards.custom_reports import models
+from openstack_dashboard.dashboards.custom_reports import partitions
 
 
 class Command(BaseCommand):
@@ -34,73 +39,123 @@ class Command(BaseCommand):
             action='store_true',
             help='模拟运行，不实际删除数据',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='每批删除的记录数（默认1000条），每批单独提交以避免长时间锁表',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='每批删除之间暂停的秒数（默认0），用于降低数据库压力',
+        )
+
+    def show_tenant_counts(self, old_snapshots, cutoff_date):
+        # 一次聚合查询同时得到总数和按租户的统计
+        tenant_counts = list(old_snapshots.values('tenant_id').annotate(
+            count=Count('id')
+        ).order_by('-count'))
+        count = sum(item['count'] for item in tenant_counts)
+
+        self.stdout.write(
+            self.style.WARNING(
+                f'[模拟运行] 将删除 {count} 条早于 '
+                f'{cutoff_date.strftime("%Y-%m-%d %H:%M:%S")} 的记录'
+            )
+        )
+
+        self.stdout.write('\n按租户统计将删除的记录数：')
+        for item in tenant_counts[:10]:  # 只显示前10个
+            self.stdout.write(
+                f"  租户 {item['tenant_id']}: {item['count']} 条记录"
+            )
+
+        if len(tenant_counts) > 10:
+            self.stdout.write(f"  ... 还有 {len(tenant_counts) - 10} 个租户")
+
+    def delete_in_batches(self, old_snapshots, batch_size, sleep):
+        """Delete the snapshots in primary key chunks.
+
+        Each chunk is deleted with its own statement and transaction, so
+        that the table is never locked for the whole cleanup.
+        """
+        count = old_snapshots.count()
+        deleted_count = 0
+        last_id = 0
+        while True:
+            ids = list(old_snapshots.filter(id__gt=last_id).order_by(
+                'id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted, _ = models.TenantResourceSnapshot.objects.filter(
+                id__in=ids).delete()
+            deleted_count += deleted
+            last_id = ids[-1]
+            self.stdout.write(f'已删除 {deleted_count}/{count} 条记录')
+            if sleep and len(ids) == batch_size:
+                time.sleep(sleep)
+        return deleted_count
 
     def handle(self, *args, **options):
         days = options['days']
         dry_run = options['dry_run']
-        
+        batch_size = max(options['batch_size'], 1)
+
         # 计算截止日期
-        cutoff_date = timezone.now() - timedelta(days=days)
-        
+        cutoff_date = timezone.now() - datetime.timedelta(days=days)
+
         # 查询要删除的记录
-        old_snapshots = TenantResourceSnapshot.objects.filter(
+        old_snapshots = models.TenantResourceSnapshot.objects.filter(
             created_at__lt=cutoff_date
         )
-        
-        count = old_snapshots.count()
-        
+
         if dry_run:
-            self.stdout.write(
-                self.style.WARNING(
-                    f'[模拟运行] 将删除 {count} 条早于 {cutoff_date.strftime("%Y-%m-%d %H:%M:%S")} 的记录'
-                )
-            )
-            
-            # 显示按租户统计的记录数
-            from django.db.models import Count
-            tenant_counts = old_snapshots.values('tenant_id').annotate(
-                count=Count('id')
-            ).order_by('-count')
-            
-            self.stdout.write('\n按租户统计将删除的记录数：')
-            for item in tenant_counts[:10]:  # 只显示前10个
-                self.stdout.write(
-                    f"  租户 {item['tenant_id']}: {item['count']} 条记录"
-                )
-            
-            if tenant_counts.count() > 10:
-                self.stdout.write(f"  ... 还有 {tenant_counts.count() - 10} 个租户")
+            self.show_tenant_counts(old_snapshots, cutoff_date)
         else:
-            # 实际删除
+            # 表已按月分区时，整月早于截止日期的分区直接删除，
+            # 只有截止日期所在月份的记录需要逐条删除
+            if partitions.is_supported():
+                dropped = partitions.drop_partitions_before(cutoff_date)
+                if dropped:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f'已删除分区：{", ".join(dropped)}'
+                        )
+                    )
+
+            # 实际删除（按主键分批）
             self.stdout.write(
                 self.style.WARNING(
-                    f'正在删除 {count} 条早于 {cutoff_date.strftime("%Y-%m-%d %H:%M:%S")} 的记录...'
+                    f'正在分批删除早于 {cutoff_date.strftime("%Y-%m-%d %H:%M:%S")} 的记录'
+                    f'（每批 {batch_size} 条）...'
                 )
             )
-            
-            deleted_count, _ = old_snapshots.delete()
-            
+
+            deleted_count = self.delete_in_batches(
+                old_snapshots, batch_size, options['sleep'])
+
             self.stdout.write(
                 self.style.SUCCESS(
                     f'成功删除 {deleted_count} 条记录'
                 )
             )
-        
+
         # 显示当前数据库状态
-        total_count = TenantResourceSnapshot.objects.count()
+        status = models.TenantResourceSnapshot.objects.order_by().aggregate(
+            total=Count('id'), oldest=Min('created_at'),
+            newest=Max('created_at'))
         self.stdout.write(
             self.style.SUCCESS(
-                f'\n当前数据库中共有 {total_count} 条快照记录'
+                f'\n当前数据库中共有 {status["total"]} 条快照记录'
             )
         )
-        
-        if total_count > 0:
-            oldest = TenantResourceSnapshot.objects.order_by('created_at').first()
-            newest = TenantResourceSnapshot.objects.order_by('-created_at').first()
+
+        if status['total'] > 0:
             self.stdout.write(
-                f'最早记录：{oldest.created_at.strftime("%Y-%m-%d %H:%M:%S")}'
+                f'最早记录：{status["oldest"].strftime("%Y-%m-%d %H:%M:%S")}'
             )
             self.stdout.write(
-                f'最新记录：{newest.created_at.strftime("%Y-%m-%d %H:%M:%S")}'
+                f'最新记录：{status["newest"].strftime("%Y-%m-%d %H:%M:%S")}'
             )
-
@@ -0,0 +1,61 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from openstack_dashboard.dashboards.custom_reports import models
+from openstack_dashboard.dashboards.custom_reports import partitions
+
+
+class Command(BaseCommand):
+    help = ('按月分区管理资源快照表（仅支持 MySQL）：首次运行时对表进行分区，'
+            '之后每次运行提前创建未来月份的分区')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead',
+            type=int,
+            default=3,
+            help='提前创建未来N个月的分区（默认3个月）',
+        )
+
+    def handle(self, *args, **options):
+        if not partitions.is_supported():
+            raise CommandError('快照表分区仅支持 MySQL 数据库')
+
+        last = partitions.add_months(
+            partitions.month_start(timezone.now()), options['ahead'])
+
+        if not partitions.get_partitions():
+            oldest = models.TenantResourceSnapshot.objects.aggregate(
+                oldest=Min('created_at'))['oldest']
+            first = partitions.month_start(oldest or timezone.now())
+            partitions.partition_table(first, last)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'已将快照表按月分区：{partitions.partition_name(first)}'
+                    f' 至 {partitions.partition_name(last)}'
+                )
+            )
+            return
+
+        added = partitions.add_partitions(last)
+        if added:
+            self.stdout.write(
+                self.style.SUCCESS(f'已创建分区：{", ".join(added)}')
+            )
+        else:
+            self.stdout.write('未来月份的分区已存在，无需创建')
@@ -0,0 +1,43 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from django.core.management.base import BaseCommand
+
+from openstack_dashboard.dashboards.custom_reports import models
+from openstack_dashboard.dashboards.custom_reports import rollup
+
+
+class Command(BaseCommand):
+    help = '增量汇总资源快照（按小时、按天），供历史趋势查询使用'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='清空已有汇总数据并根据现有快照重新汇总'
+                 '（早于快照保留期的汇总数据将无法恢复）',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            models.HourlyResourceRollup.objects.all().delete()
+            models.DailyResourceRollup.objects.all().delete()
+            self.stdout.write(self.style.WARNING('已清空汇总数据'))
+
+        hourly, daily = rollup.rollup_all()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'已更新 {hourly} 条按小时汇总、{daily} 条按天汇总记录'
+            )
+        )
@@ -0,0 +1,90 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from openstack_dashboard import api
+from openstack_dashboard.dashboards.custom_reports import partitions
+from openstack_dashboard.dashboards.custom_reports import snapshots
+from openstack_dashboard.utils import usage_cache
+
+
+def closed_months(today, count):
+    """Return the (start, end) of the count months before today's month.
+
+    The periods are the naive UTC datetimes the overviews pass to Nova when
+    a whole month is selected, most recent month first.
+    """
+    month = today.replace(day=1)
+    periods = []
+    for offset in range(1, count + 1):
+        first_day = partitions.add_months(month, -offset)
+        last_day = (partitions.add_months(first_day, 1) -
+                    datetime.timedelta(days=1))
+        periods.append((
+            datetime.datetime(first_day.year, first_day.month, 1),
+            datetime.datetime(last_day.year, last_day.month, last_day.day,
+                              23, 59, 59)))
+    return periods
+
+
+class Command(BaseCommand):
+    help = '预先缓存之前几个月的 Nova 使用量（管理员概况和项目概况页面使用）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=3,
+            help='缓存之前多少个整月的使用量，默认 3 个月',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.USAGE_CACHE_TIMEOUT:
+            raise CommandError('USAGE_CACHE_TIMEOUT 为 0，使用量缓存未启用')
+
+        request = snapshots.get_admin_request()
+        failed = []
+        for start, end in closed_months(timezone.now().date(),
+                                        options['months']):
+            # 所有项目的使用量由 usage_list 自身缓存，同时按项目缓存，
+            # 供项目概况页面的 usage_get 使用
+            usages = api.nova.usage_list(request, start, end)
+            missing = 0
+            for usage in usages:
+                args = (usage.tenant_id, start, end)
+                usage_cache.store(request, 'nova.usage_get', args, usage)
+                if not usage_cache.is_stored(request, 'nova.usage_get', args):
+                    missing += 1
+            # 缓存后端拒绝写入（例如超过 memcached 单项大小限制）时不会报错，
+            # 因此逐项读回确认
+            if not usage_cache.is_stored(request, 'nova.usage_list',
+                                         (start, end)) or missing:
+                failed.append(f'{start:%Y-%m}')
+                self.stderr.write(
+                    f'{start:%Y-%m} 的使用量未能写入缓存'
+                    f'（{missing} 个项目的使用量缺失），请检查缓存后端'
+                )
+                continue
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'已缓存 {start:%Y-%m} 的使用量，共 {len(usages)} 个项目'
+                )
+            )
+        if failed:
+            raise CommandError(f'以下月份的使用量未能缓存: {", ".join(failed)}')
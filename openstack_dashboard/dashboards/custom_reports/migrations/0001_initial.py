@@ -0,0 +1,63 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Generated by Django 4.2.30 on 2026-10-18 13:57
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantResourceSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True,
+                                        primary_key=True,
+                                        serialize=False,
+                                        verbose_name='ID')),
+                ('tenant_id', models.CharField(db_index=True, max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('instances_used', models.IntegerField()),
+                ('instances_limit', models.IntegerField()),
+                ('cores_used', models.IntegerField()),
+                ('cores_limit', models.IntegerField()),
+                ('ram_used', models.IntegerField()),
+                ('ram_limit', models.IntegerField()),
+                ('volumes_used', models.IntegerField()),
+                ('volumes_limit', models.IntegerField()),
+                ('gigabytes_used', models.IntegerField()),
+                ('gigabytes_limit', models.IntegerField()),
+                ('snapshots_used', models.IntegerField()),
+                ('snapshots_limit', models.IntegerField()),
+                ('networks_used', models.IntegerField()),
+                ('networks_limit', models.IntegerField()),
+                ('floatingips_used', models.IntegerField()),
+                ('floatingips_limit', models.IntegerField()),
+                ('routers_used', models.IntegerField()),
+                ('routers_limit', models.IntegerField()),
+                ('security_groups_used', models.IntegerField()),
+                ('security_groups_limit', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'tenant_resource_snapshot',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
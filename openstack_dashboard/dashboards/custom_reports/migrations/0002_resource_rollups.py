@@ -0,0 +1,143 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Generated by Django 4.2.30 on 2026-10-18 13:57
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HourlyResourceRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True,
+                                        primary_key=True,
+                                        serialize=False,
+                                        verbose_name='ID')),
+                ('tenant_id', models.CharField(max_length=64)),
+                ('period_start', models.DateTimeField()),
+                ('sample_count', models.IntegerField()),
+                ('instances_used_min', models.IntegerField()),
+                ('instances_used_max', models.IntegerField()),
+                ('instances_used_avg', models.FloatField()),
+                ('instances_limit', models.IntegerField()),
+                ('cores_used_min', models.IntegerField()),
+                ('cores_used_max', models.IntegerField()),
+                ('cores_used_avg', models.FloatField()),
+                ('cores_limit', models.IntegerField()),
+                ('ram_used_min', models.IntegerField()),
+                ('ram_used_max', models.IntegerField()),
+                ('ram_used_avg', models.FloatField()),
+                ('ram_limit', models.IntegerField()),
+                ('volumes_used_min', models.IntegerField()),
+                ('volumes_used_max', models.IntegerField()),
+                ('volumes_used_avg', models.FloatField()),
+                ('volumes_limit', models.IntegerField()),
+                ('gigabytes_used_min', models.IntegerField()),
+                ('gigabytes_used_max', models.IntegerField()),
+                ('gigabytes_used_avg', models.FloatField()),
+                ('gigabytes_limit', models.IntegerField()),
+                ('snapshots_used_min', models.IntegerField()),
+                ('snapshots_used_max', models.IntegerField()),
+                ('snapshots_used_avg', models.FloatField()),
+                ('snapshots_limit', models.IntegerField()),
+                ('networks_used_min', models.IntegerField()),
+                ('networks_used_max', models.IntegerField()),
+                ('networks_used_avg', models.FloatField()),
+                ('networks_limit', models.IntegerField()),
+                ('floatingips_used_min', models.IntegerField()),
+                ('floatingips_used_max', models.IntegerField()),
+                ('floatingips_used_avg', models.FloatField()),
+                ('floatingips_limit', models.IntegerField()),
+                ('routers_used_min', models.IntegerField()),
+                ('routers_used_max', models.IntegerField()),
+                ('routers_used_avg', models.FloatField()),
+                ('routers_limit', models.IntegerField()),
+                ('security_groups_used_min', models.IntegerField()),
+                ('security_groups_used_max', models.IntegerField()),
+                ('security_groups_used_avg', models.FloatField()),
+                ('security_groups_limit', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'tenant_resource_rollup_hourly',
+                'ordering': ['-period_start'],
+                'abstract': False,
+                'unique_together': {('tenant_id', 'period_start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyResourceRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True,
+                                        primary_key=True,
+                                        serialize=False,
+                                        verbose_name='ID')),
+                ('tenant_id', models.CharField(max_length=64)),
+                ('period_start', models.DateTimeField()),
+                ('sample_count', models.IntegerField()),
+                ('instances_used_min', models.IntegerField()),
+                ('instances_used_max', models.IntegerField()),
+                ('instances_used_avg', models.FloatField()),
+                ('instances_limit', models.IntegerField()),
+                ('cores_used_min', models.IntegerField()),
+                ('cores_used_max', models.IntegerField()),
+                ('cores_used_avg', models.FloatField()),
+                ('cores_limit', models.IntegerField()),
+                ('ram_used_min', models.IntegerField()),
+                ('ram_used_max', models.IntegerField()),
+                ('ram_used_avg', models.FloatField()),
+                ('ram_limit', models.IntegerField()),
+                ('volumes_used_min', models.IntegerField()),
+                ('volumes_used_max', models.IntegerField()),
+                ('volumes_used_avg', models.FloatField()),
+                ('volumes_limit', models.IntegerField()),
+                ('gigabytes_used_min', models.IntegerField()),
+                ('gigabytes_used_max', models.IntegerField()),
+                ('gigabytes_used_avg', models.FloatField()),
+                ('gigabytes_limit', models.IntegerField()),
+                ('snapshots_used_min', models.IntegerField()),
+                ('snapshots_used_max', models.IntegerField()),
+                ('snapshots_used_avg', models.FloatField()),
+                ('snapshots_limit', models.IntegerField()),
+                ('networks_used_min', models.IntegerField()),
+                ('networks_used_max', models.IntegerField()),
+                ('networks_used_avg', models.FloatField()),
+                ('networks_limit', models.IntegerField()),
+                ('floatingips_used_min', models.IntegerField()),
+                ('floatingips_used_max', models.IntegerField()),
+                ('floatingips_used_avg', models.FloatField()),
+                ('floatingips_limit', models.IntegerField()),
+                ('routers_used_min', models.IntegerField()),
+                ('routers_used_max', models.IntegerField()),
+                ('routers_used_avg', models.FloatField()),
+                ('routers_limit', models.IntegerField()),
+                ('security_groups_used_min', models.IntegerField()),
+                ('security_groups_used_max', models.IntegerField()),
+                ('security_groups_used_avg', models.FloatField()),
+                ('security_groups_limit', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'tenant_resource_rollup_daily',
+                'ordering': ['-period_start'],
+                'abstract': False,
+                'unique_together': {('tenant_id', 'period_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Generated by Django 4.2.30 on 2026-10-18 13:57
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_reports', '0002_resource_rollups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tenantresourcesnapshot',
+            name='tenant_id',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='dailyresourcerollup',
+            index=models.Index(fields=['period_start'],
+                               name='rollup_daily_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hourlyresourcerollup',
+            index=models.Index(fields=['period_start'],
+                               name='rollup_hourly_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenantresourcesnapshot',
+            index=models.Index(fields=['tenant_id', 'created_at'],
+                               name='snapshot_tenant_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenantresourcesnapshot',
+            index=models.Index(fields=['created_at'],
+                               name='snapshot_created_idx'),
+        ),
+    ]
@@ -14,10 +14,28 @@
 from django.db import models
 
 
+class HistoryQuerySet(models.QuerySet):
+
+    def series(self, *fields):
+        """Fetch the given columns with a single query.
+
+        Only the requested columns are selected and no model instances
+        are created.
+
+        :returns: a dict mapping each field name to a tuple of its values
+            in the queryset order, e.g. {'created_at': (...), ...}
+        """
+        rows = self.values_list(*fields)
+        columns = tuple(zip(*rows)) or ((),) * len(fields)
+        return dict(zip(fields, columns))
+
+
 class TenantResourceSnapshot(models.Model):
     """租户资源使用快照，用于历史趋势和报表."""
 
-    tenant_id = models.CharField(max_length=64, db_index=True)
+    objects = HistoryQuerySet.as_manager()
+
+    tenant_id = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
 
     # 计算资源
@@ -49,6 +67,102 @@ class TenantResourceSnapshot(models.Model):
     class Meta:
         db_table = 'tenant_resource_snapshot'
         ordering = ['-created_at']
+        indexes = [
+            # 按租户查询某时间范围内的快照并按时间排序
+            models.Index(fields=['tenant_id', 'created_at'],
+                         name='snapshot_tenant_created_idx'),
+            # 按时间范围清理所有租户的旧快照
+            models.Index(fields=['created_at'], name='snapshot_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.tenant_id} @ {self.created_at}"
+
+
+class ResourceRollup(models.Model):
+    """按时间段汇总的租户资源快照（最小值/最大值/平均值）.
+
+    每个时间段一行，配额上限取该时间段内的最大值。
+    """
+
+    objects = HistoryQuerySet.as_manager()
+
+    tenant_id = models.CharField(max_length=64)
+    period_start = models.DateTimeField()
+    sample_count = models.IntegerField()
+
+    # 计算资源
+    instances_used_min = models.IntegerField()
+    instances_used_max = models.IntegerField()
+    instances_used_avg = models.FloatField()
+    instances_limit = models.IntegerField()
+    cores_used_min = models.IntegerField()
+    cores_used_max = models.IntegerField()
+    cores_used_avg = models.FloatField()
+    cores_limit = models.IntegerField()
+    ram_used_min = models.IntegerField()
+    ram_used_max = models.IntegerField()
+    ram_used_avg = models.FloatField()
+    ram_limit = models.IntegerField()
+
+    # 存储资源
+    volumes_used_min = models.IntegerField()
+    volumes_used_max = models.IntegerField()
+    volumes_used_avg = models.FloatField()
+    volumes_limit = models.IntegerField()
+    gigabytes_used_min = models.IntegerField()
+    gigabytes_used_max = models.IntegerField()
+    gigabytes_used_avg = models.FloatField()
+    gigabytes_limit = models.IntegerField()
+    snapshots_used_min = models.IntegerField()
+    snapshots_used_max = models.IntegerField()
+    snapshots_used_avg = models.FloatField()
+    snapshots_limit = models.IntegerField()
+
+    # 网络资源
+    networks_used_min = models.IntegerField()
+    networks_used_max = models.IntegerField()
+    networks_used_avg = models.FloatField()
+    networks_limit = models.IntegerField()
+    floatingips_used_min = models.IntegerField()
+    floatingips_used_max = models.IntegerField()
+    floatingips_used_avg = models.FloatField()
+    floatingips_limit = models.IntegerField()
+    routers_used_min = models.IntegerField()
+    routers_used_max = models.IntegerField()
+    routers_used_avg = models.FloatField()
+    routers_limit = models.IntegerField()
+    security_groups_used_min = models.IntegerField()
+    security_groups_used_max = models.IntegerField()
+    security_groups_used_avg = models.FloatField()
+    security_groups_limit = models.IntegerField()
+
+    class Meta:
+        abstract = True
+        ordering = ['-period_start']
+        unique_together = (('tenant_id', 'period_start'),)
+
+    def __str__(self):
+        return f"{self.tenant_id} @ {self.period_start}"
+
+
+class HourlyResourceRollup(ResourceRollup):
+    """按小时汇总的租户资源快照."""
+
+    class Meta(ResourceRollup.Meta):
+        db_table = 'tenant_resource_rollup_hourly'
+        indexes = [
+            models.Index(fields=['period_start'],
+                         name='rollup_hourly_period_idx'),
+        ]
+
+
+class DailyResourceRollup(ResourceRollup):
+    """按天汇总的租户资源快照."""
+
+    class Meta(ResourceRollup.Meta):
+        db_table = 'tenant_resource_rollup_daily'
+        indexes = [
+            models.Index(fields=['period_start'],
+                         name='rollup_daily_period_idx'),
+        ]
@@ -0,0 +1,137 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Optional monthly partitioning of the tenant_resource_snapshot table.
+
+On MySQL the table can be range partitioned by month on created_at, so
+that retention drops whole partitions instead of deleting rows. Each
+partition is named pYYYYMM and holds the rows created in that month;
+the trailing pmax partition catches rows beyond the last month.
+"""
+
+import datetime
+
+from django.db import connection
+
+from openstack_dashboard.dashboards.custom_reports import models
+
+TABLE = models.TenantResourceSnapshot._meta.db_table
+MAXVALUE_PARTITION = 'pmax'
+
+
+def is_supported():
+    return connection.vendor == 'mysql'
+
+
+def month_start(value):
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return month.strftime('p%Y%m')
+
+
+def partition_month(name):
+    """Return the month of a pYYYYMM partition, or None for other names."""
+    try:
+        return datetime.datetime.strptime(name, 'p%Y%m').date()
+    except ValueError:
+        return None
+
+
+def partition_definitions(first, last):
+    """Build the partition definitions for the months first..last."""
+    definitions = []
+    month = first
+    while month <= last:
+        definitions.append(
+            "PARTITION %s VALUES LESS THAN (TO_DAYS('%s'))"
+            % (partition_name(month), add_months(month, 1).isoformat()))
+        month = add_months(month, 1)
+    definitions.append("PARTITION %s VALUES LESS THAN MAXVALUE"
+                       % MAXVALUE_PARTITION)
+    return ',\n'.join(definitions)
+
+
+def get_partitions():
+    """Return the names of the table partitions in order.
+
+    An empty list is returned if the table is not partitioned.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+            "AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION", [TABLE])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def partition_table(first, last):
+    """Partition the table by month from first to last.
+
+    MySQL requires the partitioning column to be part of every unique
+    key, so the primary key is extended to (id, created_at).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "ALTER TABLE %s DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)"
+            % TABLE)
+        cursor.execute(
+            "ALTER TABLE %s PARTITION BY RANGE (TO_DAYS(created_at)) (\n%s)"
+            % (TABLE, partition_definitions(first, last)))
+
+
+def add_partitions(last):
+    """Split the pmax partition so that months up to last have their own.
+
+    :returns: the names of the partitions added
+    """
+    months = [partition_month(name) for name in get_partitions()]
+    months = [month for month in months if month is not None]
+    if not months:
+        return []
+    first = add_months(max(months), 1)
+    if first > last:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "ALTER TABLE %s REORGANIZE PARTITION %s INTO (\n%s)"
+            % (TABLE, MAXVALUE_PARTITION, partition_definitions(first, last)))
+    added = []
+    month = first
+    while month <= last:
+        added.append(partition_name(month))
+        month = add_months(month, 1)
+    return added
+
+
+def drop_partitions_before(cutoff):
+    """Drop the partitions whose rows are all older than cutoff.
+
+    :returns: the names of the dropped partitions
+    """
+    names = [name for name in get_partitions()
+             if partition_month(name) is not None and
+             add_months(partition_month(name), 1) <= cutoff.date()]
+    if names:
+        with connection.cursor() as cursor:
+            cursor.execute("ALTER TABLE %s DROP PARTITION %s"
+                           % (TABLE, ', '.join(names)))
+    return names
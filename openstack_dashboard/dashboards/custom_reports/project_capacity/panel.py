@@ -0,0 +1,28 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from django.utils.translation import gettext_lazy as _
+
+import horizon
+
+from openstack_dashboard.dashboards.custom_reports import dashboard
+
+
+class ProjectCapacity(horizon.Panel):
+    name = _("项目容量报表")
+    slug = "project_capacity"
+    policy_rules = ((("identity", "identity:list_projects"),
+                     ("compute", "context_is_admin")),)
+
+
+dashboard.CustomReports.register(ProjectCapacity)
@@ -0,0 +1,57 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from django.utils.translation import gettext_lazy as _
+
+from horizon import tables
+
+
+def usage_display(name):
+    """Display the usage of a quota as "used / limit (percent)"."""
+    def display(project):
+        usage = project.usage.get(name)
+        if not usage:
+            return '-'
+        quota = usage.get('quota', float('inf'))
+        if quota == float('inf'):
+            return '%s / %s' % (usage['used'], _("无限制"))
+        return '%s / %s (%s%%)' % (usage['used'], quota,
+                                   project.percent(name))
+    display.__name__ = 'display_%s' % name
+    return display
+
+
+class ProjectCapacityTable(tables.DataTable):
+    name = tables.Column('name', verbose_name=_("项目名称"))
+    max_percent = tables.Column('max_percent', verbose_name=_("最高使用率"),
+                                filters=(lambda value: '%s%%' % value,))
+    instances = tables.Column(usage_display('instances'),
+                              verbose_name=_("实例"))
+    cores = tables.Column(usage_display('cores'), verbose_name=_("CPU 核心"))
+    ram = tables.Column(usage_display('ram'), verbose_name=_("内存 (MB)"))
+    volumes = tables.Column(usage_display('volumes'), verbose_name=_("卷"))
+    gigabytes = tables.Column(usage_display('gigabytes'),
+                              verbose_name=_("存储 (GB)"))
+    snapshots = tables.Column(usage_display('snapshots'),
+                              verbose_name=_("快照"))
+    network = tables.Column(usage_display('network'), verbose_name=_("网络"))
+    floatingip = tables.Column(usage_display('floatingip'),
+                               verbose_name=_("浮动IP"))
+    router = tables.Column(usage_display('router'), verbose_name=_("路由器"))
+    security_group = tables.Column(usage_display('security_group'),
+                                   verbose_name=_("安全组"))
+
+    class Meta(object):
+        name = 'project_capacity'
+        verbose_name = _("项目配额使用率")
+        multi_select = False
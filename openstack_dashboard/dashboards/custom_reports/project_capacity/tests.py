@@ -0,0 +1,129 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+from unittest import mock
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from openstack_dashboard import api
+from openstack_dashboard.dashboards.custom_reports import models
+from openstack_dashboard.dashboards.custom_reports.project_capacity \
+    import views
+from openstack_dashboard.dashboards.custom_reports import snapshots
+from openstack_dashboard.test import helpers as test
+
+
+INDEX_URL = reverse('horizon:custom_reports:project_capacity:index')
+
+
+class ProjectCapacityViewTests(test.BaseAdminViewTests):
+
+    def _create_snapshots(self, tenants, created_at=None):
+        created_at = created_at or timezone.now()
+        for index, tenant in enumerate(tenants):
+            values = {field.name: 0
+                      for field in models.TenantResourceSnapshot._meta.fields
+                      if field.name.endswith(('_used', '_limit'))}
+            values.update(instances_used=index + 1, instances_limit=10,
+                          cores_used=4, cores_limit=snapshots.UNLIMITED)
+            snapshot = models.TenantResourceSnapshot.objects.create(
+                tenant_id=tenant.id, **values)
+            models.TenantResourceSnapshot.objects.filter(
+                pk=snapshot.pk).update(created_at=created_at)
+
+    @test.create_mocks({api.keystone: ('tenant_get',)})
+    def test_index(self):
+        projects = self.tenants.list()
+        self._create_snapshots(projects)
+        self.mock_tenant_get.side_effect = \
+            self.tenant_get_side_effect(projects)
+
+        res = self.client.get(INDEX_URL)
+
+        self.assertTemplateUsed(res, 'horizon/common/_data_table_view.html')
+        rows = res.context['table'].data
+        # The projects are sorted by their highest percentage.
+        self.assertEqual([p.id for p in reversed(projects)],
+                         [row.id for row in rows])
+        self.assertEqual([p.name for p in reversed(projects)],
+                         [row.name for row in rows])
+        self.assertEqual(10 * len(projects), rows[0].max_percent)
+        self.assertEqual(10, rows[-1].max_percent)
+        self.assertContains(res, '1 / 10 (10%)')
+        self.assertContains(res, '4 / 无限制')
+        # Only the names of the projects of the page are looked up.
+        self.assertEqual(len(projects), self.mock_tenant_get.call_count)
+
+    @test.create_mocks({api.keystone: ('tenant_get',)})
+    def test_index_latest_snapshots(self):
+        projects = self.tenants.list()
+        now = timezone.now()
+        # The projects deleted before the last sampling are left out and
+        # the projects sampled twice show their newest snapshot.
+        self._create_snapshots(projects[:3], now - datetime.timedelta(days=1))
+        self._create_snapshots(reversed(projects[:2]),
+                               now - datetime.timedelta(minutes=5))
+        self._create_snapshots(projects[:2], now)
+        self.mock_tenant_get.side_effect = \
+            self.tenant_get_side_effect(projects)
+
+        res = self.client.get(INDEX_URL)
+
+        rows = res.context['table'].data
+        self.assertEqual([projects[1].id, projects[0].id],
+                         [row.id for row in rows])
+        self.assertEqual([20, 10], [row.max_percent for row in rows])
+
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    @test.create_mocks({api.keystone: ('tenant_get',)})
+    def test_index_pagination(self):
+        projects = self.tenants.list()
+        self._create_snapshots(projects)
+        self.mock_tenant_get.side_effect = \
+            self.tenant_get_side_effect(projects)
+        expected = list(reversed(projects))
+
+        res = self.client.get(INDEX_URL)
+        table = res.context['table']
+        self.assertEqual([p.id for p in expected[:2]],
+                         [row.id for row in table.data])
+        self.assertTrue(table.has_more_data())
+        self.assertFalse(table.has_prev_data())
+
+        res = self.client.get(INDEX_URL + '?' + table.get_pagination_string())
+        table = res.context['table']
+        self.assertEqual([p.id for p in expected[2:4]],
+                         [row.id for row in table.data])
+        self.assertTrue(table.has_prev_data())
+
+        res = self.client.get(
+            INDEX_URL + '?' + table.get_prev_pagination_string())
+        self.assertEqual([p.id for p in expected[:2]],
+                         [row.id for row in res.context['table'].data])
+
+    def test_index_no_snapshots(self):
+        res = self.client.get(INDEX_URL)
+
+        self.assertEqual([], res.context['table'].data)
+        self.assertMessageCount(res, info=1)
+
+    @mock.patch.object(views, 'get_capacities')
+    def test_index_error(self, mock_get_capacities):
+        mock_get_capacities.side_effect = self.exceptions.nova
+
+        res = self.client.get(INDEX_URL)
+
+        self.assertEqual([], res.context['table'].data)
+        self.assertMessageCount(res, error=1)
@@ -0,0 +1,144 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils.translation import gettext_lazy as _
+
+from horizon import exceptions
+from horizon import messages
+from horizon import tables
+from horizon.utils import functions as utils
+
+from openstack_dashboard.dashboards.custom_reports import models
+from openstack_dashboard.dashboards.custom_reports.project_capacity \
+    import tables as capacity_tables
+from openstack_dashboard.dashboards.custom_reports import snapshots
+from openstack_dashboard.utils import project_names
+
+# The quotas of the report and the prefix of their snapshot columns.
+QUOTAS = (
+    ('instances', 'instances'),
+    ('cores', 'cores'),
+    ('ram', 'ram'),
+    ('volumes', 'volumes'),
+    ('gigabytes', 'gigabytes'),
+    ('snapshots', 'snapshots'),
+    ('network', 'networks'),
+    ('floatingip', 'floatingips'),
+    ('router', 'routers'),
+    ('security_group', 'security_groups'),
+)
+
+
+class ProjectCapacity(object):
+    """The quota usage of a project recorded by its latest snapshot."""
+
+    def __init__(self, snapshot):
+        self.id = snapshot['tenant_id']
+        self.name = self.id
+        self.usage = {}
+        for name, column in QUOTAS:
+            quota = snapshot['%s_limit' % column]
+            if quota == snapshots.UNLIMITED:
+                quota = float('inf')
+            self.usage[name] = {'used': snapshot['%s_used' % column],
+                                'quota': quota}
+
+    def percent(self, name):
+        usage = self.usage.get(name) or {}
+        quota = usage.get('quota', float('inf'))
+        if quota in (0, float('inf')):
+            return 0
+        return int(usage['used'] * 100 / quota)
+
+    @property
+    def max_percent(self):
+        return max([self.percent(name) for name in self.usage] or [0])
+
+
+def get_capacities():
+    """Return the capacity of every project, highest percentage first.
+
+    The percentages are only known once the quotas of all the projects are
+    retrieved, which takes several API calls per project. Instead of
+    retrieving them while the page is rendered, the report reads the latest
+    snapshots recorded by the collect_snapshots command, i.e. the rows of
+    its last CUSTOM_REPORTS_SNAPSHOT_INTERVAL seconds of sampling.
+    """
+    snapshot_set = models.TenantResourceSnapshot.objects
+    latest = snapshot_set.aggregate(latest=Max('created_at'))['latest']
+    if latest is None:
+        return []
+    since = latest - datetime.timedelta(
+        seconds=settings.CUSTOM_REPORTS_SNAPSHOT_INTERVAL)
+    columns = ['%s_%s' % (column, suffix)
+               for name, column in QUOTAS for suffix in ('used', 'limit')]
+    rows = snapshot_set.filter(created_at__gt=since).order_by(
+        'created_at').values('tenant_id', *columns)
+    # A project sampled twice in the window keeps its newest snapshot.
+    latest_rows = {row['tenant_id']: row for row in rows}
+    return sorted([ProjectCapacity(row) for row in latest_rows.values()],
+                  key=lambda c: (-c.max_percent, c.id))
+
+
+def paginate(items, marker, sort_dir, page_size):
+    """Slice a page of items around the id marker.
+
+    :param sort_dir: "desc" for the page after the marker and
+        "asc" for the page before it, as with PagedTableMixin.
+    :returns: a tuple (page, has_more_data, has_prev_data)
+    """
+    ids = [item.id for item in items]
+    index = ids.index(marker) if marker in ids else None
+    if sort_dir == 'asc':
+        end = len(items) if index is None else index
+        start = max(end - page_size, 0)
+    else:
+        start = 0 if index is None else index + 1
+        end = start + page_size
+    return items[start:end], end < len(items), start > 0
+
+
+class IndexView(tables.PagedTableMixin, tables.DataTableView):
+    table_class = capacity_tables.ProjectCapacityTable
+    page_title = _("项目容量报表")
+
+    def get_data(self):
+        try:
+            capacities = get_capacities()
+        except Exception:
+            exceptions.handle(self.request,
+                              _("无法获取项目配额使用情况"))
+            return []
+        if not capacities:
+            messages.info(self.request,
+                          _("尚未采集资源快照，请先运行 collect_snapshots 命令"))
+            return []
+
+        marker, sort_dir = self._get_marker()
+        capacities, self._has_more_data, self._has_prev_data = paginate(
+            capacities, marker, sort_dir,
+            utils.get_page_size(self.request))
+        try:
+            names = project_names.get_names(
+                self.request, [capacity.id for capacity in capacities])
+        except Exception:
+            names = {}
+            exceptions.handle(self.request,
+                              _("无法获取项目名称"))
+        for capacity in capacities:
+            capacity.name = names.get(capacity.id, capacity.id)
+        return capacities
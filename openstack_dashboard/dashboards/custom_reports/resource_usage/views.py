@@ -18,7 +18,7 @@ from django.views import generic
 
 from horizon import views
 
-from openstack_dashboard import api
+from openstack_dashboard.usage import quotas
 
 LOG = logging.getLogger(__name__)
 
@@ -51,12 +51,9 @@ class IndexView(views.HorizonTemplateView):
         context = super().get_context_data(**kwargs)
         
         try:
-            # Get compute limits (includes both quotas and usage)
-            limits = api.nova.tenant_absolute_limits(self.request, reserved=False)
-            
-            # Get compute quotas for additional info
-            tenant_id = self.request.user.tenant_id
-            compute_quotas = api.nova.tenant_quota_get(self.request, tenant_id)
+            # Get compute limits (includes both quotas and usage), read
+            # through the quota limits cache shared by the project's users
+            limits = quotas.get_compute_limits(self.request, reserved=False)
             
             # Prepare data for charts
             # Note: Quota limits are normalized to handle unlimited quotas (-1 or 0)
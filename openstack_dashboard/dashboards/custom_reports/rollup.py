@@ -0,0 +1,177 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Downsampled history of tenant resource snapshots.
+
+Raw TenantResourceSnapshot rows are rolled up into hourly rows and hourly
+rows into daily rows. Each roll-up run is incremental: it only recomputes
+the periods starting at the latest period already rolled up.
+"""
+
+from django.conf import settings
+from django.db.models import Avg
+from django.db.models import Count
+from django.db.models import ExpressionWrapper
+from django.db.models import F
+from django.db.models import FloatField
+from django.db.models.functions import TruncDay
+from django.db.models.functions import TruncHour
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import Sum
+from django.db import transaction
+
+from openstack_dashboard.dashboards.custom_reports import models
+
+METRICS = ('instances', 'cores', 'ram',
+           'volumes', 'gigabytes', 'snapshots',
+           'networks', 'floatingips', 'routers', 'security_groups')
+
+
+def _snapshot_aggregates():
+    aggregates = {'sample_count': Count('id')}
+    for metric in METRICS:
+        used = metric + '_used'
+        aggregates[used + '_min'] = Min(used)
+        aggregates[used + '_max'] = Max(used)
+        aggregates[used + '_avg'] = Avg(used)
+        aggregates[metric + '_limit'] = Max(metric + '_limit')
+    return aggregates
+
+
+def _rollup_aggregates():
+    aggregates = {'sample_count': Sum('sample_count')}
+    for metric in METRICS:
+        used = metric + '_used'
+        aggregates[used + '_min'] = Min(used + '_min')
+        aggregates[used + '_max'] = Max(used + '_max')
+        # Weight the average of each period by its number of samples.
+        aggregates[used + '_avg'] = ExpressionWrapper(
+            Sum(F(used + '_avg') * F('sample_count'),
+                output_field=FloatField()) / Sum('sample_count'),
+            output_field=FloatField())
+        aggregates[metric + '_limit'] = Max(metric + '_limit')
+    return aggregates
+
+
+def _rollup(source, time_field, trunc, target, aggregates):
+    # The latest period may have been rolled up while it was still
+    # in progress, so it is recomputed together with the newer ones.
+    watermark = target.objects.aggregate(
+        latest=Max('period_start'))['latest']
+    queryset = source.objects.order_by()
+    if watermark is not None:
+        queryset = queryset.filter(**{time_field + '__gte': watermark})
+    # The aggregates are named like the target fields, which are also
+    # fields of the hourly source model, so they are annotated under
+    # prefixed names to keep F() pointing at the source columns.
+    periods = queryset.annotate(period=trunc(time_field)).values(
+        'tenant_id', 'period').annotate(**{
+            'agg_' + name: aggregate
+            for name, aggregate in aggregates.items()})
+    rows = [target(tenant_id=period['tenant_id'],
+                   period_start=period['period'],
+                   **{name: period['agg_' + name] for name in aggregates})
+            for period in periods]
+    with transaction.atomic():
+        if watermark is not None:
+            target.objects.filter(period_start__gte=watermark).delete()
+        target.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def rollup_hourly():
+    """Roll up new raw snapshots into hourly rows."""
+    return _rollup(models.TenantResourceSnapshot, 'created_at', TruncHour,
+                   models.HourlyResourceRollup, _snapshot_aggregates())
+
+
+def rollup_daily():
+    """Roll up new hourly rows into daily rows."""
+    return _rollup(models.HourlyResourceRollup, 'period_start', TruncDay,
+                   models.DailyResourceRollup, _rollup_aggregates())
+
+
+def rollup_all():
+    """Bring the hourly and then the daily roll-ups up to date.
+
+    :returns: a tuple of the number of hourly and daily rows written
+    """
+    return rollup_hourly(), rollup_daily()
+
+
+class Resolution(object):
+    """A source of history rows with a given time granularity."""
+
+    def __init__(self, name, model, time_field, used_suffix, seconds=None):
+        self.name = name
+        self.model = model
+        self.time_field = time_field
+        self.used_suffix = used_suffix
+        self._seconds = seconds
+
+    @property
+    def seconds(self):
+        # Raw snapshots are as far apart as the collector interval.
+        return self._seconds or settings.CUSTOM_REPORTS_SNAPSHOT_INTERVAL
+
+    def used_field(self, metric):
+        return metric + self.used_suffix
+
+    def limit_field(self, metric):
+        return metric + '_limit'
+
+    def history(self, tenant_id, since):
+        return self.model.objects.filter(
+            tenant_id=tenant_id,
+            **{self.time_field + '__gte': since}).order_by(self.time_field)
+
+    def series(self, tenant_id, since, metrics, limits=False):
+        """Fetch the history of a tenant as columns with one query.
+
+        :param metrics: names of the metrics to fetch, e.g. 'cores'
+        :param limits: whether to fetch the quota limit of each metric
+        :returns: a dict of tuples keyed by 'time', by the metric names
+            for the usage and by '<metric>_limit' for the limits
+        """
+        fields = {'time': self.time_field}
+        for metric in metrics:
+            fields[metric] = self.used_field(metric)
+            if limits:
+                fields[metric + '_limit'] = self.limit_field(metric)
+        columns = self.history(tenant_id, since).series(*fields.values())
+        return {key: columns[field] for key, field in fields.items()}
+
+
+RAW = Resolution('raw', models.TenantResourceSnapshot, 'created_at', '_used')
+HOURLY = Resolution('hourly', models.HourlyResourceRollup, 'period_start',
+                    '_used_avg', 3600)
+DAILY = Resolution('daily', models.DailyResourceRollup, 'period_start',
+                   '_used_avg', 86400)
+RESOLUTIONS = (RAW, HOURLY, DAILY)
+
+
+def select_resolution(window):
+    """Pick the coarsest resolution which still details the window.
+
+    :param window: the timedelta covered by the requested history
+    :returns: the coarsest Resolution giving at least
+        CUSTOM_REPORTS_HISTORY_MIN_POINTS points over the window,
+        or the raw snapshots if no roll-up is fine enough.
+    """
+    min_points = settings.CUSTOM_REPORTS_HISTORY_MIN_POINTS
+    for resolution in reversed(RESOLUTIONS):
+        if window.total_seconds() / resolution.seconds >= min_points:
+            return resolution
+    return RAW
@@ -0,0 +1,171 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Background sampling of tenant resource usage.
+
+The collect_snapshots management command uses these helpers to sample
+every project at a fixed interval, so that the trend data does not depend
+on how often users open the overview page.
+"""
+
+import collections
+import logging
+
+from django.conf import settings
+from django import http
+import futurist
+from keystoneauth1.identity import v3 as v3_auth
+
+from openstack_auth import user as auth_user
+from openstack_auth import utils as auth_utils
+
+from openstack_dashboard import api
+from openstack_dashboard.dashboards.custom_reports import models
+
+LOG = logging.getLogger(__name__)
+
+# 用于表示"无限制"配额的数值（与报表页面保持一致）
+UNLIMITED = 999999
+
+
+def normalize_quota(value):
+    """Normalize quota value to handle unlimited quotas."""
+    if value is None or value <= 0 or value == float('inf'):
+        return UNLIMITED
+    return int(value)
+
+
+def get_admin_request():
+    """Build an authenticated request for the collector.
+
+    The request carries a project scoped token for the credentials in
+    CUSTOM_REPORTS_SNAPSHOT_CREDENTIALS and can be passed to the
+    openstack_dashboard.api functions like a normal view request.
+    """
+    credentials = settings.CUSTOM_REPORTS_SNAPSHOT_CREDENTIALS
+    auth_url = settings.OPENSTACK_KEYSTONE_URL
+    plugin = v3_auth.Password(
+        auth_url=auth_url,
+        username=credentials['username'],
+        password=credentials['password'],
+        user_domain_name=credentials.get('user_domain_name', 'Default'),
+        project_name=credentials['project_name'],
+        project_domain_name=credentials.get('project_domain_name',
+                                            'Default'))
+    auth_ref = plugin.get_access(auth_utils.get_session())
+
+    request = http.HttpRequest()
+    request.session = {}
+    request.user = auth_user.create_user_from_token(
+        request, auth_user.Token(auth_ref), auth_url)
+    return request
+
+
+def _owner(resource):
+    return (getattr(resource, 'project_id', None) or
+            getattr(resource, 'tenant_id', None))
+
+
+def collect_network_usage(request):
+    """Count Neutron resources of all projects with one call per type.
+
+    :returns: a dict mapping a project id to a Counter of
+        networks, floatingips, routers and security_groups.
+    """
+    usage = collections.defaultdict(collections.Counter)
+    resources = (
+        ('networks', api.neutron.network_list(request)),
+        ('floatingips',
+         api.neutron.tenant_floating_ip_list(request, all_tenants=True)),
+        ('routers', api.neutron.router_list(request)),
+        ('security_groups',
+         api.neutron.security_group_list(request, tenant_id=None)),
+    )
+    for key, items in resources:
+        for item in items:
+            usage[_owner(item)][key] += 1
+    return usage
+
+
+def build_snapshot(request, tenant_id, network_usage, neutron_quotas):
+    """Sample the quota usage of one project.
+
+    :param neutron_quotas: the Neutron QuotaSet of the project.
+    :returns: an unsaved TenantResourceSnapshot
+    """
+    compute_limits = api.nova.tenant_absolute_limits(
+        request, reserved=False, tenant_id=tenant_id)
+    volume_limits = api.cinder.tenant_absolute_limits(
+        request, tenant_id=tenant_id)
+
+    def quota(name):
+        return normalize_quota(neutron_quotas.get(name).limit)
+
+    return models.TenantResourceSnapshot(
+        tenant_id=tenant_id,
+        instances_used=compute_limits.get('totalInstancesUsed', 0),
+        instances_limit=normalize_quota(
+            compute_limits.get('maxTotalInstances')),
+        cores_used=compute_limits.get('totalCoresUsed', 0),
+        cores_limit=normalize_quota(compute_limits.get('maxTotalCores')),
+        ram_used=compute_limits.get('totalRAMUsed', 0),
+        ram_limit=normalize_quota(compute_limits.get('maxTotalRAMSize')),
+        volumes_used=volume_limits.get('totalVolumesUsed', 0),
+        volumes_limit=normalize_quota(volume_limits.get('maxTotalVolumes')),
+        gigabytes_used=volume_limits.get('totalGigabytesUsed', 0),
+        gigabytes_limit=normalize_quota(
+            volume_limits.get('maxTotalVolumeGigabytes')),
+        snapshots_used=volume_limits.get('totalSnapshotsUsed', 0),
+        snapshots_limit=normalize_quota(
+            volume_limits.get('maxTotalSnapshots')),
+        networks_used=network_usage['networks'],
+        networks_limit=quota('network'),
+        floatingips_used=network_usage['floatingips'],
+        floatingips_limit=quota('floatingip'),
+        routers_used=network_usage['routers'],
+        routers_limit=quota('router'),
+        security_groups_used=network_usage['security_groups'],
+        security_groups_limit=quota('security_group'),
+    )
+
+
+def collect_snapshots(request, max_workers):
+    """Sample all projects using a pool of at most max_workers threads.
+
+    A project which cannot be sampled is logged and skipped.
+
+    :returns: a list of unsaved TenantResourceSnapshot
+    """
+    projects, has_more = api.keystone.tenant_list(request)
+    network_usage = collect_network_usage(request)
+    # Neutron lists the quotas of all projects at once, except for the
+    # projects which have the default quotas.
+    default_quotas = api.neutron.default_quota_get(request)
+    network_quotas = api.neutron.tenant_quota_list(request)
+
+    def sample(project):
+        try:
+            return build_snapshot(
+                request, project.id,
+                network_usage.get(project.id, collections.Counter()),
+                network_quotas.get(project.id, default_quotas))
+        except Exception as e:
+            LOG.error("Error sampling resources of project %s: %s",
+                      project.id, e)
+            return None
+
+    with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
+        futures = [e.submit(sample, project) for project in projects]
+    snapshots = (f.result() for f in futures)
+    return [snapshot for snapshot in snapshots if snapshot is not None]
@@ -0,0 +1,421 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import io
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.core.management import call_command
+from django.test.utils import override_settings
+from django.utils import timezone
+from novaclient import api_versions
+
+from openstack_dashboard import api
+from openstack_dashboard.dashboards.custom_reports.management.commands \
+    import warm_usage_cache
+from openstack_dashboard.dashboards.custom_reports import models
+from openstack_dashboard.dashboards.custom_reports import partitions
+from openstack_dashboard.dashboards.custom_reports import rollup
+from openstack_dashboard.dashboards.custom_reports import snapshots
+from openstack_dashboard.test import helpers as test
+
+
+def create_snapshot(tenant_id, created_at, used=0, limit=10):
+    values = {field.name: used
+              for field in models.TenantResourceSnapshot._meta.fields
+              if field.name.endswith('_used')}
+    values.update({field.name: limit
+                   for field in models.TenantResourceSnapshot._meta.fields
+                   if field.name.endswith('_limit')})
+    snapshot = models.TenantResourceSnapshot.objects.create(
+        tenant_id=tenant_id, **values)
+    # created_at is auto_now_add, so it can only be set afterwards.
+    models.TenantResourceSnapshot.objects.filter(pk=snapshot.pk).update(
+        created_at=created_at)
+    return snapshot
+
+
+class CollectSnapshotsTests(test.TestCase):
+
+    def _stub_api_calls(self):
+        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_nova_tenant_absolute_limits.return_value = \
+            self.limits['absolute']
+        self.mock_cinder_tenant_absolute_limits.return_value = \
+            self.cinder_limits['absolute']
+        self.mock_default_quota_get.return_value = \
+            self.neutron_quotas.first()
+        self.mock_tenant_quota_list.return_value = {
+            self.tenant.id: api.base.QuotaSet({'network': 5, 'router': -1})}
+        self.mock_network_list.return_value = self.networks.list()
+        self.mock_tenant_floating_ip_list.return_value = \
+            self.floating_ips.list()
+        self.mock_router_list.return_value = self.routers.list()
+        self.mock_security_group_list.return_value = \
+            self.security_groups.list()
+
+    @test.create_mocks({
+        api.keystone: ['tenant_list'],
+        api.nova: [('tenant_absolute_limits', 'nova_tenant_absolute_limits')],
+        api.cinder: [('tenant_absolute_limits',
+                      'cinder_tenant_absolute_limits')],
+        api.neutron: ['default_quota_get', 'tenant_quota_list',
+                      'network_list', 'tenant_floating_ip_list',
+                      'router_list', 'security_group_list'],
+    })
+    def test_collect_snapshots(self):
+        self._stub_api_calls()
+        broken_tenant = self.tenants.list()[-1]
+
+        def tenant_absolute_limits(request, tenant_id):
+            if tenant_id == broken_tenant.id:
+                raise self.exceptions.cinder
+            return self.cinder_limits['absolute']
+        self.mock_cinder_tenant_absolute_limits.side_effect = \
+            tenant_absolute_limits
+
+        rows = snapshots.collect_snapshots(self.request, 2)
+
+        tenants = self.tenants.list()
+        # The project whose quota could not be retrieved is skipped.
+        self.assertEqual(len(tenants) - 1, len(rows))
+        rows = {row.tenant_id: row for row in rows}
+        self.assertNotIn(broken_tenant.id, rows)
+        row = rows[self.tenant.id]
+        self.assertEqual(2, row.instances_used)
+        self.assertEqual(10, row.instances_limit)
+        self.assertEqual(20, row.volumes_limit)
+        self.assertEqual(5, row.networks_limit)
+        self.assertEqual(snapshots.UNLIMITED, row.routers_limit)
+        self.assertEqual(
+            len([n for n in self.networks.list()
+                 if n.tenant_id == self.tenant.id]),
+            row.networks_used)
+        # The other projects have the default Neutron quotas.
+        other = next(row for tenant_id, row in rows.items()
+                     if tenant_id != self.tenant.id)
+        self.assertEqual(10, other.networks_limit)
+
+        # Neutron resources are listed once for all projects.
+        self.mock_network_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_tenant_floating_ip_list.assert_called_once_with(
+            test.IsHttpRequest(), all_tenants=True)
+        self.mock_tenant_quota_list.assert_called_once_with(
+            test.IsHttpRequest())
+        self.mock_default_quota_get.assert_called_once_with(
+            test.IsHttpRequest())
+        self.assertEqual(len(tenants),
+                         self.mock_nova_tenant_absolute_limits.call_count)
+        self.mock_nova_tenant_absolute_limits.assert_any_call(
+            test.IsHttpRequest(), reserved=False, tenant_id=self.tenant.id)
+
+    @mock.patch.object(rollup, 'rollup_all', return_value=(0, 0))
+    @mock.patch.object(snapshots, 'collect_snapshots')
+    @mock.patch.object(snapshots, 'get_admin_request')
+    def test_collect_snapshots_command(self, mock_get_admin_request,
+                                       mock_collect_snapshots,
+                                       mock_rollup_all):
+        mock_get_admin_request.return_value = self.request
+        mock_collect_snapshots.return_value = [
+            models.TenantResourceSnapshot(
+                tenant_id=tenant.id,
+                **{field.name: 1
+                   for field in models.TenantResourceSnapshot._meta.fields
+                   if field.name.endswith(('_used', '_limit'))})
+            for tenant in self.tenants.list()]
+
+        call_command('collect_snapshots', once=True, workers=3,
+                     stdout=io.StringIO())
+
+        self.assertEqual(len(self.tenants.list()),
+                         models.TenantResourceSnapshot.objects.count())
+        mock_collect_snapshots.assert_called_once_with(self.request, 3)
+        mock_rollup_all.assert_called_once_with()
+
+
+class RollupTests(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.day = datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc)
+
+    def at(self, hours, minutes=0):
+        return self.day + datetime.timedelta(hours=hours, minutes=minutes)
+
+    def test_rollup_hourly(self):
+        create_snapshot('t1', self.at(0, 10), used=1)
+        create_snapshot('t1', self.at(0, 40), used=3, limit=20)
+        create_snapshot('t1', self.at(1, 10), used=5)
+        create_snapshot('t2', self.at(0, 20), used=7)
+
+        self.assertEqual(3, rollup.rollup_hourly())
+
+        row = models.HourlyResourceRollup.objects.get(
+            tenant_id='t1', period_start=self.at(0))
+        self.assertEqual(2, row.sample_count)
+        self.assertEqual(1, row.cores_used_min)
+        self.assertEqual(3, row.cores_used_max)
+        self.assertEqual(2.0, row.cores_used_avg)
+        self.assertEqual(20, row.cores_limit)
+
+    def test_rollup_hourly_incremental(self):
+        create_snapshot('t1', self.at(0, 10), used=1)
+        create_snapshot('t1', self.at(1, 10), used=2)
+        rollup.rollup_hourly()
+        earlier = models.HourlyResourceRollup.objects.get(
+            period_start=self.at(0))
+
+        # A new sample in the latest hour and one in a new hour.
+        create_snapshot('t1', self.at(1, 40), used=4)
+        create_snapshot('t1', self.at(2, 10), used=6)
+
+        # Only the latest rolled up hour and the newer one are rewritten.
+        self.assertEqual(2, rollup.rollup_hourly())
+        self.assertEqual(3, models.HourlyResourceRollup.objects.count())
+        self.assertEqual(
+            earlier.pk,
+            models.HourlyResourceRollup.objects.get(period_start=self.at(0)).pk)
+        row = models.HourlyResourceRollup.objects.get(period_start=self.at(1))
+        self.assertEqual(2, row.sample_count)
+        self.assertEqual(3.0, row.instances_used_avg)
+
+    def test_rollup_daily_weighted_average(self):
+        create_snapshot('t1', self.at(0, 10), used=0)
+        create_snapshot('t1', self.at(0, 20), used=0)
+        create_snapshot('t1', self.at(0, 30), used=0)
+        create_snapshot('t1', self.at(5, 10), used=4)
+        create_snapshot('t1', self.at(24, 10), used=9)
+
+        self.assertEqual((3, 2), rollup.rollup_all())
+
+        row = models.DailyResourceRollup.objects.get(period_start=self.day)
+        self.assertEqual(4, row.sample_count)
+        self.assertEqual(0, row.ram_used_min)
+        self.assertEqual(4, row.ram_used_max)
+        self.assertEqual(1.0, row.ram_used_avg)
+
+    def test_rollup_snapshots_command_rebuild(self):
+        create_snapshot('t1', self.at(0, 10), used=1)
+        rollup.rollup_all()
+        models.HourlyResourceRollup.objects.update(cores_used_max=100)
+
+        call_command('rollup_snapshots', rebuild=True, stdout=io.StringIO())
+
+        self.assertEqual(
+            1, models.HourlyResourceRollup.objects.get().cores_used_max)
+        self.assertEqual(1, models.DailyResourceRollup.objects.count())
+
+    @override_settings(CUSTOM_REPORTS_SNAPSHOT_INTERVAL=600,
+                       CUSTOM_REPORTS_HISTORY_MIN_POINTS=100)
+    def test_select_resolution(self):
+        self.assertIs(rollup.RAW,
+                      rollup.select_resolution(datetime.timedelta(days=1)))
+        self.assertIs(rollup.HOURLY,
+                      rollup.select_resolution(datetime.timedelta(days=30)))
+        self.assertIs(rollup.DAILY,
+                      rollup.select_resolution(datetime.timedelta(days=365)))
+
+
+class HistorySeriesTests(test.TestCase):
+
+    def test_series(self):
+        start = datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc)
+        for hours in range(3):
+            create_snapshot('t1', start + datetime.timedelta(hours=hours),
+                            used=hours, limit=10 + hours)
+        create_snapshot('t2', start, used=100)
+
+        with self.assertNumQueries(1):
+            series = rollup.RAW.series('t1', start, ('cores', 'ram'),
+                                       limits=True)
+
+        self.assertEqual(
+            ['time', 'cores', 'cores_limit', 'ram', 'ram_limit'],
+            list(series))
+        self.assertEqual(
+            tuple(start + datetime.timedelta(hours=hours)
+                  for hours in range(3)),
+            series['time'])
+        self.assertEqual((0, 1, 2), series['cores'])
+        self.assertEqual((10, 11, 12), series['ram_limit'])
+
+    def test_series_empty(self):
+        series = rollup.HOURLY.series('t1', timezone.now(), ('cores',))
+        self.assertEqual({'time': (), 'cores': ()}, series)
+
+
+class PartitionTests(test.TestCase):
+
+    def test_add_months(self):
+        month = datetime.date(2024, 11, 1)
+        self.assertEqual(datetime.date(2024, 12, 1),
+                         partitions.add_months(month, 1))
+        self.assertEqual(datetime.date(2025, 2, 1),
+                         partitions.add_months(month, 3))
+        self.assertEqual(datetime.date(2023, 12, 1),
+                         partitions.add_months(month, -11))
+
+    def test_partition_month(self):
+        self.assertEqual('p202402',
+                         partitions.partition_name(datetime.date(2024, 2, 1)))
+        self.assertEqual(datetime.date(2024, 2, 1),
+                         partitions.partition_month('p202402'))
+        self.assertIsNone(partitions.partition_month('pmax'))
+
+    def test_partition_definitions(self):
+        definitions = partitions.partition_definitions(
+            datetime.date(2024, 11, 1), datetime.date(2025, 1, 1))
+        self.assertEqual(
+            "PARTITION p202411 VALUES LESS THAN (TO_DAYS('2024-12-01')),\n"
+            "PARTITION p202412 VALUES LESS THAN (TO_DAYS('2025-01-01')),\n"
+            "PARTITION p202501 VALUES LESS THAN (TO_DAYS('2025-02-01')),\n"
+            "PARTITION pmax VALUES LESS THAN MAXVALUE",
+            definitions)
+
+    @mock.patch.object(partitions, 'get_partitions')
+    def test_drop_partitions_before(self, mock_get_partitions):
+        mock_get_partitions.return_value = ['p202401', 'p202402', 'p202403',
+                                            'pmax']
+        cutoff = datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc)
+
+        with mock.patch.object(partitions, 'connection') as mock_connection:
+            dropped = partitions.drop_partitions_before(cutoff)
+
+        self.assertEqual(['p202401', 'p202402'], dropped)
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with(
+            'ALTER TABLE tenant_resource_snapshot '
+            'DROP PARTITION p202401, p202402')
+
+    def test_partition_snapshots_command_unsupported(self):
+        with self.assertRaises(CommandError):
+            call_command('partition_snapshots', stdout=io.StringIO())
+
+    def test_migrations_in_sync(self):
+        call_command('makemigrations', 'custom_reports', check=True,
+                     dry_run=True, stdout=io.StringIO())
+
+
+class CleanupSnapshotsTests(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        for days in range(31, 36):
+            create_snapshot('tenant-a', now - datetime.timedelta(days=days))
+        create_snapshot('tenant-b', now - datetime.timedelta(days=40))
+        self.recent = create_snapshot('tenant-a',
+                                      now - datetime.timedelta(days=1))
+
+    @mock.patch('time.sleep')
+    def test_cleanup_in_batches(self, mock_sleep):
+        stdout = io.StringIO()
+
+        call_command('cleanup_old_snapshots', batch_size=4, sleep=0.5,
+                     stdout=stdout)
+
+        self.assertEqual([self.recent.pk], list(
+            models.TenantResourceSnapshot.objects.values_list('pk', flat=True)))
+        output = stdout.getvalue()
+        self.assertIn('已删除 4/6 条记录', output)
+        self.assertIn('已删除 6/6 条记录', output)
+        self.assertIn('成功删除 6 条记录', output)
+        # Only a full batch can be followed by another one.
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_cleanup_dry_run(self):
+        stdout = io.StringIO()
+
+        # One aggregate query for the statistics, one for the status.
+        with self.assertNumQueries(2):
+            call_command('cleanup_old_snapshots', dry_run=True,
+                         stdout=stdout)
+
+        self.assertEqual(7, models.TenantResourceSnapshot.objects.count())
+        output = stdout.getvalue()
+        self.assertIn('将删除 6 条', output)
+        self.assertIn('租户 tenant-a: 5 条记录', output)
+        self.assertIn('租户 tenant-b: 1 条记录', output)
+
+
+@override_settings(USAGE_CACHE_TIMEOUT=60)
+class WarmUsageCacheTests(test.APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_closed_months(self):
+        self.assertEqual(
+            [(datetime.datetime(2024, 2, 1),
+              datetime.datetime(2024, 2, 29, 23, 59, 59)),
+             (datetime.datetime(2024, 1, 1),
+              datetime.datetime(2024, 1, 31, 23, 59, 59)),
+             (datetime.datetime(2023, 12, 1),
+              datetime.datetime(2023, 12, 31, 23, 59, 59))],
+            warm_usage_cache.closed_months(datetime.date(2024, 3, 15), 3))
+
+    @mock.patch.object(api._nova, 'novaclient')
+    @mock.patch.object(snapshots, 'get_admin_request')
+    def test_warm_usage_cache_command(self, mock_get_admin_request,
+                                      mock_novaclient):
+        mock_get_admin_request.return_value = self.request
+        usages = self.usages.list()
+        novaclient = mock_novaclient.return_value
+        novaclient.versions.get_current.return_value = mock.Mock(
+            min_version='2.1', version='2.1')
+        novaclient.api_version = api_versions.APIVersion('2.1')
+        novaclient.usage.list.return_value = usages
+
+        call_command('warm_usage_cache', months=2, stdout=io.StringIO())
+        self.assertEqual(2, novaclient.usage.list.call_count)
+
+        # The overviews of the warmed months are read from the cache.
+        start, end = warm_usage_cache.closed_months(
+            timezone.now().date(), 1)[0]
+        global_usages = api.nova.usage_list(self.request, start, end)
+        project_usage = api.nova.usage_get(self.request, usages[0].tenant_id,
+                                           start, end)
+
+        self.assertEqual(2, novaclient.usage.list.call_count)
+        novaclient.usage.get.assert_not_called()
+        self.assertEqual([u.tenant_id for u in usages],
+                         [u.tenant_id for u in global_usages])
+        self.assertEqual(usages[0].tenant_id, project_usage.tenant_id)
+
+    @mock.patch.object(cache, 'set_many')
+    @mock.patch.object(api._nova, 'novaclient')
+    @mock.patch.object(snapshots, 'get_admin_request')
+    def test_warm_usage_cache_command_not_stored(self, mock_get_admin_request,
+                                                 mock_novaclient,
+                                                 mock_set_many):
+        mock_get_admin_request.return_value = self.request
+        novaclient = mock_novaclient.return_value
+        novaclient.versions.get_current.return_value = mock.Mock(
+            min_version='2.1', version='2.1')
+        novaclient.api_version = api_versions.APIVersion('2.1')
+        novaclient.usage.list.return_value = self.usages.list()
+        # The cache drops the values it refuses without any error.
+        mock_set_many.return_value = []
+        stderr = io.StringIO()
+
+        with self.assertRaises(CommandError):
+            call_command('warm_usage_cache', months=1, stdout=io.StringIO(),
+                         stderr=stderr)
+        self.assertIn('未能写入缓存', stderr.getvalue())
+
+    @override_settings(USAGE_CACHE_TIMEOUT=0)
+    def test_warm_usage_cache_command_disabled(self):
+        with self.assertRaises(CommandError):
+            call_command('warm_usage_cache', stdout=io.StringIO())
@@ -87,6 +87,8 @@ class DeleteInstance(policy.PolicyTargetMixin, tables.DeleteAction):
     policy_rules = (("compute", "os_compute_api:servers:delete"),)
     help_text = _("Deleted instances are not recoverable.")
     default_message_level = "info"
+    concurrency = 10
+    background_threshold = 100
 
     @staticmethod
     def action_present(count):
@@ -186,6 +186,92 @@ class NetworkTopologyTests(test.TestCase):
         self.mock_port_list.assert_called_once_with(
             test.IsHttpRequest())
 
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    @test.create_mocks({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list')})
+    def test_json_view_not_modified(self):
+        self.mock_server_list.return_value = [self.servers.list(), False]
+        self.mock_network_list_for_tenant.return_value = \
+            self.networks.list()
+        self.mock_port_list.return_value = self.ports.list()
+
+        res = self.client.get(JSON_URL)
+        self.assertEqual(200, res.status_code)
+        etag = res['ETag']
+
+        res = self.client.get(JSON_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, res.status_code)
+        self.assertEqual(etag, res['ETag'])
+        self.assertEqual(b'', res.content)
+
+        self.mock_port_list.return_value = self.ports.list()[1:]
+        res = self.client.get(JSON_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, res.status_code)
+        self.assertNotEqual(etag, res['ETag'])
+
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    @test.create_mocks({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list')})
+    def test_json_view_delta(self):
+        servers = self.servers.list()
+        ports = self.ports.list()
+        self.mock_server_list.return_value = [servers, False]
+        self.mock_network_list_for_tenant.return_value = \
+            self.networks.list()
+        self.mock_port_list.return_value = ports
+
+        data = jsonutils.loads(self.client.get(JSON_URL).content)
+        version = data['version']
+        self.assertEqual(len(ports), len(data['ports']))
+
+        res = self.client.get(JSON_URL, {'version': version})
+        self.assertEqual(304, res.status_code)
+
+        servers[0].status = 'SHUTOFF'
+        self.mock_port_list.return_value = ports[1:]
+        res = self.client.get(JSON_URL, {'version': version})
+
+        data = jsonutils.loads(res.content)
+        self.assertNotEqual(version, data['version'])
+        self.assertEqual(version, data['base'])
+        self.assertNotIn('servers', data)
+        delta = data['delta']
+        self.assertEqual([], delta['servers']['added'])
+        self.assertEqual([servers[0].id],
+                         [server['id']
+                          for server in delta['servers']['changed']])
+        self.assertEqual('SHUTOFF',
+                         delta['servers']['changed'][0]['original_status'])
+        self.assertEqual([], delta['servers']['removed'])
+        self.assertEqual(['%s:%s' % (ports[0].id, ports[0].device_id)],
+                         delta['ports']['removed'])
+        self.assertEqual({'added': [], 'changed': [], 'removed': []},
+                         delta['networks'])
+
+    @test.create_mocks({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'network_list',
+                                      'router_list',
+                                      'port_list')})
+    def test_json_view_delta_unknown_version(self):
+        self.mock_server_list.return_value = [self.servers.list(), False]
+        self.mock_network_list_for_tenant.return_value = \
+            self.networks.list()
+        self.mock_network_list.return_value = []
+        self.mock_router_list.return_value = self.routers.list()
+        self.mock_port_list.return_value = self.ports.list()
+
+        res = self.client.get(JSON_URL, {'version': 'expired'})
+
+        data = jsonutils.loads(res.content)
+        self.assertNotIn('delta', data)
+        self.assertEqual(len(self.servers.list()), len(data['servers']))
+        self.assertEqual(len(self.routers.list()), len(data['routers']))
+
 
 class NetworkTopologyCreateTests(test.TestCase):
 
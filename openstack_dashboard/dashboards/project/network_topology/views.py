@@ -16,12 +16,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import json
 
 from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpResponse
+from django.http import HttpResponseNotModified
 from django.urls import reverse
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import View
 
@@ -74,6 +78,7 @@ from openstack_dashboard.dashboards.project.routers.tables import \
 from openstack_dashboard.dashboards.project.routers import\
     views as r_views
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
 from openstack_dashboard.utils import settings as setting_utils
 
 # List of known server statuses that wont connect to the console
@@ -201,7 +206,22 @@ class NetworkTopologyView(tabs.TabView):
 
 
 class JSONView(View):
+    """The topology of the project as JSON.
+
+    The response carries the version of the topology. When a client polls
+    with the version it last saw as the ``version`` parameter, only the
+    differences are returned, as the ``added``, ``changed`` and
+    ``removed`` nodes of each kind, or 304 Not Modified if there is none.
+    Removed nodes are given by their ID, which for the ports is followed
+    by ':' and their device ID. The topology is returned in full if the
+    snapshot of that version has expired.
+    """
     trans = TranslationHelper()
+    kinds = ('servers', 'networks', 'ports', 'routers')
+    # The number of seconds the snapshot of a version of the topology is
+    # kept to compute the differences with it. The topology is polled
+    # every 10 seconds.
+    snapshot_timeout = 60
 
     @property
     def is_router_enabled(self):
@@ -216,13 +236,6 @@ class JSONView(View):
                 continue
             resource['url'] = reverse(view, None, [str(resource['id'])])
 
-    def _check_router_external_port(self, ports, router_id, network_id):
-        for port in ports:
-            if (port['network_id'] == network_id and
-                    port['device_id'] == router_id):
-                return True
-        return False
-
     def _get_servers(self, request):
         # Get nova data
         try:
@@ -231,10 +244,10 @@ class JSONView(View):
             servers = []
         data = []
         console_type = settings.CONSOLE_TYPE
+        allow_delete_server = policy.check(
+            (("compute", "os_compute_api:servers:delete"),), request)
         # lowercase of the keys will be used at the end of the console URL.
         for server in servers:
-            allow_delete_server = policy.check(
-                (("compute", "os_compute_api:servers:delete"),), request)
             server_data = {'name': server.name,
                            'status': self.trans.instance[server.status],
                            'original_status': server.status,
@@ -272,19 +285,18 @@ class JSONView(View):
         except Exception:
             neutron_networks = []
         networks = []
+        # The policy targets depend on the owner of the network only.
+        allowed = {}
         for network in neutron_networks:
-            allow_delete_subnet = policy.check(
-                (("network", "delete_subnet"),),
-                request,
-                target={'network:tenant_id': getattr(network,
-                                                     'tenant_id', None)}
-            )
-            allow_delete_network = policy.check(
-                (("network", "delete_network"),),
-                request,
-                target={'network:tenant_id': getattr(network,
-                                                     'tenant_id', None)}
-            )
+            tenant_id = getattr(network, 'tenant_id', None)
+            if tenant_id not in allowed:
+                target = {'network:tenant_id': tenant_id}
+                allowed[tenant_id] = (
+                    policy.check((("network", "delete_subnet"),),
+                                 request, target=target),
+                    policy.check((("network", "delete_network"),),
+                                 request, target=target))
+            allow_delete_subnet, allow_delete_network = allowed[tenant_id]
             obj = {'name': network.name_or_id,
                    'id': network.id,
                    'subnets': [{'id': subnet.id,
@@ -307,7 +319,7 @@ class JSONView(View):
                     **{'router:external': True})
             except Exception:
                 neutron_public_networks = []
-            my_network_ids = [net['id'] for net in networks]
+            my_network_ids = {net['id'] for net in networks}
             for publicnet in neutron_public_networks:
                 if publicnet.id in my_network_ids:
                     continue
@@ -353,15 +365,16 @@ class JSONView(View):
         self.add_resource_url('horizon:project:routers:detail', routers)
         return routers
 
-    def _get_ports(self, request, networks):
+    def _list_ports(self, request):
         try:
-            neutron_ports = api.neutron.port_list(request)
+            return api.neutron.port_list(request)
         except Exception:
-            neutron_ports = []
+            return []
 
+    def _get_ports(self, networks, neutron_ports):
         # we should filter out ports connected to non tenant networks
         # which they have no visibility to
-        tenant_network_ids = [network['id'] for network in networks]
+        tenant_network_ids = {network['id'] for network in networks}
         ports = [{'id': port.id,
                   'network_id': port.network_id,
                   'device_id': port.device_id,
@@ -379,6 +392,8 @@ class JSONView(View):
     def _prepare_gateway_ports(self, routers, ports):
         # user can't see port on external network. so we are
         # adding fake port based on router information
+        router_ports = {(port['network_id'], port['device_id'])
+                        for port in ports}
         for router in routers:
             external_gateway_info = router.get('external_gateway_info')
             if not external_gateway_info:
@@ -387,9 +402,7 @@ class JSONView(View):
                 'network_id')
             if not external_network:
                 continue
-            if self._check_router_external_port(ports,
-                                                router['id'],
-                                                external_network):
+            if (external_network, router['id']) in router_ports:
                 continue
             fake_port = {'id': 'gateway%s' % external_network,
                          'network_id': external_network,
@@ -397,13 +410,92 @@ class JSONView(View):
                          'fixed_ips': []}
             ports.append(fake_port)
 
+    def _node_key(self, kind, node):
+        # The fake gateway ports of several routers share their ID.
+        if kind == 'ports':
+            return '%s:%s' % (node['id'], node['device_id'])
+        return node['id']
+
+    def _snapshot_key(self, version):
+        return 'network-topology:%s:%s' % (self.request.user.tenant_id,
+                                           version)
+
+    def _delta(self, nodes, snapshot, base_snapshot):
+        delta = {}
+        for kind in self.kinds:
+            base_hashes = base_snapshot.get(kind, {})
+            delta[kind] = {
+                'added': [nodes[kind][key] for key in snapshot[kind]
+                          if key not in base_hashes],
+                'changed': [nodes[kind][key]
+                            for key, node_hash in snapshot[kind].items()
+                            if base_hashes.get(key, node_hash) != node_hash],
+                'removed': [key for key in base_hashes
+                            if key not in snapshot[kind]]}
+        return delta
+
     def get(self, request, *args, **kwargs):
-        networks = self._get_networks(request)
-        data = {'servers': self._get_servers(request),
+        networks, servers, neutron_ports, routers = \
+            futurist_utils.call_functions_parallel(
+                (self._get_networks, [request]),
+                (self._get_servers, [request]),
+                (self._list_ports, [request]),
+                (self._get_routers, [request]))
+        data = {'servers': servers,
                 'networks': networks,
-                'ports': self._get_ports(request, networks),
-                'routers': self._get_routers(request)}
+                'ports': self._get_ports(networks, neutron_ports),
+                'routers': routers}
         self._prepare_gateway_ports(data['routers'], data['ports'])
-        json_string = json.dumps(data, cls=LazyTranslationEncoder,
-                                 ensure_ascii=False)
-        return HttpResponse(json_string, content_type='text/json')
+
+        # Each node is serialized once, both to fingerprint it for the
+        # delta of the next poll and to build the full response.
+        nodes = {}
+        snapshot = {}
+        version = hashlib.sha256()
+        for kind in self.kinds:
+            nodes[kind] = {}
+            snapshot[kind] = {}
+            for node in data[kind]:
+                node_json = json.dumps(node, cls=LazyTranslationEncoder,
+                                       ensure_ascii=False, sort_keys=True)
+                key = self._node_key(kind, node)
+                nodes[kind][key] = node_json
+                snapshot[kind][key] = hashlib.sha256(
+                    node_json.encode('utf-8')).hexdigest()
+                version.update(('%s\n%s\n' % (kind, node_json))
+                               .encode('utf-8'))
+        version = version.hexdigest()
+        cache.set(self._snapshot_key(version), snapshot,
+                  self.snapshot_timeout)
+
+        # The topology is polled, so an unchanged topology is answered
+        # with 304 Not Modified instead of being sent again.
+        etag = '"%s"' % version
+        base = request.GET.get('version')
+        if base == version:
+            response = HttpResponseNotModified()
+        else:
+            response = get_conditional_response(request, etag=etag)
+        if response is None:
+            base_snapshot = cache.get(self._snapshot_key(base)) \
+                if base else None
+            if base_snapshot is None:
+                body = {kind: '[%s]' % ', '.join(nodes[kind].values())
+                        for kind in self.kinds}
+            else:
+                delta = self._delta(nodes, snapshot, base_snapshot)
+                body = {'base': json.dumps(base),
+                        'delta': '{%s}' % ', '.join(
+                            '"%s": {"added": [%s], "changed": [%s], '
+                            '"removed": %s}' % (
+                                kind,
+                                ', '.join(delta[kind]['added']),
+                                ', '.join(delta[kind]['changed']),
+                                json.dumps(delta[kind]['removed']))
+                            for kind in self.kinds)}
+            body['version'] = json.dumps(version)
+            json_string = '{%s}' % ', '.join(
+                '"%s": %s' % item for item in body.items())
+            response = HttpResponse(json_string, content_type='text/json')
+        response['ETag'] = etag
+        return response
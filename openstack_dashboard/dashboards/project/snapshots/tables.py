@@ -71,6 +71,8 @@ class LaunchSnapshotNG(LaunchSnapshot):
 
 class DeleteVolumeSnapshot(policy.PolicyTargetMixin, tables.DeleteAction):
     help_text = _("Deleted volume snapshots are not recoverable.")
+    concurrency = 10
+    background_threshold = 100
 
     @staticmethod
     def action_present(count):
@@ -99,6 +99,8 @@ class DeleteVolume(VolumePolicyTargetMixin, tables.DeleteAction):
     help_text = _("Deleted volumes are not recoverable. "
                   "All data stored in the volume will be removed.")
     default_message_level = "info"
+    concurrency = 10
+    background_threshold = 100
 
     @staticmethod
     def action_present(count):
@@ -136,6 +136,46 @@ ALLOWED_PRIVATE_SUBNET_CIDR = {'ipv4': [], 'ipv6': []}
 API_RESULT_LIMIT = 1000
 API_RESULT_PAGE_SIZE = 20
 
+# The API calls which Horizon makes in parallel (for example to retrieve
+# the quota usage of a project from Nova, Cinder and Neutron at once) run on
+# a thread pool shared by all the requests of a process, with at most
+# API_PARALLEL_MAX_WORKERS threads. Once API_PARALLEL_MAX_BACKLOG calls are
+# waiting for a thread, further calls run sequentially in the request thread.
+API_PARALLEL_MAX_WORKERS = 10
+API_PARALLEL_MAX_BACKLOG = 100
+
+# The number of seconds the quota limits and usage of a project are cached
+# in the Django cache and shared by all the users of the project. They are
+# invalidated when Horizon updates the quotas of the project or creates or
+# deletes resources counted against them. Set it to 0 to disable caching.
+QUOTA_LIMITS_CACHE_TIMEOUT = 30
+
+# Near-static API responses, such as the flavors, the availability zones,
+# the volume types and the Neutron extensions, are kept in the Django cache
+# and shared by the users with the same token scope (project and roles).
+# API_RESPONSE_CACHE_TIMEOUTS overrides the number of seconds the responses
+# of an API function are kept, by function name, for example
+# {'nova.flavor_list': 60}. A timeout of 0 disables the cache of a function.
+API_RESPONSE_CACHE_ENABLED = True
+API_RESPONSE_CACHE_TIMEOUTS = {}
+
+# The number of seconds the names of the projects shown by the admin views
+# are kept in the Django cache for the token of the user who looked them up.
+# Set it to 0 to look the names up on every page view.
+PROJECT_NAMES_CACHE_TIMEOUT = 300
+
+# The number of seconds the Nova usage of a period which ended, as shown by
+# the admin and project overviews and their CSV exports, is kept in the
+# Django cache. The usage of the current period is always retrieved from
+# Nova. Set it to 0 to disable caching.
+USAGE_CACHE_TIMEOUT = 2592000
+
+# The number of seconds the background jobs of the batch actions, queued when
+# BATCH_ACTION_JOB_QUEUE is 'openstack_dashboard.utils.batch_jobs.enqueue',
+# and their progress are kept in the Django cache. The token of the user who
+# queued a job is kept until the job is run, at most until the token expires.
+BATCH_JOB_TIMEOUT = 86400
+
 # For multiple regions uncomment this configuration, and add (endpoint, title).
 # AVAILABLE_REGIONS = [
 #     ('http://cluster1.example.com/identity/v3', 'cluster1'),
@@ -569,3 +609,36 @@ KUBECONFIG_CERTIFICATE_AUTHORITY_DATA = ""
 # Services may require a System Scope token for certain operations. This
 # settings enables the use of the system scope token on per-service basis.
 SYSTEM_SCOPE_SERVICES = []
+
+# Custom Reports dashboard settings.
+# The number of seconds the comprehensive overview waits for each of its
+# data collectors (Nova/Cinder/Neutron API calls) which run concurrently.
+# A collector which does not complete in time leaves its section empty.
+CUSTOM_REPORTS_COLLECTOR_TIMEOUT = 10
+
+# Resource snapshots for the trend charts are sampled by the
+# "collect_snapshots" management command rather than on page views.
+# CUSTOM_REPORTS_SNAPSHOT_INTERVAL is the sampling interval in seconds and
+# CUSTOM_REPORTS_SNAPSHOT_WORKERS is the maximum number of projects sampled
+# concurrently. The command authenticates with the admin credentials in
+# CUSTOM_REPORTS_SNAPSHOT_CREDENTIALS, for example:
+# CUSTOM_REPORTS_SNAPSHOT_CREDENTIALS = {
+#     'username': 'admin',
+#     'password': 'secret',
+#     'project_name': 'admin',
+#     'user_domain_name': 'Default',
+#     'project_domain_name': 'Default',
+# }
+CUSTOM_REPORTS_SNAPSHOT_INTERVAL = 3600
+CUSTOM_REPORTS_SNAPSHOT_WORKERS = 4
+CUSTOM_REPORTS_SNAPSHOT_CREDENTIALS = {}
+
+# The history and trend charts read hourly or daily roll-ups of the
+# snapshots instead of the raw rows. The coarsest resolution which still
+# gives at least CUSTOM_REPORTS_HISTORY_MIN_POINTS points over the requested
+# time window is used, e.g. hourly roll-ups for the 30 days history.
+CUSTOM_REPORTS_HISTORY_MIN_POINTS = 100
+
+# The snapshot export streams rows from a server-side cursor, reading
+# CUSTOM_REPORTS_EXPORT_CHUNK_SIZE rows from the database at a time.
+CUSTOM_REPORTS_EXPORT_CHUNK_SIZE = 2000
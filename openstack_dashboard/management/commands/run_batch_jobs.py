@@ -0,0 +1,45 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from openstack_dashboard.utils import batch_jobs
+
+
+class Command(BaseCommand):
+    help = ('Runs the background jobs of the batch actions queued when '
+            'BATCH_ACTION_JOB_QUEUE is '
+            '"openstack_dashboard.utils.batch_jobs.enqueue".')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the queued jobs and exit instead of waiting for more.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2,
+            help='Seconds to wait before looking for new jobs (default 2).',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = batch_jobs.run_pending()
+            if count:
+                self.stdout.write('Ran %s batch jobs' % count)
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -13,6 +13,19 @@
 
 
 from horizon.utils import settings as utils_settings
+from openstack_auth import policy as auth_policy
+
+
+def init():
+    """Load the rules of the configured policy engine.
+
+    The WSGI application calls this when it starts, so that the rules are
+    not loaded by the first requests of each process.
+    """
+    policy_check = utils_settings.import_setting("POLICY_CHECK_FUNCTION")
+
+    if policy_check is auth_policy.check:
+        auth_policy.init()
 
 
 def check(actions, request, target=None):
@@ -0,0 +1,95 @@
+/**
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may
+ * not use this file except in compliance with the License. You may obtain
+ * a copy of the License at
+ *
+ *    http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations
+ * under the License.
+ */
+
+/**
+ * Reports the progress of the background jobs of the batch actions
+ */
+horizon.batchjobs = {
+  // timeout length
+  poll_interval: 5000,
+  // progress alerts of the running jobs, by job id
+  alerts: {},
+
+  init:function() {
+    var self = this;
+    self.url = WEBROOT + 'api/batch_jobs/';
+    self.poll();
+  },
+
+  /**
+   * requests the jobs of the user and polls again while they are running
+   */
+  poll:function() {
+    var self = this;
+    $.ajax({
+      url: self.url,
+      dataType: 'json',
+      cache: false,
+      success: function(data) {
+        var running = false;
+        $.each(data.items, function(i, job) {
+          if (job.status === 'finished') {
+            self.report(job);
+          } else {
+            self.progress(job);
+            running = true;
+          }
+        });
+        if (running) {
+          setTimeout(function() {
+            self.poll();
+          }, self.poll_interval);
+        }
+      }
+    });
+  },
+
+  /**
+   * shows how many items of a running job are done
+   */
+  progress:function(job) {
+    var self = this;
+    var message = interpolate(gettext('%(name)s: %(done)s of %(total)s items done.'),
+                              job, true);
+    if (self.alerts[job.id]) {
+      self.alerts[job.id].remove();
+    }
+    self.alerts[job.id] = horizon.alert('info', message);
+  },
+
+  /**
+   * shows the results of a finished job
+   */
+  report:function(job) {
+    var self = this;
+    if (self.alerts[job.id]) {
+      self.alerts[job.id].remove();
+      delete self.alerts[job.id];
+    }
+    if (job.failed.length) {
+      var failed = $.map(job.failed, function(failure) {
+        return failure[0];
+      });
+      horizon.toast.add('error', interpolate(
+        gettext('%(name)s: unable to process %(count)s of %(total)s items: %(items)s'),
+        {name: job.name, count: failed.length, total: job.total,
+         items: failed.join(', ')}, true));
+    }
+    if (job.succeeded.length) {
+      horizon.toast.add('success', interpolate(
+        gettext('%(name)s: %(count)s of %(total)s items done.'),
+        {name: job.name, count: job.succeeded.length, total: job.total}, true));
+    }
+  }
+};
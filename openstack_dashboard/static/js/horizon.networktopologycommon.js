@@ -26,6 +26,8 @@ horizon.networktopologycommon = {
 horizon.networktopologyloader = {
   // data for the network topology views
   model: null,
+  // version of the model, used to request the differences only
+  version: null,
   // timeout length
   reload_duration: 10000,
   // timer controlling update intervals
@@ -44,16 +46,73 @@ horizon.networktopologyloader = {
    */
   update:function() {
     var self = this;
-    angular.element.getJSON(
-      angular.element('#networktopology').data('networktopology') + '?' + angular.element.now(),
-      function(data) {
-        self.model = data;
-        $('#networktopology').trigger('change');
+    var url = angular.element('#networktopology').data('networktopology');
+    if (self.version !== null) {
+      // only the differences with the version we have are returned
+      url += '?version=' + encodeURIComponent(self.version);
+    }
+    angular.element.ajax({
+      url: url,
+      dataType: 'json',
+      cache: false,
+      success: function(data, status) {
+        if (status !== 'notmodified') {
+          self.version = data.version;
+          if (data.delta && self.model !== null) {
+            self.model = self.apply_delta(self.model, data.delta);
+          } else {
+            self.model = {
+              servers: data.servers,
+              networks: data.networks,
+              ports: data.ports,
+              routers: data.routers
+            };
+          }
+          $('#networktopology').trigger('change');
+        }
         self.update_timer = setTimeout(function(){
           self.update();
         }, self.reload_duration);
       }
-    );
+    });
+  },
+
+  /**
+   * returns the key identifying a node in a delta
+   */
+  node_key:function(kind, node) {
+    // the fake gateway ports of several routers share their id
+    if (kind === 'ports') {
+      return node.id + ':' + node.device_id;
+    }
+    return node.id;
+  },
+
+  /**
+   * returns the model updated with the added, changed and removed nodes
+   */
+  apply_delta:function(model, delta) {
+    var self = this;
+    var updated = {};
+    angular.forEach(delta, function(changes, kind) {
+      var removed = {};
+      var changed = {};
+      angular.forEach(changes.removed, function(key) {
+        removed[key] = true;
+      });
+      angular.forEach(changes.changed, function(node) {
+        changed[self.node_key(kind, node)] = node;
+      });
+      updated[kind] = [];
+      angular.forEach(model[kind], function(node) {
+        var key = self.node_key(kind, node);
+        if (!removed[key]) {
+          updated[kind].push(changed[key] || node);
+        }
+      });
+      updated[kind] = updated[kind].concat(changes.added);
+    });
+    return updated;
   },
 
   /**
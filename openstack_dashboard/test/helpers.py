@@ -32,6 +32,7 @@ from django.test.client import RequestFactory
 from django.test import tag
 from django.test import testcases
 from django import urls
+from keystoneclient import exceptions as keystone_exceptions
 
 from openstack_auth import user
 from openstack_auth import utils
@@ -397,6 +398,21 @@ class TestCase(horizon_helpers.TestCase):
         mock_args.update(args)
         return mock.Mock(**mock_args)
 
+    @staticmethod
+    def tenant_get_side_effect(tenants):
+        """Return a side effect of api.keystone.tenant_get for tenants.
+
+        The tenants are returned by their id and the other ids raise
+        NotFound, as for deleted projects.
+        """
+        tenant_dict = {tenant.id: tenant for tenant in tenants}
+
+        def tenant_get(request, project, admin=True):
+            if project not in tenant_dict:
+                raise keystone_exceptions.NotFound()
+            return tenant_dict[project]
+        return tenant_get
+
     def assert_mock_multiple_calls_with_same_arguments(
             self, mocked_method, count, expected_call):
         self.assertEqual(count, mocked_method.call_count)
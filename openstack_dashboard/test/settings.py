@@ -204,6 +204,16 @@ POLICY_FILES = {
 # when we would like to test the policy check feature itself.
 POLICY_CHECK_FUNCTION = None
 
+# The quota limits cache is shared between tests, so it is disabled by
+# default and enabled by the tests of the cache itself.
+QUOTA_LIMITS_CACHE_TIMEOUT = 0
+
+# Likewise, the API response cache is enabled by its own tests only.
+API_RESPONSE_CACHE_ENABLED = False
+PROJECT_NAMES_CACHE_TIMEOUT = 0
+USAGE_CACHE_TIMEOUT = 0
+NAVIGATION_ACCESS_CACHE_TIMEOUT = 0
+
 # The openstack_auth.user.Token object isn't JSON-serializable ATM
 SESSION_SERIALIZER = 'django.contrib.sessions.serializers.PickleSerializer'
 
@@ -0,0 +1,46 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from openstack_dashboard import api
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import batch_jobs
+
+
+class BatchJobsRestTestCase(test.RestAPITestCase):
+
+    @mock.patch.object(batch_jobs, 'get_jobs')
+    def test_jobs_get(self, mock_get_jobs):
+        request = self.mock_rest_request()
+        mock_get_jobs.return_value = [{'id': 'one', 'status': 'running'}]
+        response = api.rest.batch_jobs.BatchJobs().get(request)
+        self.assertStatusCode(response, 200)
+        self.assertEqual({'items': [{'id': 'one', 'status': 'running'}]},
+                         response.json)
+        mock_get_jobs.assert_called_once_with(request)
+
+    @mock.patch.object(batch_jobs, 'get_job')
+    def test_job_get(self, mock_get_job):
+        request = self.mock_rest_request()
+        mock_get_job.return_value = {'id': 'one', 'status': 'queued'}
+        response = api.rest.batch_jobs.BatchJob().get(request, 'one')
+        self.assertStatusCode(response, 200)
+        self.assertEqual({'id': 'one', 'status': 'queued'}, response.json)
+        mock_get_job.assert_called_once_with(request, 'one')
+
+    @mock.patch.object(batch_jobs, 'get_job')
+    def test_job_get_not_found(self, mock_get_job):
+        request = self.mock_rest_request()
+        mock_get_job.return_value = None
+        response = api.rest.batch_jobs.BatchJob().get(request, 'other')
+        self.assertStatusCode(response, 404)
@@ -132,12 +132,14 @@ class NetworkApiNeutronTests(test.APIMockTestCase):
         else:
             self.assertEqual(0, self.sdk_net_client.ips.call_count)
         self.sdk_net_client.ports.assert_has_calls(expected_list_ports)
-        nets_calls = []
-        for server_net_id in server_network_ids:
-            nets_calls.append(mock.call(id=server_net_id))
-        self.sdk_net_client.networks.assert_has_calls(nets_calls,
-                                                      any_order=True)
-        self.sdk_net_client.subnets.assert_called_once_with()
+        # The networks are listed with a single request and only the
+        # subnets of these networks are listed.
+        self.sdk_net_client.networks.assert_called_once_with(id=mock.ANY)
+        self.assertEqual(
+            set(server_network_ids),
+            set(self.sdk_net_client.networks.call_args.kwargs['id']))
+        self.sdk_net_client.subnets.assert_called_once_with(
+            id=tuple(s for net in server_networks for s in net['subnet_ids']))
 
     @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': True})
     def test_servers_update_addresses(self):
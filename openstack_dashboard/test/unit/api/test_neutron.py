@@ -47,6 +47,41 @@ class NeutronApiTests(test.APIMockTestCase):
         neutronclient.networks.assert_called_once_with()
         neutronclient.subnets.assert_called_once_with()
 
+    @mock.patch.object(api.neutron, 'networkclient')
+    def test_network_list_by_ids(self, mock_neutronclient):
+        networks = self.api_networks_sdk[:2]
+        net_ids = [n['id'] for n in networks]
+        subnet_ids = tuple(s for n in networks for s in n['subnet_ids'])
+        subnets = [s for s in self.api_subnets_sdk if s['id'] in subnet_ids]
+
+        neutronclient = mock_neutronclient.return_value
+        neutronclient.networks.return_value = networks
+        neutronclient.subnets.return_value = subnets
+
+        ret_val = api.neutron.network_list(self.request,
+                                           id=frozenset(net_ids))
+
+        self.assertEqual(net_ids, [n.id for n in ret_val])
+        for n in ret_val:
+            self.assertEqual(n['subnet_ids'], [s.id for s in n.subnets])
+        neutronclient.networks.assert_called_once_with(
+            id=list(frozenset(net_ids)))
+        neutronclient.subnets.assert_called_once_with(id=subnet_ids)
+
+    @mock.patch.object(api.neutron, 'networkclient')
+    def test_network_list_without_subnets(self, mock_neutronclient):
+        network = self.api_networks_sdk[0]
+        network['subnet_ids'] = []
+
+        neutronclient = mock_neutronclient.return_value
+        neutronclient.networks.return_value = [network]
+
+        ret_val = api.neutron.network_list(self.request, name=network['name'])
+
+        self.assertEqual([], ret_val[0].subnets)
+        neutronclient.networks.assert_called_once_with(name=network['name'])
+        neutronclient.subnets.assert_not_called()
+
     @override_settings(OPENSTACK_NEUTRON_NETWORK={
         'enable_auto_allocated_network': True})
     @test.create_mocks({api.neutron: ('network_list',
@@ -1740,6 +1775,16 @@ class NeutronApiTests(test.APIMockTestCase):
     def test_get_router_ha_permission_without_l3_ha_extension(self):
         self._test_get_router_ha_permission_with_policy_check(False)
 
+    def _list_ports_with_uri_limit(self, ports, uri_len_exc, max_ids):
+        # Fake neutron which rejects the requests with more than max_ids
+        # port IDs.
+        def ports_side_effect(id):
+            if len(id) > max_ids:
+                raise uri_len_exc
+            return [p for p in ports if p.id in id]
+        return ports_side_effect
+
+    @mock.patch.dict(api.neutron._filter_len_limits, clear=True)
     @mock.patch.object(api.neutron, 'networkclient')
     def test_list_resources_with_long_filters(self, mock_networkclient):
         # In this tests, port_list is called with id=[10 port ID]
@@ -1758,10 +1803,8 @@ class NeutronApiTests(test.APIMockTestCase):
 
         network_client = mock_networkclient.return_value
         uri_len_exc = neutron_exc.RequestURITooLong(excess=220)
-        list_ports_retval = [uri_len_exc]
-        for i in range(0, 10, 4):
-            list_ports_retval.append(ports[i:i + 4])
-        network_client.ports.side_effect = list_ports_retval
+        network_client.ports.side_effect = self._list_ports_with_uri_limit(
+            ports, uri_len_exc, 4)
 
         ret_val = api.neutron.list_resources_with_long_filters(
             api.neutron.port_list, 'id', tuple(port_ids),
@@ -1773,7 +1816,73 @@ class NeutronApiTests(test.APIMockTestCase):
         expected_calls.append(mock.call(id=tuple(port_ids)))
         for i in range(0, 10, 4):
             expected_calls.append(mock.call(id=tuple(port_ids[i:i + 4])))
-        network_client.ports.assert_has_calls(expected_calls)
+        network_client.ports.assert_has_calls(expected_calls, any_order=True)
+        self.assertEqual(4, network_client.ports.call_count)
+
+        # The maximum filter length is remembered for the endpoint,
+        # so the long filter is split at once the next time.
+        network_client.ports.reset_mock()
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', tuple(reversed(port_ids)),
+            request=self.request)
+        self.assertEqual(10, len(ret_val))
+        self.assertEqual(3, network_client.ports.call_count)
+
+    @mock.patch.dict(api.neutron._filter_len_limits, clear=True)
+    @mock.patch.object(api.neutron, 'networkclient')
+    def test_list_resources_with_long_filters_sdk_error(self,
+                                                        mock_networkclient):
+        # The SDK does not return the excess length, so the filter
+        # values are split in halves until the requests are accepted.
+        ports = [sdk_port.Port(**{'id': uuidutils.generate_uuid(),
+                 'name': 'port%s' % i, 'admin_state_up': True})
+                 for i in range(10)]
+        port_ids = [port['id'] for port in ports]
+
+        network_client = mock_networkclient.return_value
+        uri_len_exc = sdk_exceptions.HttpException(http_status=414)
+        network_client.ports.side_effect = self._list_ports_with_uri_limit(
+            ports + ports[:2], uri_len_exc, 3)
+
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids, request=self.request)
+        self.assertEqual(port_ids, [p.id for p in ret_val])
+        network_client.ports.assert_any_call(id=port_ids)
+        for call in network_client.ports.call_args_list[1:]:
+            self.assertLessEqual(len(call.kwargs['id']), 5)
+
+    @mock.patch.dict(api.neutron._filter_len_limits, clear=True)
+    @mock.patch.object(api.neutron, 'networkclient')
+    def test_list_resources_with_long_filters_other_error(
+            self, mock_networkclient):
+        network_client = mock_networkclient.return_value
+        network_client.ports.side_effect = sdk_exceptions.HttpException(
+            http_status=500)
+
+        self.assertRaises(sdk_exceptions.HttpException,
+                          api.neutron.list_resources_with_long_filters,
+                          api.neutron.port_list, 'id', ('a', 'b'),
+                          request=self.request)
+        network_client.ports.assert_called_once_with(id=('a', 'b'))
+        self.assertEqual({}, api.neutron._filter_len_limits)
+
+    @mock.patch.object(api.neutron, 'neutronclient')
+    def test_tenant_quota_list(self, mock_neutronclient):
+        neutronclient = mock_neutronclient.return_value
+        neutronclient.list_quotas.return_value = {'quotas': [
+            {'tenant_id': '1', 'project_id': '1',
+             'network': 10, 'router': 5},
+            {'project_id': '2', 'network': -1, 'router': 0},
+        ]}
+
+        ret_val = api.neutron.tenant_quota_list(self.request)
+
+        self.assertEqual({'1', '2'}, set(ret_val))
+        self.assertEqual(10, ret_val['1'].get('network').limit)
+        self.assertEqual(5, ret_val['1'].get('router').limit)
+        self.assertIsNone(ret_val['1'].get('tenant_id').limit)
+        self.assertEqual(-1, ret_val['2'].get('network').limit)
+        neutronclient.list_quotas.assert_called_once_with()
 
     @mock.patch.object(api.neutron, 'neutronclient')
     def test_qos_policies_list(self, mock_neutronclient):
@@ -2656,7 +2765,8 @@ class NeutronApiFloatingIpTests(test.APIMockTestCase):
             mock.call(is_shared=True),
         ])
         self.netclient.routers.assert_called_once_with()
-        self.netclient.subnets.assert_called_once_with()
+        self.netclient.subnets.assert_called_once_with(
+            id=tuple(shared_subnet_ids))
 
     @mock.patch.object(api._nova, 'novaclient')
     def _test_target_floating_ip_port_by_instance(self, server, ports,
@@ -2705,7 +2815,8 @@ class NeutronApiFloatingIpTests(test.APIMockTestCase):
             mock.call(is_shared=True),
         ])
         self.netclient.routers.assert_called_once_with()
-        self.netclient.subnets.assert_called_once_with()
+        self.netclient.subnets.assert_called_once_with(
+            id=tuple(s for n in shared_nets for s in n['subnet_ids']))
         novaclient.versions.get_current.assert_called_once_with()
         novaclient.servers.get.assert_called_once_with(server.id)
 
@@ -16,9 +16,11 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import datetime
 from unittest import mock
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test.utils import override_settings
 
 from novaclient import api_versions
@@ -30,6 +32,7 @@ from novaclient.v2 import servers
 from horizon import exceptions as horizon_exceptions
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import usage_cache
 
 
 class ServerWrapperTests(test.TestCase):
@@ -302,6 +305,76 @@ class ComputeApiTests(test.APIMockTestCase):
                       marker='063cf7f3-ded1-4297-bc4c-31eae876cc93'),
         ])
 
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_usage_list_pages(self, mock_novaclient):
+        usages = self.usages.list()
+
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.40')
+        novaclient.usage.list.side_effect = [
+            usages,
+            usages[:1],
+            {},
+        ]
+
+        pages = list(api.nova.usage_list_pages(self.request, 'start', 'end'))
+
+        self.assertEqual([len(usages), 1], [len(page) for page in pages])
+        for page in pages:
+            for usage in page:
+                self.assertIsInstance(usage, api.nova.NovaUsage)
+        self.assertEqual(3, novaclient.usage.list.call_count)
+        novaclient.usage.list.assert_has_calls([
+            mock.call('start', 'end', True),
+            mock.call('start', 'end', True,
+                      marker='063cf7f3-ded1-4297-bc4c-31eae876cc93'),
+        ])
+
+    @override_settings(USAGE_CACHE_TIMEOUT=60)
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_usage_list_pages_cached(self, mock_novaclient):
+        usages = self.usages.list()
+        start = datetime.datetime(2020, 1, 1)
+        end = datetime.datetime(2020, 1, 31, 23, 59, 59)
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.40')
+        novaclient.usage.list.side_effect = [
+            usages,
+            usages[:1],
+            {},
+        ]
+
+        pages = list(api.nova.usage_list_pages(self.request, start, end))
+        self.assertEqual([len(usages), 1], [len(page) for page in pages])
+        # the usage read page by page is not kept for the cache
+        self.assertFalse(usage_cache.is_stored(
+            self.request, 'nova.usage_list', (start, end)))
+
+        # the usage cached by usage_list() is yielded as a single page
+        novaclient.usage.list.side_effect = [usages, {}]
+        api.nova.usage_list(self.request, start, end)
+        pages = list(api.nova.usage_list_pages(self.request, start, end))
+        self.assertEqual([len(usages)], [len(page) for page in pages])
+        self.assertEqual([u.tenant_id for u in usages],
+                         [u.tenant_id for u in pages[0]])
+        self.assertEqual(5, novaclient.usage.list.call_count)
+
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_usage_list_pages_not_paginated(self, mock_novaclient):
+        usages = self.usages.list()
+
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.1')
+        novaclient.usage.list.return_value = usages
+
+        pages = list(api.nova.usage_list_pages(self.request, 'start', 'end'))
+
+        self.assertEqual([len(usages)], [len(page) for page in pages])
+        novaclient.usage.list.assert_called_once_with('start', 'end', True)
+
     @mock.patch.object(api._nova, 'novaclient')
     def test_server_get(self, mock_novaclient):
         server = self.servers.first()
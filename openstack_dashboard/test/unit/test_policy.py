@@ -11,13 +11,24 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
 from django.test.utils import override_settings
 from openstack_auth import policy as policy_backend
+from oslo_policy import policy as oslo_policy
 
+from openstack_dashboard.dashboards.project.instances import tables
 from openstack_dashboard import policy
 from openstack_dashboard.test import helpers as test
 
 
+def _uncached_check(actions, request, target=None):
+    """The policy check without the per-request results, as a baseline."""
+    request.__dict__.pop('_policy_check_results', None)
+    request.__dict__.pop('_policy_user', None)
+    return policy_backend.check(actions, request, target)
+
+
 class PolicyTestCase(test.TestCase):
     @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
     def test_policy_check_set(self):
@@ -132,3 +143,40 @@ class PolicyBackendTestCaseAdmin(test.BaseAdminViewTests):
         value = policy.check((("compute", "context_is_admin"),),
                              request=self.request)
         self.assertTrue(value)
+
+
+class RowActionsPolicyTestCase(test.TestCase):
+
+    def _count_row_actions_enforce(self, copies):
+        # the targets of the rows only depend on their project and user
+        servers = self.servers.list() * copies
+        table = tables.InstancesTable(self.request, servers)
+        actions = [action for action in table.base_actions.values()
+                   if action.policy_rules]
+
+        # The policy checks done by _filter_action() when the row actions
+        # of the instances table are rendered.
+        self.request.__dict__.pop('_policy_check_results', None)
+        with mock.patch.object(oslo_policy.Enforcer, 'enforce',
+                               autospec=True,
+                               side_effect=oslo_policy.Enforcer.enforce) \
+                as enforce:
+            for server in servers:
+                for action in actions:
+                    policy.check(action.policy_rules, self.request,
+                                 action.get_policy_target(self.request,
+                                                          server))
+        return enforce.call_count
+
+    def test_row_actions_enforced_once_per_target(self):
+        policy_backend.reset()
+        with override_settings(POLICY_CHECK_FUNCTION=(
+                'openstack_dashboard.test.unit.test_policy._uncached_check')):
+            baseline = self._count_row_actions_enforce(10)
+        with override_settings(
+                POLICY_CHECK_FUNCTION='openstack_auth.policy.check'):
+            remembered = self._count_row_actions_enforce(10)
+            # rows with the same targets are not enforced again
+            self.assertEqual(self._count_row_actions_enforce(1), remembered)
+        self.assertGreater(remembered, 0)
+        self.assertLess(remembered, baseline)
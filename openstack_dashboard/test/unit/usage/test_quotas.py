@@ -511,3 +511,82 @@ class QuotaTests(test.APITestCase):
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_tenant_quota_detail_get, len(test_data),
             mock.call(test.IsHttpRequest(), self.request.user.tenant_id))
+
+    @test.create_mocks({api.base: ('is_service_enabled',),
+                        cinder: ('is_volume_service_enabled',),
+                        api.nova: ('tenant_quota_get',
+                                   'server_list',
+                                   'flavor_list')})
+    def test_tenants_quota_usages(self):
+        self._mock_service_enabled()
+        self.mock_tenant_quota_get.return_value = self.quotas.first()
+        self.mock_server_list.return_value = [self.servers.list(), False]
+        self.mock_flavor_list.return_value = self.flavors.list()
+
+        quota_usages = quotas.tenants_quota_usages(
+            self.request, ['1', '3', '4'],
+            targets=('instances', 'cores', 'ram'))
+
+        self.assertEqual({
+            'instances': {'used': 3, 'quota': 10, 'available': 7},
+            'cores': {'used': 3, 'quota': 10, 'available': 7},
+            'ram': {'used': 1536, 'quota': 10000, 'available': 8464},
+        }, quota_usages['1'].usages)
+        self.assertEqual({
+            'instances': {'used': 2, 'quota': 10, 'available': 8},
+            'cores': {'used': 2, 'quota': 10, 'available': 8},
+            'ram': {'used': 1024, 'quota': 10000, 'available': 8976},
+        }, quota_usages['3'].usages)
+        self.assertEqual(0, quota_usages['4']['instances']['used'])
+
+        # The usage is counted from a single listing of all projects and
+        # only the quotas are retrieved once per project.
+        self.mock_server_list.assert_called_once_with(
+            test.IsHttpRequest(), search_opts={'all_tenants': True})
+        self.mock_flavor_list.assert_called_once_with(
+            test.IsHttpRequest(), is_public=None)
+        self.mock_tenant_quota_get.assert_has_calls([
+            mock.call(test.IsHttpRequest(), '1'),
+            mock.call(test.IsHttpRequest(), '3'),
+            mock.call(test.IsHttpRequest(), '4'),
+        ], any_order=True)
+        self.assertEqual(3, self.mock_tenant_quota_get.call_count)
+
+    @test.create_mocks({api.base: ('is_service_enabled',),
+                        cinder: ('is_volume_service_enabled',),
+                        api.neutron: ('is_router_enabled',
+                                      'is_quotas_extension_supported',
+                                      'default_quota_get',
+                                      'tenant_quota_list',
+                                      'network_list',
+                                      'router_list')})
+    def test_tenants_quota_usages_network(self):
+        self._mock_service_enabled(network_enabled=True)
+        self.mock_is_router_enabled.return_value = True
+        self.mock_is_quotas_extension_supported.return_value = True
+        self.mock_default_quota_get.return_value = self.neutron_quotas.first()
+        self.mock_tenant_quota_list.return_value = {
+            '3': api.base.QuotaSet({'network': 2, 'router': -1})}
+        self.mock_network_list.return_value = self.networks.list()
+        self.mock_router_list.return_value = self.routers.list()
+
+        quota_usages = quotas.tenants_quota_usages(
+            self.request, ['1', '3'], targets=('network', 'router'))
+
+        self.assertEqual({
+            'network': {'used': 6, 'quota': 10, 'available': 4},
+            'router': {'used': 2, 'quota': 10, 'available': 8},
+        }, quota_usages['1'].usages)
+        self.assertEqual({
+            'network': {'used': 1, 'quota': 2, 'available': 1},
+            'router': {'used': 0, 'quota': float('inf'),
+                       'available': float('inf')},
+        }, quota_usages['3'].usages)
+
+        # The Neutron quotas of all the projects are listed at once.
+        self.mock_tenant_quota_list.assert_called_once_with(
+            test.IsHttpRequest())
+        self.mock_default_quota_get.assert_called_once_with(
+            test.IsHttpRequest())
+        self.mock_network_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_router_list.assert_called_once_with(test.IsHttpRequest())
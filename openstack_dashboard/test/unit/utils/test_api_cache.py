@@ -0,0 +1,125 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+from novaclient.v2 import flavors
+
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import api_cache
+
+
+@override_settings(API_RESPONSE_CACHE_ENABLED=True)
+class ApiCacheTests(test.APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.fetch = mock.Mock(side_effect=lambda *args, **kwargs: [
+            self.fetch.call_count, args, kwargs])
+
+        @api_cache.cached(60)
+        def thing_list(request, *args, **kwargs):
+            return self.fetch(*args, **kwargs)
+
+        self.thing_list = thing_list
+
+    def test_cached(self):
+        self.assertEqual(1, self.thing_list(self.request)[0])
+        self.assertEqual(1, self.thing_list(self.request)[0])
+        self.assertEqual(2, self.thing_list(self.request, True)[0])
+        self.assertEqual(3, self.thing_list(self.request, a=[1, 2])[0])
+        self.assertEqual(3, self.thing_list(self.request, a=[1, 2])[0])
+        self.assertEqual(3, self.fetch.call_count)
+
+        stats = api_cache.get_statistics()['test_api_cache.thing_list']
+        self.assertEqual(2, stats['hits'])
+        self.assertEqual(3, stats['misses'])
+
+    def test_cached_by_token_scope(self):
+        self.thing_list(self.request)
+
+        self.request.user.project_id = 'other'
+        self.assertEqual(2, self.thing_list(self.request)[0])
+
+        self.request.user.roles = [{'name': 'admin'}]
+        self.assertEqual(3, self.thing_list(self.request)[0])
+        self.assertEqual(3, self.thing_list(self.request)[0])
+
+    def test_not_cached_for_complex_arguments(self):
+        self.thing_list(self.request, object())
+        self.thing_list(self.request, filters={'a': 1})
+        self.thing_list(self.request, filters={'a': 1})
+        self.assertEqual(3, self.fetch.call_count)
+
+    @override_settings(API_RESPONSE_CACHE_ENABLED=False)
+    def test_disabled(self):
+        self.thing_list(self.request)
+        self.thing_list(self.request)
+        self.assertEqual(2, self.fetch.call_count)
+
+    @override_settings(API_RESPONSE_CACHE_TIMEOUTS={
+        'test_api_cache.thing_list': 0})
+    def test_disabled_by_timeout(self):
+        self.thing_list(self.request)
+        self.thing_list(self.request)
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_invalidates(self):
+        @api_cache.invalidates('test_api_cache.thing_list')
+        def thing_create(request, name):
+            return name
+
+        self.thing_list(self.request)
+        self.assertEqual('foo', thing_create(self.request, 'foo'))
+        self.assertEqual(2, self.thing_list(self.request)[0])
+        self.assertEqual(2, self.thing_list(self.request)[0])
+
+        api_cache.invalidate_all()
+        self.assertEqual(3, self.thing_list(self.request)[0])
+
+    def test_cached_resources_get_their_manager_back(self):
+        manager = mock.Mock(flavors.FlavorManager)
+        manager.api = mock.Mock(api_version=None)
+        # The manager of a real client holds an HTTP session with locks.
+        manager.lock = threading.Lock()
+        info = {'id': '1', 'name': 'm1.tiny'}
+
+        @api_cache.cached(60, manager=lambda request: manager)
+        def flavor_list(request):
+            flavor = flavors.Flavor(manager, info, loaded=True)
+            flavor.extras = {'hw:cpu_policy': 'dedicated'}
+            return [flavor]
+
+        self.assertIs(manager, flavor_list(self.request)[0].manager)
+        cached_flavor = flavor_list(self.request)[0]
+        self.assertIsInstance(cached_flavor, flavors.Flavor)
+        self.assertEqual('m1.tiny', cached_flavor.name)
+        self.assertEqual({'hw:cpu_policy': 'dedicated'}, cached_flavor.extras)
+        self.assertIs(manager, cached_flavor.manager)
+        stats = api_cache.get_statistics()['test_api_cache.flavor_list']
+        self.assertEqual(1, stats['hits'])
+
+    def test_not_cached_if_not_picklable(self):
+        lock = threading.Lock()
+
+        @api_cache.cached(60)
+        def lock_get(request):
+            self.fetch()
+            return lock
+
+        self.assertIs(lock, lock_get(self.request))
+        self.assertIs(lock, lock_get(self.request))
+        self.assertEqual(2, self.fetch.call_count)
@@ -0,0 +1,176 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import threading
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import ngettext_lazy
+
+from horizon import exceptions
+from horizon import tables
+from openstack_auth import utils as auth_utils
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import batch_jobs
+
+
+class FakeDelete(tables.DeleteAction):
+    concurrency = 2
+    deleted = []
+    lock = threading.Lock()
+
+    @staticmethod
+    def action_present(count):
+        return ngettext_lazy("Delete Thing", "Delete Things", count)
+
+    @staticmethod
+    def action_past(count):
+        return ngettext_lazy("Deleted Thing", "Deleted Things", count)
+
+    def delete(self, request, obj_id):
+        if obj_id == 'bad':
+            raise Exception('boom')
+        if obj_id == 'handled':
+            raise exceptions.HandledException(
+                (Exception, Exception('handled'), None))
+        with self.lock:
+            self.deleted.append((request.user.id, obj_id))
+
+
+class BatchJobsTests(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        FakeDelete.deleted = []
+        self.request.user = auth_utils.get_user(self.request)
+        self.request.session['token'] = self.token
+        self.request.session['region_endpoint'] = 'http://localhost:5000/v3'
+        self.request.session['services_region'] = 'RegionOne'
+
+    def _enqueue(self, *obj_ids):
+        return batch_jobs.enqueue(self.request, FakeDelete(),
+                                  [(obj_id, 'name-%s' % obj_id)
+                                   for obj_id in obj_ids])
+
+    def test_enqueue_and_run(self):
+        job_id = self._enqueue('1', 'bad', 'handled', '2')
+
+        job = batch_jobs.get_job(self.request, job_id)
+        self.assertEqual(batch_jobs.QUEUED, job['status'])
+        self.assertEqual('Delete Things', job['name'])
+        self.assertEqual(4, job['total'])
+        self.assertNotIn('objects', job)
+        self.assertTrue(batch_jobs.has_jobs(self.request))
+
+        self.assertEqual(1, batch_jobs.run_pending())
+        self.assertCountEqual([(self.token.user['id'], '1'),
+                               (self.token.user['id'], '2')],
+                              FakeDelete.deleted)
+
+        job = batch_jobs.get_job(self.request, job_id)
+        self.assertEqual(batch_jobs.FINISHED, job['status'])
+        self.assertEqual(4, job['done'])
+        self.assertCountEqual(['name-1', 'name-2'], job['succeeded'])
+        self.assertCountEqual([('name-bad', 'boom'),
+                               ('name-handled', 'handled')],
+                              job['failed'])
+        # the token of the user is not kept once the job is finished
+        self.assertIsNone(cache.get(batch_jobs._auth_key(job_id)))
+
+    def test_jobs_run_once_in_order(self):
+        first = self._enqueue('1')
+        second = self._enqueue('2')
+        self.assertEqual(first, batch_jobs.claim_next())
+        self.assertEqual(second, batch_jobs.claim_next())
+        self.assertIsNone(batch_jobs.claim_next())
+        self.assertEqual(0, batch_jobs.run_pending())
+
+    def test_job_still_being_queued(self):
+        first = self._enqueue('1')
+        cache.delete(batch_jobs._slot_key(1))
+        second = self._enqueue('2')
+        self.assertEqual(second, batch_jobs.claim_next())
+
+        # the first job is claimed once its slot is written
+        cache.set(batch_jobs._slot_key(1), first)
+        self.assertEqual(first, batch_jobs.claim_next())
+        self.assertIsNone(batch_jobs.claim_next())
+
+    def test_job_never_queued(self):
+        self._enqueue('1')
+        cache.delete(batch_jobs._slot_key(1))
+        second = self._enqueue('2')
+        self.assertEqual(second, batch_jobs.claim_next())
+        self.assertEqual(1, cache.get(batch_jobs.HEAD_KEY, 1))
+
+        # the empty position is skipped once past its deadline
+        cache.set(batch_jobs._deadline_key(1), time.time() - 1)
+        self.assertIsNone(batch_jobs.claim_next())
+        self.assertEqual(3, cache.get(batch_jobs.HEAD_KEY))
+
+    def test_tail_evicted(self):
+        first = self._enqueue('1')
+        self.assertEqual(first, batch_jobs.claim_next())
+        cache.delete(batch_jobs.TAIL_KEY)
+
+        second = self._enqueue('2')
+        self.assertEqual(second, cache.get(batch_jobs._slot_key(2)))
+        self.assertEqual(second, batch_jobs.claim_next())
+
+    def test_queue_evicted(self):
+        first = self._enqueue('1')
+        self.assertEqual(first, batch_jobs.claim_next())
+        cache.delete_many([batch_jobs.HEAD_KEY, batch_jobs.TAIL_KEY])
+
+        # the position of the first job is taken again by a new job
+        second = self._enqueue('2')
+        self.assertEqual(second, cache.get(batch_jobs._slot_key(1)))
+        self.assertEqual(second, batch_jobs.claim_next())
+
+    def test_token_kept_until_expiry(self):
+        self.token.expires = timezone.now() + datetime.timedelta(hours=1)
+        self.assertAlmostEqual(3600, batch_jobs._auth_timeout(self.request),
+                               delta=5)
+
+        self.token.expires = timezone.now() + datetime.timedelta(days=7)
+        self.assertEqual(86400, batch_jobs._auth_timeout(self.request))
+
+    def test_finished_jobs_reported_once(self):
+        job_id = self._enqueue('1')
+        jobs = batch_jobs.get_jobs(self.request)
+        self.assertEqual([job_id], [job['id'] for job in jobs])
+        self.assertEqual(batch_jobs.QUEUED, jobs[0]['status'])
+
+        batch_jobs.run_pending()
+        jobs = batch_jobs.get_jobs(self.request)
+        self.assertEqual(batch_jobs.FINISHED, jobs[0]['status'])
+        self.assertEqual([], batch_jobs.get_jobs(self.request))
+        self.assertFalse(batch_jobs.has_jobs(self.request))
+
+    def test_job_of_other_user(self):
+        job_id = self._enqueue('1')
+        self.request.user.id = 'other'
+        self.assertIsNone(batch_jobs.get_job(self.request, job_id))
+        self.assertEqual([], batch_jobs.get_jobs(self.request))
+
+    def test_job_without_token(self):
+        job_id = self._enqueue('1', '2')
+        cache.delete(batch_jobs._auth_key(job_id))
+
+        batch_jobs.run_pending()
+        job = batch_jobs.get_job(self.request, job_id)
+        self.assertEqual(batch_jobs.FINISHED, job['status'])
+        self.assertEqual(2, len(job['failed']))
+        self.assertEqual([], FakeDelete.deleted)
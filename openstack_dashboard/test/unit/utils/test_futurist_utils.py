@@ -10,7 +10,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 import unittest
+from unittest import mock
+
+from django.test.utils import override_settings
 
 from openstack_dashboard.utils import futurist_utils
 
@@ -58,3 +62,112 @@ class FuturistUtilsTests(unittest.TestCase):
             (func2, [], {'a': 10, 'b': 20}),
             func3)
         self.assertEqual(ret, (5, 30, 3))
+
+    def test_call_functions_parallel_with_timeout(self):
+        event = threading.Event()
+
+        def func1():
+            return 10
+
+        def func2():
+            event.wait(5)
+            return 20
+
+        try:
+            ret = futurist_utils.call_functions_parallel(
+                func1, func2, timeout=0.1)
+        finally:
+            event.set()
+        self.assertEqual(ret, (10, None))
+
+    @override_settings(API_PARALLEL_MAX_WORKERS=1)
+    @mock.patch.object(futurist_utils, '_executor', None)
+    def test_call_functions_parallel_with_timeout_cancelled(self):
+        started = threading.Event()
+        event = threading.Event()
+        called = []
+
+        def func1():
+            started.set()
+            event.wait(5)
+            return 10
+
+        def func2():
+            called.append(True)
+            return 20
+
+        executor = futurist_utils.get_executor()
+        try:
+            ret = futurist_utils.call_functions_parallel(
+                func1, func2, timeout=0.1)
+        finally:
+            event.set()
+            executor.shutdown()
+        # func2 was still waiting for the only thread and is skipped
+        # instead of running once the caller gave up.
+        self.assertTrue(started.is_set())
+        self.assertEqual(ret, (None, None))
+        self.assertEqual([], called)
+
+    def test_call_functions_parallel_with_timeout_all_complete(self):
+        def func1():
+            return 10
+
+        def func2():
+            return 20
+
+        ret = futurist_utils.call_functions_parallel(
+            func1, func2, timeout=5)
+        self.assertEqual(ret, (10, 20))
+
+    def test_call_functions_parallel_shares_executor(self):
+        futurist_utils.call_functions_parallel(lambda: 1)
+        executor = futurist_utils.get_executor()
+        futurist_utils.call_functions_parallel(lambda: 2)
+        self.assertIs(executor, futurist_utils.get_executor())
+        self.assertTrue(executor.alive)
+
+    def test_call_functions_parallel_nested(self):
+        def inner():
+            return threading.current_thread()
+
+        def outer():
+            return (threading.current_thread(),
+                    futurist_utils.call_functions_parallel(inner)[0])
+
+        before = futurist_utils.get_statistics()
+        outer_thread, inner_thread = \
+            futurist_utils.call_functions_parallel(outer)[0]
+        after = futurist_utils.get_statistics()
+        # The nested call runs in the pool thread instead of waiting
+        # for another pool thread.
+        self.assertIs(outer_thread, inner_thread)
+        self.assertEqual(before['inline'] + 1, after['inline'])
+
+    @override_settings(API_PARALLEL_MAX_WORKERS=1, API_PARALLEL_MAX_BACKLOG=1)
+    @mock.patch.object(futurist_utils, '_executor', None)
+    def test_call_functions_parallel_saturated(self):
+        started = threading.Event()
+        event = threading.Event()
+
+        def block():
+            started.set()
+            event.wait(5)
+
+        executor = futurist_utils.get_executor()
+        try:
+            # Occupy the only thread, then fill the backlog.
+            executor.submit(block)
+            started.wait(5)
+            executor.submit(event.wait, 5)
+            before = futurist_utils.get_statistics()
+            ret = futurist_utils.call_functions_parallel(
+                threading.current_thread)
+            after = futurist_utils.get_statistics()
+        finally:
+            event.set()
+            executor.shutdown()
+        self.assertEqual((threading.current_thread(),), ret)
+        self.assertEqual(before['rejected'] + 1, after['rejected'])
+        self.assertEqual(1, after['max_workers'])
+        self.assertEqual(1, after['queued'])
@@ -0,0 +1,103 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from openstack_dashboard import api
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import project_names
+
+
+@override_settings(PROJECT_NAMES_CACHE_TIMEOUT=300)
+class ProjectNamesTests(test.APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.names = {tenant.id: tenant.name for tenant in self.tenants.list()}
+
+    @test.create_mocks({api.keystone: ('tenant_get', 'tenant_list')})
+    def test_get_names(self):
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
+
+        names = project_names.get_names(self.request,
+                                        ['1', '3', '1', None, 'deleted'])
+
+        self.assertEqual({'1': self.names['1'], '3': self.names['3']}, names)
+        self.assertEqual(3, self.mock_tenant_get.call_count)
+        self.mock_tenant_get.assert_has_calls(
+            [mock.call(test.IsHttpRequest(), tenant_id, admin=True)
+             for tenant_id in ('1', '3', 'deleted')], any_order=True)
+        self.mock_tenant_list.assert_not_called()
+
+    @test.create_mocks({api.keystone: ('tenant_get',)})
+    def test_get_names_cached(self):
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
+
+        project_names.get_names(self.request, ['1', 'deleted'])
+        names = project_names.get_names(self.request, ['1', '2', 'deleted'])
+
+        self.assertEqual({'1': self.names['1'], '2': self.names['2']}, names)
+        # Only the name missing from the cache is looked up again.
+        self.assertEqual(3, self.mock_tenant_get.call_count)
+        self.mock_tenant_get.assert_called_with(
+            test.IsHttpRequest(), '2', admin=True)
+
+    @test.create_mocks({api.keystone: ('tenant_get',)})
+    def test_get_names_cached_by_token(self):
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
+
+        project_names.get_names(self.request, ['1'])
+        self.request.user.token.id = 'other'
+        project_names.get_names(self.request, ['1'])
+
+        self.assertEqual(2, self.mock_tenant_get.call_count)
+
+    @override_settings(PROJECT_NAMES_CACHE_TIMEOUT=0)
+    @test.create_mocks({api.keystone: ('tenant_get',)})
+    def test_get_names_not_cached(self):
+        self.mock_tenant_get.side_effect = self.tenant_get_side_effect(
+            self.tenants.list())
+
+        project_names.get_names(self.request, ['1'])
+        project_names.get_names(self.request, ['1'])
+
+        self.assertEqual(2, self.mock_tenant_get.call_count)
+
+    @mock.patch.object(project_names, 'LIST_THRESHOLD', 1)
+    @test.create_mocks({api.keystone: ('tenant_get', 'tenant_list')})
+    def test_get_names_listed(self):
+        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+
+        names = project_names.get_names(self.request, ['1', 'deleted'])
+
+        self.assertEqual({'1': self.names['1']}, names)
+        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_tenant_get.assert_not_called()
+
+        # All the listed projects are cached.
+        names = project_names.get_names(self.request, ['2', '3', 'deleted'])
+        self.assertEqual({'2': self.names['2'], '3': self.names['3']}, names)
+        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+
+    @test.create_mocks({api.keystone: ('tenant_get',)})
+    def test_get_names_error(self):
+        self.mock_tenant_get.side_effect = self.exceptions.keystone
+
+        self.assertRaises(self.exceptions.keystone.__class__,
+                          project_names.get_names, self.request, ['1'])
@@ -0,0 +1,115 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+from openstack_auth import user
+
+from openstack_dashboard import api
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import quota_cache
+
+
+@override_settings(QUOTA_LIMITS_CACHE_TIMEOUT=30)
+class QuotaCacheTests(test.APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.fetch = mock.Mock(side_effect=lambda: self.fetch.call_count)
+
+    def test_get_cached(self):
+        self.assertEqual(1, quota_cache.get('tenant-a', 'compute', self.fetch))
+        self.assertEqual(1, quota_cache.get('tenant-a', 'compute', self.fetch))
+        self.assertEqual(2, quota_cache.get('tenant-b', 'compute', self.fetch))
+        self.assertEqual(3, quota_cache.get('tenant-a', 'volume', self.fetch))
+
+    def test_invalidate(self):
+        quota_cache.get('tenant-a', 'compute', self.fetch)
+        quota_cache.get('tenant-b', 'compute', self.fetch)
+
+        quota_cache.invalidate('tenant-a')
+
+        self.assertEqual(3, quota_cache.get('tenant-a', 'compute', self.fetch))
+        self.assertEqual(2, quota_cache.get('tenant-b', 'compute', self.fetch))
+
+    def test_invalidate_all(self):
+        quota_cache.get('tenant-a', 'compute', self.fetch)
+        quota_cache.get('tenant-b', 'compute', self.fetch)
+
+        quota_cache.invalidate_all()
+
+        self.assertEqual(3, quota_cache.get('tenant-a', 'compute', self.fetch))
+        self.assertEqual(4, quota_cache.get('tenant-b', 'compute', self.fetch))
+
+    @override_settings(QUOTA_LIMITS_CACHE_TIMEOUT=0)
+    def test_get_disabled(self):
+        self.assertEqual(1, quota_cache.get('tenant-a', 'compute', self.fetch))
+        self.assertEqual(2, quota_cache.get('tenant-a', 'compute', self.fetch))
+
+    def test_invalidates(self):
+        @quota_cache.invalidates
+        def create(request, name, tenant_id=None):
+            return name
+
+        tenant_id = self.request.user.tenant_id
+        quota_cache.get(tenant_id, 'compute', self.fetch)
+        quota_cache.get('other', 'compute', self.fetch)
+
+        self.assertEqual('foo', create(self.request, 'foo'))
+        self.assertEqual(3, quota_cache.get(tenant_id, 'compute', self.fetch))
+        self.assertEqual(2, quota_cache.get('other', 'compute', self.fetch))
+
+        create(self.request, 'bar', tenant_id='other')
+        self.assertEqual(3, quota_cache.get(tenant_id, 'compute', self.fetch))
+        self.assertEqual(4, quota_cache.get('other', 'compute', self.fetch))
+
+    def test_invalidates_owner_of_result(self):
+        port = api.neutron.Port({'id': 'port-1', 'tenant_id': 'other'})
+
+        @quota_cache.invalidates
+        def create(request):
+            return port
+
+        tenant_id = self.request.user.tenant_id
+        quota_cache.get(tenant_id, 'compute', self.fetch)
+        quota_cache.get('other', 'compute', self.fetch)
+
+        create(self.request)
+        self.assertEqual(1, quota_cache.get(tenant_id, 'compute', self.fetch))
+        self.assertEqual(3, quota_cache.get('other', 'compute', self.fetch))
+
+    def test_invalidates_owner(self):
+        @quota_cache.invalidates_owner
+        def delete(request, resource_id):
+            pass
+
+        tenant_id = self.request.user.tenant_id
+        quota_cache.get(tenant_id, 'compute', self.fetch)
+        quota_cache.get('other', 'compute', self.fetch)
+
+        with mock.patch.object(user.User, 'is_superuser',
+                               new_callable=mock.PropertyMock,
+                               return_value=False):
+            delete(self.request, 'resource-1')
+        self.assertEqual(3, quota_cache.get(tenant_id, 'compute', self.fetch))
+        self.assertEqual(2, quota_cache.get('other', 'compute', self.fetch))
+
+        # The resource deleted by an admin may belong to any project.
+        with mock.patch.object(user.User, 'is_superuser',
+                               new_callable=mock.PropertyMock,
+                               return_value=True):
+            delete(self.request, 'resource-1')
+        self.assertEqual(4, quota_cache.get(tenant_id, 'compute', self.fetch))
+        self.assertEqual(5, quota_cache.get('other', 'compute', self.fetch))
@@ -0,0 +1,138 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from openstack_dashboard import api
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import usage_cache
+
+
+@override_settings(USAGE_CACHE_TIMEOUT=60)
+class UsageCacheTests(test.APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.fetch = mock.Mock(side_effect=lambda *args: [
+            api.nova.NovaUsage(u) for u in self.usages.list()])
+
+        @usage_cache.cached(api.nova.NovaUsage)
+        def thing_usage(request, *args):
+            return self.fetch(*args)
+
+        self.thing_usage = thing_usage
+        now = datetime.datetime.now(datetime.timezone.utc).replace(
+            tzinfo=None)
+        self.start = datetime.datetime(2020, 1, 1)
+        self.closed_end = datetime.datetime(2020, 1, 31, 23, 59, 59)
+        self.open_end = now - datetime.timedelta(minutes=1)
+
+    def test_closed_period_cached(self):
+        usages = self.thing_usage(self.request, self.start, self.closed_end)
+        cached = self.thing_usage(self.request, self.start, self.closed_end)
+
+        self.assertEqual(1, self.fetch.call_count)
+        self.assertEqual([u.tenant_id for u in usages],
+                         [u.tenant_id for u in cached])
+        self.assertIsInstance(cached[0], api.nova.NovaUsage)
+        self.assertEqual(usages[0].get_summary(), cached[0].get_summary())
+
+        self.thing_usage(self.request, self.start,
+                         self.closed_end - datetime.timedelta(days=1))
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_open_period_not_cached(self):
+        self.thing_usage(self.request, self.start, self.open_end)
+        self.thing_usage(self.request, self.start, self.open_end)
+        self.assertEqual(2, self.fetch.call_count)
+
+    @override_settings(USAGE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.thing_usage(self.request, self.start, self.closed_end)
+        self.thing_usage(self.request, self.start, self.closed_end)
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_single_usage_stored(self):
+        usage = api.nova.NovaUsage(self.usages.first())
+        usage_cache.store(self.request, 'test_usage_cache.thing_usage',
+                          (usage.tenant_id, self.start, self.closed_end),
+                          usage)
+
+        cached = self.thing_usage(self.request, usage.tenant_id, self.start,
+                                  self.closed_end)
+
+        self.fetch.assert_not_called()
+        self.assertEqual(usage.tenant_id, cached.tenant_id)
+        self.assertEqual(usage.get_summary(), cached.get_summary())
+
+    def test_uptime_of_running_servers(self):
+        with mock.patch('time.time', return_value=1000):
+            usages = self.thing_usage(self.request, self.start,
+                                      self.closed_end)
+        with mock.patch('time.time', return_value=1030):
+            cached = self.thing_usage(self.request, self.start,
+                                      self.closed_end)
+
+        for usage, cached_usage in zip(usages, cached):
+            for server, cached_server in zip(usage.server_usages,
+                                             cached_usage.server_usages):
+                elapsed = 0 if server['ended_at'] else 30
+                self.assertEqual(server['uptime'] + elapsed,
+                                 cached_server['uptime'])
+
+    def test_get(self):
+        self.assertIsNone(usage_cache.get(
+            self.request, 'test_usage_cache.thing_usage',
+            (self.start, self.closed_end), api.nova.NovaUsage))
+
+        usages = self.thing_usage(self.request, self.start, self.closed_end)
+        cached = usage_cache.get(self.request, 'test_usage_cache.thing_usage',
+                                 (self.start, self.closed_end),
+                                 api.nova.NovaUsage)
+
+        self.assertEqual([u.tenant_id for u in usages],
+                         [u.tenant_id for u in cached])
+        self.assertEqual(1, self.fetch.call_count)
+
+    @mock.patch.object(usage_cache, 'CHUNK_SIZE', 100)
+    def test_stored_in_chunks(self):
+        usages = self.thing_usage(self.request, self.start, self.closed_end)
+        cached = self.thing_usage(self.request, self.start, self.closed_end)
+
+        self.assertEqual(1, self.fetch.call_count)
+        self.assertTrue(usage_cache.is_stored(
+            self.request, 'test_usage_cache.thing_usage',
+            (self.start, self.closed_end)))
+        self.assertEqual([u.get_summary() for u in usages],
+                         [u.get_summary() for u in cached])
+
+    @mock.patch.object(usage_cache, 'CHUNK_SIZE', 100)
+    def test_missing_chunk(self):
+        self.thing_usage(self.request, self.start, self.closed_end)
+        key = usage_cache._get_key(self.request,
+                                   'test_usage_cache.thing_usage',
+                                   (self.start, self.closed_end))
+        entry = cache.get(key)
+        self.assertGreater(entry['chunks'], 1)
+        # e.g. a chunk evicted or refused by the cache.
+        cache.delete(usage_cache._get_chunk_keys(key, entry)[-1])
+
+        self.assertFalse(usage_cache.is_stored(
+            self.request, 'test_usage_cache.thing_usage',
+            (self.start, self.closed_end)))
+        self.thing_usage(self.request, self.start, self.closed_end)
+        self.assertEqual(2, self.fetch.call_count)
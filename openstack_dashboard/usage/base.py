@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import datetime
 
 from django.conf import settings
@@ -151,11 +152,42 @@ class BaseUsage(object):
                                                 data['end'])
 
 
+class UsageTotals(object):
+    """The usage of a project, without the usage of its servers."""
+
+    keys = ('instances', 'memory_mb', 'vcpus', 'vcpu_hours', 'local_gb',
+            'disk_gb_hours', 'memory_mb_hours')
+
+    def __init__(self, tenant_id):
+        self.tenant_id = tenant_id
+        for key in self.keys:
+            setattr(self, key, 0)
+
+    def add(self, usage):
+        for key, value in usage.get_summary().items():
+            setattr(self, key, getattr(self, key) + value)
+
+    def get_summary(self):
+        return {key: getattr(self, key) for key in self.keys}
+
+
 class GlobalUsage(BaseUsage):
     show_deleted = True
 
     def get_usage_list(self, start, end):
-        return api.nova.usage_list(self.request, start, end)
+        if self.request.GET.get('format', 'html') != 'csv':
+            return api.nova.usage_list(self.request, start, end)
+        # The CSV export only shows the usage of each project, so the usage
+        # of the servers is summed one Nova page at a time instead of being
+        # kept for all the servers of the period.
+        totals = collections.OrderedDict()
+        for page in api.nova.usage_list_pages(self.request, start, end):
+            for project_usage in page:
+                tenant_id = project_usage.tenant_id
+                if tenant_id not in totals:
+                    totals[tenant_id] = UsageTotals(tenant_id)
+                totals[tenant_id].add(project_usage)
+        return list(totals.values())
 
 
 class ProjectUsage(BaseUsage):
@@ -11,9 +11,11 @@
 # under the License.
 
 from collections import defaultdict
+import functools
 import itertools
 import logging
 
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
 from horizon import exceptions
@@ -25,6 +27,7 @@ from openstack_dashboard.api import neutron
 from openstack_dashboard.api import nova
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import quota_cache
 
 
 LOG = logging.getLogger(__name__)
@@ -90,6 +93,19 @@ NEUTRON_QUOTA_FIELDS = {"network",
 
 QUOTA_FIELDS = NOVA_QUOTA_FIELDS | CINDER_QUOTA_FIELDS | NEUTRON_QUOTA_FIELDS
 
+# Quotas whose usage can be counted from the project-wide list APIs.
+ALL_TENANTS_USAGE_FIELDS = {"instances",
+                            "cores",
+                            "ram",
+                            "volumes",
+                            "snapshots",
+                            "gigabytes",
+                            "network",
+                            "floatingip",
+                            "router",
+                            "security_group",
+                            }
+
 QUOTA_NAMES = {
     # nova
     "metadata_items": _('Metadata Items'),
@@ -301,6 +317,36 @@ def get_disabled_quotas(request, targets=None):
     return disabled_quotas
 
 
+def get_compute_limits(request, reserved=False, tenant_id=None):
+    """Cached nova.tenant_absolute_limits()."""
+    tenant_id = tenant_id or request.user.tenant_id
+    name = 'compute-reserved' if reserved else 'compute'
+    return quota_cache.get(tenant_id, name, functools.partial(
+        nova.tenant_absolute_limits, request, reserved=reserved,
+        tenant_id=tenant_id))
+
+
+def get_volume_limits(request, tenant_id=None):
+    """Cached cinder.tenant_absolute_limits()."""
+    tenant_id = tenant_id or request.user.tenant_id
+    return quota_cache.get(tenant_id, 'volume', functools.partial(
+        cinder.tenant_absolute_limits, request, tenant_id))
+
+
+def get_network_quotas(request, tenant_id=None):
+    """Cached neutron.tenant_quota_get()."""
+    tenant_id = tenant_id or request.user.tenant_id
+    return quota_cache.get(tenant_id, 'network', functools.partial(
+        neutron.tenant_quota_get, request, tenant_id))
+
+
+def get_network_quota_details(request, tenant_id=None):
+    """Cached neutron.tenant_quota_detail_get()."""
+    tenant_id = tenant_id or request.user.tenant_id
+    return quota_cache.get(tenant_id, 'network-detail', functools.partial(
+        neutron.tenant_quota_detail_get, request, tenant_id))
+
+
 def _add_limit_and_usage(usages, name, limit, usage, disabled_quotas):
     if name not in disabled_quotas:
         usages.add_quota(base.Quota(name, limit))
@@ -326,8 +372,8 @@ def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
         return
 
     try:
-        limits = nova.tenant_absolute_limits(request, reserved=True,
-                                             tenant_id=tenant_id)
+        limits = get_compute_limits(request, reserved=True,
+                                    tenant_id=tenant_id)
     except nova.nova_exceptions.ClientException:
         msg = _("Unable to retrieve compute limit information.")
         exceptions.handle(request, msg)
@@ -349,7 +395,7 @@ def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
     if not enabled_quotas:
         return
 
-    details = neutron.tenant_quota_detail_get(request, tenant_id)
+    details = get_network_quota_details(request, tenant_id)
     for quota_name in NEUTRON_QUOTA_FIELDS:
         if quota_name in disabled_quotas:
             continue
@@ -365,7 +411,7 @@ def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
         return
 
     try:
-        limits = cinder.tenant_absolute_limits(request, tenant_id)
+        limits = get_volume_limits(request, tenant_id)
     except cinder.cinder_exception.ClientException:
         msg = _("Unable to retrieve volume limit information.")
         exceptions.handle(request, msg)
@@ -404,6 +450,143 @@ def tenant_quota_usages(request, tenant_id=None, targets=None):
     return usages
 
 
+def _server_flavor_usage(server, flavors):
+    flavor = flavors.get(str(server.flavor.get('id')))
+    if flavor is not None:
+        return flavor.vcpus, flavor.ram
+    # Nova API >= 2.47 embeds the flavor details instead of its id.
+    return server.flavor.get('vcpus', 0), server.flavor.get('ram', 0)
+
+
+@profiler.trace
+def _get_all_tenants_compute_usages(request, usages, disabled_quotas):
+    if not (NOVA_COMPUTE_QUOTA_FIELDS - disabled_quotas):
+        return
+    servers, has_more = nova.server_list(
+        request, search_opts={'all_tenants': True})
+    flavors = dict((str(flavor.id), flavor)
+                   for flavor in nova.flavor_list(request, is_public=None))
+    for server in servers:
+        usage = usages.get(server.tenant_id)
+        if usage is None:
+            continue
+        vcpus, ram = _server_flavor_usage(server, flavors)
+        for name, value in (('instances', 1), ('cores', vcpus),
+                            ('ram', ram)):
+            if name not in disabled_quotas:
+                usage.tally(name, value)
+
+
+@profiler.trace
+def _get_all_tenants_volume_usages(request, usages, disabled_quotas):
+    if not (CINDER_QUOTA_FIELDS - disabled_quotas):
+        return
+    search_opts = {'all_tenants': True}
+    volumes = cinder.volume_list(request, search_opts=search_opts)
+    snapshots = cinder.volume_snapshot_list(request, search_opts=search_opts)
+    for name, items in (('volumes', [(v.tenant_id, v) for v in volumes]),
+                        ('snapshots',
+                         [(s.project_id, s) for s in snapshots])):
+        for tenant_id, item in items:
+            usage = usages.get(tenant_id)
+            if usage is None:
+                continue
+            if name not in disabled_quotas:
+                usage.tally(name, 1)
+            if 'gigabytes' not in disabled_quotas:
+                usage.tally('gigabytes', item.size)
+
+
+@profiler.trace
+def _get_all_tenants_network_usages(request, usages, disabled_quotas):
+    listers = {
+        'network': lambda: neutron.network_list(request),
+        'floatingip': lambda: neutron.tenant_floating_ip_list(
+            request, all_tenants=True),
+        'router': lambda: neutron.router_list(request),
+        'security_group': lambda: neutron.security_group_list(
+            request, tenant_id=None),
+    }
+    for name, lister in listers.items():
+        if name in disabled_quotas:
+            continue
+        for item in lister():
+            usage = usages.get(item.tenant_id)
+            if usage is not None:
+                usage.tally(name, 1)
+
+
+def _get_tenant_limits(request, usages, disabled_quotas, tenant_ids):
+    for tenant_id in tenant_ids:
+        try:
+            quotas = get_tenant_quota_data(
+                request, disabled_quotas=set(disabled_quotas),
+                tenant_id=tenant_id)
+        except Exception:
+            LOG.exception("Unable to retrieve the quotas of project %s.",
+                          tenant_id)
+            continue
+        for quota in quotas:
+            usages[tenant_id].add_quota(quota)
+
+
+@profiler.trace
+def _get_all_tenants_network_limits(request, usages, disabled_quotas):
+    enabled = NEUTRON_QUOTA_FIELDS - disabled_quotas
+    if not enabled:
+        return
+    # Neutron lists the quotas of all the projects at once, except for
+    # the projects which have the default quotas.
+    default = neutron.default_quota_get(request)
+    quotasets = neutron.tenant_quota_list(request)
+    for tenant_id, usage in usages.items():
+        for quota in quotasets.get(tenant_id, default):
+            if quota.name in enabled:
+                usage.add_quota(quota)
+
+
+@profiler.trace
+def tenants_quota_usages(request, tenant_ids, targets=None):
+    """Get the quota usage of many projects at once.
+
+    Unlike calling tenant_quota_usages() for each project, the usage is
+    counted from the project-wide list APIs (all_tenants=True) grouped
+    by project in memory, and the Neutron quotas of all the projects are
+    listed at once, so that the number of these API calls does not grow
+    with the number of projects. Only the Nova and Cinder quotas are
+    retrieved per project, in as many chunks as there are threads in the
+    shared API thread pool.
+
+    :param tenant_ids: IDs of the projects to be retrieved.
+    :param targets: A tuple of quota names to be retrieved, among
+        ALL_TENANTS_USAGE_FIELDS. If unspecified, all of them are retrieved.
+    :returns: a dict mapping each project ID to its QuotaUsage.
+    """
+    disabled_quotas = get_disabled_quotas(
+        request, set(targets or ALL_TENANTS_USAGE_FIELDS) &
+        ALL_TENANTS_USAGE_FIELDS)
+    usages = dict((tenant_id, QuotaUsage()) for tenant_id in tenant_ids)
+
+    tenant_ids = list(usages)
+    count = max(min(len(tenant_ids), settings.API_PARALLEL_MAX_WORKERS), 1)
+    futurist_utils.call_functions_parallel(
+        *[(_get_tenant_limits, [request, usages,
+                                disabled_quotas | NEUTRON_QUOTA_FIELDS,
+                                tenant_ids[i::count]])
+          for i in range(count)],
+        *[(fn, [request, usages, disabled_quotas])
+          for fn in (_get_all_tenants_network_limits,
+                     _get_all_tenants_compute_usages,
+                     _get_all_tenants_volume_usages,
+                     _get_all_tenants_network_usages)])
+
+    # Quotas without any resource in use have not been tallied yet.
+    for usage in usages.values():
+        for name in QUOTA_FIELDS - disabled_quotas:
+            usage.tally(name, 0)
+    return usages
+
+
 def enabled_quotas(request):
     """Returns the list of quotas available minus those that are disabled"""
     return QUOTA_FIELDS - get_disabled_quotas(request)
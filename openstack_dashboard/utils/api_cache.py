@@ -0,0 +1,197 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cross-request cache of near-static API responses.
+
+``horizon.utils.memoized`` caches API calls for the lifetime of a request
+only. The API functions decorated with :func:`cached` additionally keep
+their responses in the Django cache, where they are shared by the requests
+made with the same token scope: the same identity endpoint and region,
+the same project or domain and the same roles.
+
+Cached responses are versioned by a global and a per-function generation
+number, so that the API functions which change the cached data invalidate
+them with :func:`invalidates` without having to know their keys.
+"""
+
+import collections
+import functools
+import hashlib
+import logging
+import pickle
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+LOG = logging.getLogger(__name__)
+
+KEY_PREFIX = 'api-response'
+GLOBAL_GENERATION_KEY = KEY_PREFIX + ':generation'
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+
+_counters = collections.defaultdict(collections.Counter)
+_counters_lock = threading.Lock()
+
+
+def _count(name, event):
+    with _counters_lock:
+        _counters[name][event] += 1
+
+
+def _generation_key(name):
+    return '%s:%s:generation' % (KEY_PREFIX, name)
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def _is_simple(value):
+    if isinstance(value, (tuple, list, frozenset)):
+        return all(_is_simple(item) for item in value)
+    return isinstance(value, _SIMPLE_TYPES)
+
+
+# A resource of the python-*client libraries as it is cached. The resources
+# keep a reference to their manager and through it to the HTTP session,
+# which cannot be pickled, so they are cached as their class, the info
+# returned by the API and the attributes Horizon added to them.
+_Resource = collections.namedtuple('_Resource', ['cls', 'info', 'extra'])
+
+
+def _dump(value):
+    if type(value) in (list, tuple):
+        return type(value)(_dump(item) for item in value)
+    if hasattr(value, '_info') and hasattr(value, 'manager'):
+        cls = type(value)
+        attrs = vars(cls(None, value._info, loaded=True))
+        extra = {name: attr for name, attr in vars(value).items()
+                 if name not in attrs}
+        return _Resource(cls, value._info, extra)
+    return value
+
+
+def _load(value, manager):
+    if type(value) in (list, tuple):
+        return type(value)(_load(item, manager) for item in value)
+    if isinstance(value, _Resource):
+        resource = value.cls(manager, value.info, loaded=True)
+        for name, attr in value.extra.items():
+            setattr(resource, name, attr)
+        return resource
+    return value
+
+
+def get_timeout(name, default):
+    """Return the number of seconds the responses of a function are kept.
+
+    API_RESPONSE_CACHE_TIMEOUTS overrides the default timeout of each
+    function by its name, such as ``nova.flavor_list``.
+    """
+    if not settings.API_RESPONSE_CACHE_ENABLED:
+        return 0
+    return settings.API_RESPONSE_CACHE_TIMEOUTS.get(name, default)
+
+
+def _get_key(request, name, args, kwargs):
+    user = request.user
+    # The identity endpoint and the region identify the service endpoints
+    # of the token, and the project or domain and the roles its scope.
+    scope = (user.endpoint, user.services_region, user.project_id,
+             user.domain_id, user.system_scoped,
+             sorted(role['name'] for role in user.roles),
+             args, sorted(kwargs.items()))
+    generation_key = _generation_key(name)
+    generations = cache.get_many([GLOBAL_GENERATION_KEY, generation_key])
+    return '%s:%s:%s:%s:%s' % (
+        KEY_PREFIX, name,
+        generations.get(GLOBAL_GENERATION_KEY, 0),
+        generations.get(generation_key, 0),
+        hashlib.sha256(repr(scope).encode('utf-8')).hexdigest())
+
+
+def cached(timeout, manager=None):
+    """Decorate an API function whose response rarely changes.
+
+    The response is cached for the token scope of the request and the
+    arguments of the call. Calls with arguments other than strings,
+    numbers, booleans, None and sequences of those are not cached.
+
+    :param timeout: the default number of seconds the responses are kept.
+    :param manager: (optional) a callable which returns the client manager
+        of the returned resources for a request. The resources are cached
+        without their manager and rebuilt with it on a cache hit.
+    """
+    def decorate(func):
+        name = '%s.%s' % (func.__module__.rsplit('.', 1)[-1], func.__name__)
+
+        @functools.wraps(func)
+        def wrapped(request, *args, **kwargs):
+            seconds = get_timeout(name, timeout)
+            if (not seconds or not _is_simple(args) or
+                    not _is_simple(tuple(kwargs.values()))):
+                return func(request, *args, **kwargs)
+            key = _get_key(request, name, args, kwargs)
+            value = cache.get(key)
+            if value is not None:
+                _count(name, 'hits')
+                return _load(value, manager and manager(request))
+            _count(name, 'misses')
+            value = func(request, *args, **kwargs)
+            try:
+                cache.set(key, _dump(value), seconds)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                LOG.warning('The response of %s cannot be cached: %s',
+                            name, e)
+            return value
+        return wrapped
+    return decorate
+
+
+def invalidate(*names):
+    """Invalidate the cached responses of the given API functions."""
+    if settings.API_RESPONSE_CACHE_ENABLED:
+        for name in names:
+            _bump(_generation_key(name))
+
+
+def invalidate_all():
+    """Invalidate the cached responses of all API functions."""
+    if settings.API_RESPONSE_CACHE_ENABLED:
+        _bump(GLOBAL_GENERATION_KEY)
+
+
+def invalidates(*names):
+    """Decorate an API function which changes the given cached responses.
+
+    After the function succeeds the responses cached for the API
+    functions with the given names are invalidated.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            result = func(*args, **kwargs)
+            invalidate(*names)
+            return result
+        return wrapped
+    return decorate
+
+
+def get_statistics():
+    """Return the cache hits and misses of this process by function name."""
+    with _counters_lock:
+        return {name: {'hits': counter['hits'], 'misses': counter['misses']}
+                for name, counter in _counters.items()}
@@ -0,0 +1,323 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Background jobs taking batch actions on many table objects.
+
+A batch action with a ``background_threshold`` hands the objects selected
+by the user to :func:`enqueue` when ``BATCH_ACTION_JOB_QUEUE`` points to
+it. The job is kept in the Django cache with the token of the user and is
+run by the ``run_batch_jobs`` management command, which must have access
+to the same cache as the web server processes (e.g. memcached). The token
+is kept until it expires, at most ``BATCH_JOB_TIMEOUT`` seconds, so anyone
+able to read the cache can act as the user in the meantime.
+
+The jobs queued by a user are remembered in their session and their
+progress is reported by the ``batch_jobs/`` REST API until they finish.
+"""
+
+import datetime
+import logging
+import os
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.messages.storage import default_storage
+from django.core.cache import cache
+from django import http
+from django.utils.module_loading import import_string
+from django.utils import timezone
+from django.utils import translation
+import futurist
+from futurist import waiters
+
+from horizon import exceptions
+from openstack_auth import user as auth_user
+
+LOG = logging.getLogger(__name__)
+
+KEY_PREFIX = 'batch-jobs'
+HEAD_KEY = KEY_PREFIX + ':head'
+TAIL_KEY = KEY_PREFIX + ':tail'
+SESSION_KEY = 'batch_jobs'
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+
+# How often the progress of a running job is saved, in seconds.
+PROGRESS_INTERVAL = 1
+
+# How long a position of the queue may stay empty, in seconds, before the
+# workers give up on it. enqueue() fills a position right after taking it,
+# so it only stays empty if the web server process died in between or if
+# the cache evicted the job.
+SLOT_DEADLINE = 60
+
+
+def _job_key(job_id):
+    return '%s:job:%s' % (KEY_PREFIX, job_id)
+
+
+def _auth_key(job_id):
+    return '%s:auth:%s' % (KEY_PREFIX, job_id)
+
+
+def _slot_key(position):
+    return '%s:slot:%s' % (KEY_PREFIX, position)
+
+
+def _deadline_key(position):
+    return '%s:deadline:%s' % (KEY_PREFIX, position)
+
+
+def _claim_key(job_id):
+    return '%s:claim:%s' % (KEY_PREFIX, job_id)
+
+
+def _save(job):
+    cache.set(_job_key(job['id']), job, settings.BATCH_JOB_TIMEOUT)
+
+
+def _auth_timeout(request):
+    # The token is not kept in the shared cache beyond its expiry, after
+    # which the job could not use it anyway.
+    expires = request.user.token.expires
+    if expires is None:
+        return settings.BATCH_JOB_TIMEOUT
+    if timezone.is_naive(expires):
+        expires = timezone.make_aware(expires, datetime.timezone.utc)
+    return min(settings.BATCH_JOB_TIMEOUT,
+               int((expires - timezone.now()).total_seconds()))
+
+
+def enqueue(request, action, objects):
+    """Queue a job taking a batch action on objects.
+
+    :param request: the request of the user taking the action.
+    :param action: the ``BatchAction`` to take. It is created again by the
+        worker without its table.
+    :param objects: a list of (object id, object display name) tuples.
+    :returns: the id of the job.
+    """
+    job_id = uuid.uuid4().hex
+    cls = type(action)
+    job = {
+        'id': job_id,
+        'action': '%s.%s' % (cls.__module__, cls.__qualname__),
+        'name': str(action._get_action_name(objects)),
+        'user_id': request.user.id,
+        'project_id': request.user.project_id,
+        'language': translation.get_language(),
+        'status': QUEUED,
+        'objects': [(obj_id, str(display)) for obj_id, display in objects],
+        'total': len(objects),
+        'done': 0,
+        'succeeded': [],
+        'failed': [],
+        'created_at': time.time(),
+        'started_at': None,
+        'finished_at': None,
+    }
+    # The token is kept apart so that it is never returned by the API.
+    auth = {key: request.session.get(key)
+            for key in ('token', 'region_endpoint', 'services_region')}
+    cache.set(_auth_key(job_id), auth, _auth_timeout(request))
+    _save(job)
+
+    # Should the tail be evicted, the queue goes on after the head, where
+    # the workers look for new jobs.
+    cache.add(TAIL_KEY, cache.get(HEAD_KEY, 1) - 1, None)
+    position = cache.incr(TAIL_KEY)
+    cache.set(_slot_key(position), job_id, settings.BATCH_JOB_TIMEOUT)
+
+    request.session[SESSION_KEY] = request.session.get(SESSION_KEY, []) + [
+        job_id]
+    LOG.info('Queued batch job %(id)s: %(name)s on %(total)s items', job)
+    return job_id
+
+
+def _public(job):
+    return {key: value for key, value in job.items() if key != 'objects'}
+
+
+def get_job(request, job_id):
+    """Return the job queued by the user of the request, or None."""
+    job = cache.get(_job_key(job_id))
+    if job is None or job['user_id'] != request.user.id:
+        return None
+    return _public(job)
+
+
+def has_jobs(request):
+    """Whether the user has jobs whose end was not reported yet."""
+    return bool(request.session.get(SESSION_KEY))
+
+
+def get_jobs(request):
+    """Return the jobs of the user whose end was not reported yet.
+
+    The finished jobs are returned once only: they are forgotten by the
+    session once they are returned.
+    """
+    jobs = []
+    pending = []
+    for job_id in request.session.get(SESSION_KEY, []):
+        job = get_job(request, job_id)
+        if job is None:
+            continue
+        jobs.append(job)
+        if job['status'] != FINISHED:
+            pending.append(job_id)
+    if pending != request.session.get(SESSION_KEY):
+        request.session[SESSION_KEY] = pending
+    return jobs
+
+
+def _job_request(auth):
+    # The API wrappers only need the user built from the token of the
+    # session, and somewhere to add the messages of exceptions.handle().
+    request = http.HttpRequest()
+    request.session = dict(auth)
+    request.user = auth_user.create_user_from_token(
+        request, auth['token'], auth['region_endpoint'],
+        auth['services_region'])
+    request._messages = default_storage(request)
+    return request
+
+
+def _claim(job_id):
+    return cache.add(_claim_key(job_id), os.getpid(),
+                     settings.BATCH_JOB_TIMEOUT)
+
+
+def _past_deadline(position):
+    """Whether the workers give up on an empty position of the queue."""
+    cache.add(_deadline_key(position), time.time() + SLOT_DEADLINE,
+              settings.BATCH_JOB_TIMEOUT)
+    deadline = cache.get(_deadline_key(position))
+    return deadline is None or time.time() >= deadline
+
+
+def claim_next():
+    """Claim the oldest job not claimed by another worker yet.
+
+    :returns: the id of the job or None if there is no job to run.
+    """
+    head = cache.get(HEAD_KEY, 1)
+    tail = cache.get(TAIL_KEY, 0)
+    advance = True
+    for position in range(head, tail + 1):
+        job_id = cache.get(_slot_key(position))
+        if job_id is None:
+            if not _past_deadline(position):
+                # The job is still being queued, it is looked at again the
+                # next time.
+                advance = False
+            elif advance:
+                cache.set(HEAD_KEY, position + 1, None)
+            continue
+        # The jobs are claimed by id rather than by position, so that the
+        # positions taken again after the tail is evicted are not
+        # mistaken for claimed ones.
+        claimed = _claim(job_id)
+        # The jobs before the first one still being queued are all claimed
+        # and never looked at again.
+        if advance:
+            cache.set(HEAD_KEY, position + 1, None)
+        if claimed:
+            return job_id
+    return None
+
+
+def _take_action(action, request, obj_id, language):
+    with translation.override(language):
+        action.action(request, obj_id)
+
+
+def run_job(job_id):
+    """Take the batch action of a job on its objects."""
+    job = cache.get(_job_key(job_id))
+    if job is None:
+        LOG.warning('Batch job %s expired before it was run', job_id)
+        return None
+    auth = cache.get(_auth_key(job_id))
+    job.update(status=RUNNING, started_at=time.time())
+    _save(job)
+    LOG.info('Running batch job %(id)s: %(name)s on %(total)s items', job)
+
+    try:
+        if auth is None:
+            raise exceptions.NotAuthenticated(
+                'The token of the user expired before the job was run')
+        request = _job_request(auth)
+        action = import_string(job['action'])()
+    except Exception as ex:
+        LOG.error('Unable to run batch job %(id)s: %(reason)s',
+                  {'id': job_id, 'reason': ex})
+        job['failed'] = [(display, str(ex))
+                         for obj_id, display in job['objects']]
+        job['done'] = job['total']
+    else:
+        _take_actions(job, action, request)
+    job.update(status=FINISHED, finished_at=time.time())
+    _save(job)
+    cache.delete(_auth_key(job_id))
+    LOG.info('Finished batch job %(id)s: %(name)s', job)
+    return job
+
+
+def _take_actions(job, action, request):
+    executor = futurist.ThreadPoolExecutor(
+        max_workers=max(action.concurrency, 1))
+    try:
+        futures = {}
+        for obj_id, display in job['objects']:
+            future = executor.submit(_take_action, action, request, obj_id,
+                                     job['language'])
+            futures[future] = display
+        saved_at = time.time()
+        not_done = set(futures)
+        while not_done:
+            done, not_done = waiters.wait_for_any(not_done)
+            for future in done:
+                ex = future.exception()
+                if ex is None:
+                    job['succeeded'].append(futures[future])
+                else:
+                    if isinstance(ex, exceptions.HandledException):
+                        ex = ex.wrapped[1]
+                    job['failed'].append((futures[future], str(ex)))
+                    LOG.warning('Batch job %(id)s failed for %(obj)s: '
+                                '%(reason)s', {'id': job['id'],
+                                               'obj': futures[future],
+                                               'reason': ex})
+            job['done'] = len(job['succeeded']) + len(job['failed'])
+            if time.time() - saved_at >= PROGRESS_INTERVAL:
+                _save(job)
+                saved_at = time.time()
+    finally:
+        executor.shutdown()
+
+
+def run_pending():
+    """Run the queued jobs until there is none left.
+
+    :returns: the number of jobs run.
+    """
+    count = 0
+    job_id = claim_next()
+    while job_id is not None:
+        run_job(job_id)
+        count += 1
+        job_id = claim_next()
+    return count
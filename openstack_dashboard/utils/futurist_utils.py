@@ -10,14 +10,119 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import functools
+import logging
+import os
+import threading
 
+from django.conf import settings
 import futurist
+from futurist import rejection
+from futurist import waiters
 
 
-def call_functions_parallel(*worker_defs):
+LOG = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+_counters = collections.Counter()
+_counters_lock = threading.Lock()
+
+
+def _count(name):
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def get_executor():
+    """Return the process-wide executor, creating it on first use.
+
+    The pool has at most API_PARALLEL_MAX_WORKERS threads and rejects
+    submissions once API_PARALLEL_MAX_BACKLOG of them are waiting for
+    a thread. It is created lazily, and again in a forked child process,
+    so that the threads are never shared across a fork.
+    """
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = futurist.ThreadPoolExecutor(
+                    max_workers=settings.API_PARALLEL_MAX_WORKERS,
+                    check_and_reject=rejection.reject_when_reached(
+                        settings.API_PARALLEL_MAX_BACKLOG))
+                _executor_pid = pid
+    return _executor
+
+
+def get_statistics():
+    """Return the saturation metrics of the process-wide executor.
+
+    :returns: a dict with the configured ``max_workers`` and
+        ``max_backlog``, the current number of ``workers`` and of
+        ``queued`` functions, the number of functions ``submitted`` to
+        the pool, ``rejected`` because its backlog was full or run
+        ``inline`` because the caller was a pool thread itself, and the
+        number of functions ``executed`` by the pool and their
+        ``failures`` and ``average_runtime``.
+    """
+    with _counters_lock:
+        stats = {name: _counters[name]
+                 for name in ('submitted', 'rejected', 'inline')}
+    stats.update(max_workers=settings.API_PARALLEL_MAX_WORKERS,
+                 max_backlog=settings.API_PARALLEL_MAX_BACKLOG,
+                 workers=0, queued=0, executed=0, failures=0,
+                 average_runtime=0.0)
+    executor = _executor
+    if executor is not None and _executor_pid == os.getpid():
+        statistics = executor.statistics
+        stats.update(workers=executor.num_workers,
+                     queued=executor.queue_size,
+                     executed=statistics.executed,
+                     failures=statistics.failures)
+        if statistics.executed or statistics.failures:
+            stats['average_runtime'] = statistics.average_runtime
+    return stats
+
+
+def _run_in_worker(func):
+    _worker.active = True
+    try:
+        return func()
+    finally:
+        _worker.active = False
+
+
+def _submit(inline_executor, func):
+    # A function which is already running on the pool must not wait for
+    # functions queued behind it on the same bounded pool, so nested
+    # calls are run in the calling thread.
+    if getattr(_worker, 'active', False):
+        _count('inline')
+        return inline_executor.submit(func)
+    try:
+        future = get_executor().submit(_run_in_worker, func)
+    except futurist.RejectedSubmission:
+        LOG.warning("The API call thread pool is saturated (%s queued "
+                    "functions), running the function in the calling "
+                    "thread.", settings.API_PARALLEL_MAX_BACKLOG)
+        _count('rejected')
+        return inline_executor.submit(func)
+    _count('submitted')
+    return future
+
+
+def call_functions_parallel(*worker_defs, timeout=None):
     """Call specified functions in parallel.
 
+    The functions run on a process-wide pool of at most
+    API_PARALLEL_MAX_WORKERS threads shared by all requests. A function
+    is run in the calling thread instead if the pool backlog is full or
+    if the caller is itself running on the pool.
+
     :param *worker_defs: Each positional argument can be either of
         a function to be called or a tuple which consists of a function,
         a list of positional arguments) and keyword arguments (optional).
@@ -27,24 +132,29 @@ def call_functions_parallel(*worker_defs):
            call_functions_parallel(func1, (func2, [1, 2]))
            call_functions_parallel((func1, [], {'a': 1}),
                                    (func2, [], {'a': 2, 'b': 10}))
+    :param timeout: (optional) the number of seconds to wait for
+        the functions to complete. None is returned for a function which
+        does not complete in time. Such a function is cancelled if it has
+        not started yet, so that the shared pool skips it instead of
+        calling it for nobody, otherwise it keeps running in the
+        background but the caller no longer waits for it.
+        If not specified, the caller waits until all functions complete.
     :returns: a tuple of values returned from individual functions.
         None is returned if a corresponding function does not return.
         It is better to return values other than None from individual
         functions.
     """
-    # TODO(amotoki): Needs to figure out what max_workers can be specified.
-    # According to e0ne, the apache default configuration in devstack  allows
-    # only 10 threads. What happens if max_worker=11 is specified?
-    max_workers = len(worker_defs)
-    # Prepare a list with enough length.
-    futures = [None] * len(worker_defs)
-    with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
-        for index, func_def in enumerate(worker_defs):
-            if callable(func_def):
-                func_def = [func_def]
-            args = func_def[1] if len(func_def) > 1 else []
-            kwargs = func_def[2] if len(func_def) > 2 else {}
-            func = functools.partial(func_def[0], *args, **kwargs)
-            futures[index] = e.submit(fn=func)
-
-    return tuple(f.result() for f in futures)
+    inline_executor = futurist.SynchronousExecutor()
+    futures = []
+    for func_def in worker_defs:
+        if callable(func_def):
+            func_def = [func_def]
+        args = func_def[1] if len(func_def) > 1 else []
+        kwargs = func_def[2] if len(func_def) > 2 else {}
+        func = functools.partial(func_def[0], *args, **kwargs)
+        futures.append(_submit(inline_executor, func))
+    done, not_done = waiters.wait_for_all(futures, timeout=timeout)
+    for future in not_done:
+        future.cancel()
+
+    return tuple(f.result() if f in done else None for f in futures)
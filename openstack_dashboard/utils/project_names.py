@@ -0,0 +1,110 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Index of the names of projects by their id.
+
+The admin views show the name of the project of each listed resource.
+Instead of listing every project on each page view, the names are looked
+up for the project ids of the listed resources only and kept in the Django
+cache for PROJECT_NAMES_CACHE_TIMEOUT seconds, for the token of the user
+who looked them up.
+"""
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from keystoneclient import exceptions as keystone_exceptions
+
+from openstack_dashboard.api import keystone
+from openstack_dashboard.utils import futurist_utils
+
+LOG = logging.getLogger(__name__)
+
+KEY_PREFIX = 'project-names'
+
+# Cached for the ids of the projects which do not exist (anymore), since
+# None cannot be told apart from a cache miss.
+_NOT_FOUND = ''
+
+# When more names than this are missing from the cache, listing all the
+# projects at once is cheaper than looking each of them up.
+LIST_THRESHOLD = 100
+
+
+def _key_prefix(request):
+    scope = (request.user.endpoint, request.user.token.id)
+    return '%s:%s' % (
+        KEY_PREFIX, hashlib.sha256(repr(scope).encode('utf-8')).hexdigest())
+
+
+def _get_chunk(request, project_ids):
+    names = {}
+    for project_id in project_ids:
+        try:
+            names[project_id] = keystone.tenant_get(request, project_id,
+                                                    admin=True).name
+        except keystone_exceptions.NotFound:
+            names[project_id] = _NOT_FOUND
+    return names
+
+
+def _lookup(request, project_ids):
+    if len(project_ids) > LIST_THRESHOLD:
+        projects, __ = keystone.tenant_list(request)
+        names = dict.fromkeys(project_ids, _NOT_FOUND)
+        names.update((project.id, project.name) for project in projects)
+        return names
+
+    # The lookups are split in as many chunks as there are threads in the
+    # pool, so that a page never holds more than its share of the pool.
+    count = min(len(project_ids), settings.API_PARALLEL_MAX_WORKERS)
+    chunks = futurist_utils.call_functions_parallel(
+        *[(_get_chunk, [request, project_ids[i::count]])
+          for i in range(count)])
+    names = {}
+    for chunk in chunks:
+        names.update(chunk)
+    return names
+
+
+def get_names(request, project_ids):
+    """Return the names of projects by their id.
+
+    :param request: the request of an admin user.
+    :param project_ids: the ids of the projects, which may contain
+        duplicates and None.
+    :returns: a dict of the project names by project id. The ids of the
+        projects which do not exist are left out.
+    """
+    requested = set(filter(None, project_ids))
+    if not requested:
+        return {}
+    timeout = settings.PROJECT_NAMES_CACHE_TIMEOUT
+    prefix = _key_prefix(request)
+    names = {}
+    if timeout:
+        cached = cache.get_many(['%s:%s' % (prefix, project_id)
+                                 for project_id in requested])
+        names = {key[len(prefix) + 1:]: name for key, name in cached.items()}
+
+    missing = sorted(requested.difference(names))
+    if missing:
+        LOG.debug('Looking up the names of %s projects', len(missing))
+        found = _lookup(request, missing)
+        if timeout:
+            cache.set_many({'%s:%s' % (prefix, project_id): name
+                            for project_id, name in found.items()}, timeout)
+        names.update(found)
+    return {project_id: name for project_id, name in names.items()
+            if name != _NOT_FOUND and project_id in requested}
@@ -0,0 +1,147 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Short-lived cache of the quota limits and usage of projects.
+
+The values are kept in the Django cache for QUOTA_LIMITS_CACHE_TIMEOUT
+seconds and shared by all the users of a project, so that pages polled by
+many users do not query Nova, Cinder and Neutron on every request.
+
+Cached values are versioned by a per-project and a global generation
+number: bumping a generation invalidates every value cached before it
+without having to know their keys.
+"""
+
+import functools
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = 'quota-limits'
+GLOBAL_GENERATION_KEY = KEY_PREFIX + ':generation'
+
+
+def _generation_key(tenant_id):
+    return '%s:%s:generation' % (KEY_PREFIX, tenant_id)
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get(tenant_id, name, fetch):
+    """Return the cached value, calling fetch() to retrieve it if needed.
+
+    :param tenant_id: the project the value belongs to.
+    :param name: the name of the value, unique within the project.
+    :param fetch: a callable without arguments which retrieves the value.
+    """
+    timeout = settings.QUOTA_LIMITS_CACHE_TIMEOUT
+    if not timeout:
+        return fetch()
+
+    generation_key = _generation_key(tenant_id)
+    generations = cache.get_many([GLOBAL_GENERATION_KEY, generation_key])
+    key = '%s:%s:%s:%s:%s' % (KEY_PREFIX, tenant_id,
+                              generations.get(GLOBAL_GENERATION_KEY, 0),
+                              generations.get(generation_key, 0), name)
+    value = cache.get(key)
+    if value is None:
+        value = fetch()
+        cache.set(key, value, timeout)
+    return value
+
+
+def invalidate(tenant_id):
+    """Invalidate the values cached for a project."""
+    if settings.QUOTA_LIMITS_CACHE_TIMEOUT:
+        _bump(_generation_key(tenant_id))
+
+
+def invalidate_all():
+    """Invalidate the values cached for all projects."""
+    if settings.QUOTA_LIMITS_CACHE_TIMEOUT:
+        _bump(GLOBAL_GENERATION_KEY)
+
+
+# The attributes holding the project which owns a resource returned by the
+# API wrappers, by service.
+_OWNER_ATTRS = ('tenant_id', 'project_id', 'os-vol-tenant-attr:tenant_id',
+                'os-extended-snapshot-attributes:project_id')
+
+
+def _get_owner(resource):
+    # Only the fields already retrieved are looked at, since getting a
+    # missing attribute of a client resource loads it again.
+    resource = getattr(resource, '_apiresource', None) or resource
+    info = resource
+    if not isinstance(info, dict):
+        info = getattr(resource, '_info', None)
+    if not isinstance(info, dict):
+        info = getattr(resource, '_apidict', None)
+    if not isinstance(info, dict):
+        return None
+    for attr in _OWNER_ATTRS:
+        owner = info.get(attr)
+        if isinstance(owner, str) and owner:
+            return owner
+    return None
+
+
+def _invalidate_owner(request, result, kwargs, existing):
+    owner = (_get_owner(result) or kwargs.get('tenant_id') or
+             kwargs.get('project_id'))
+    if owner:
+        invalidate(owner)
+    elif existing and getattr(request.user, 'is_superuser', False):
+        # An admin may act on the resources of any project, and the project
+        # owning the resource is not known without looking it up.
+        invalidate_all()
+    else:
+        invalidate(request.user.tenant_id)
+
+
+def invalidates(func):
+    """Decorate an API function which creates a resource.
+
+    After the function succeeds the values cached for the project owning
+    the returned resource, or else the project given by its tenant_id or
+    project_id keyword argument, or else the current project, are
+    invalidated.
+    """
+    @functools.wraps(func)
+    def wrapped(request, *args, **kwargs):
+        result = func(request, *args, **kwargs)
+        if settings.QUOTA_LIMITS_CACHE_TIMEOUT:
+            _invalidate_owner(request, result, kwargs, existing=False)
+        return result
+    return wrapped
+
+
+def invalidates_owner(func):
+    """Decorate an API function which changes or deletes a resource.
+
+    Like :func:`invalidates`, except that the resource may belong to
+    another project than the current one when the user is an admin: the
+    values cached for all projects are then invalidated, unless the
+    function returns the resource.
+    """
+    @functools.wraps(func)
+    def wrapped(request, *args, **kwargs):
+        result = func(request, *args, **kwargs)
+        if settings.QUOTA_LIMITS_CACHE_TIMEOUT:
+            _invalidate_owner(request, result, kwargs, existing=True)
+        return result
+    return wrapped
@@ -0,0 +1,200 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cache of the Nova usage of closed periods.
+
+The usage of a period which ended does not change anymore, but Nova
+computes it again, page by page, on every request. The API functions
+decorated with :func:`cached` keep the usage of such periods in the Django
+cache for USAGE_CACHE_TIMEOUT seconds, by Keystone endpoint and region and
+by the exact start and end of the period. The usage of the current period
+is always retrieved from Nova.
+
+The usage of all the projects of a big cloud takes several MB, more than
+the 1 MB a memcached item holds by default, and a value the cache refuses
+is dropped without any error. The usage is therefore stored as JSON split
+in chunks of at most CHUNK_SIZE bytes, under an entry recording the chunks,
+and a usage with a missing chunk is retrieved from Nova again.
+
+The ``warm_usage_cache`` management command of the custom_reports
+dashboard fills the cache for the previous months in the background.
+"""
+
+import datetime
+import functools
+import hashlib
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from novaclient.v2 import usage as nova_usage
+
+KEY_PREFIX = 'nova-usage'
+
+# A period is considered closed once it ended for this long, so that the
+# usage recorded by Nova for its last moments is complete even if the clock
+# of Nova is a bit late.
+SETTLE_TIME = datetime.timedelta(hours=1)
+
+# Half of the default item size limit of memcached, which leaves room for
+# the key and the overhead of the cache backend.
+CHUNK_SIZE = 512 * 1024
+
+
+def is_closed(end):
+    """Whether the usage of a period ending at end can be cached.
+
+    :param end: the naive UTC end of the period, as passed to Nova.
+    """
+    if not isinstance(end, datetime.datetime):
+        return False
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return end + SETTLE_TIME <= now
+
+
+def is_cacheable(end):
+    """Whether the usage of a period ending at end is kept in the cache."""
+    return bool(settings.USAGE_CACHE_TIMEOUT) and is_closed(end)
+
+
+def _get_key(request, name, args):
+    scope = (request.user.endpoint, request.user.services_region,
+             name, [str(arg) for arg in args])
+    return '%s:%s' % (
+        KEY_PREFIX, hashlib.sha256(repr(scope).encode('utf-8')).hexdigest())
+
+
+def _dump_usage(usage):
+    return {attr: getattr(usage, attr) for attr in usage._attrs
+            if hasattr(usage, attr)}
+
+
+def _load_usage(info, elapsed, wrapper):
+    usage = wrapper(nova_usage.Usage(None, info, loaded=True))
+    # The uptime of the servers still running is counted until the time
+    # the usage was retrieved.
+    for server_usage in getattr(usage, 'server_usages', []):
+        if not server_usage.get('ended_at') and 'uptime' in server_usage:
+            server_usage['uptime'] += elapsed
+    return usage
+
+
+def _dump(value):
+    if isinstance(value, list):
+        return [_dump_usage(usage) for usage in value]
+    return _dump_usage(value)
+
+
+def _load(value, wrapper):
+    info, fetched_at = value
+    elapsed = max(int(time.time() - fetched_at), 0)
+    if isinstance(info, list):
+        return [_load_usage(usage, elapsed, wrapper) for usage in info]
+    return _load_usage(info, elapsed, wrapper)
+
+
+def _get_chunk_keys(key, entry):
+    return ['%s:%s:%s' % (key, entry['token'], index)
+            for index in range(entry['chunks'])]
+
+
+def _read(request, name, args):
+    key = _get_key(request, name, args)
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    chunk_keys = _get_chunk_keys(key, entry)
+    chunks = cache.get_many(chunk_keys)
+    if len(chunks) != len(chunk_keys):
+        return None
+    data = b''.join(chunks[chunk_key] for chunk_key in chunk_keys)
+    return json.loads(data.decode('utf-8')), entry['fetched_at']
+
+
+def get(request, name, args, wrapper):
+    """Return the cached usage of an API function for its arguments.
+
+    :returns: the usage or the list of usages, or None if the usage of the
+        period is not cached.
+    """
+    if not is_cacheable(args[-1]):
+        return None
+    value = _read(request, name, args)
+    if value is None:
+        return None
+    return _load(value, wrapper)
+
+
+def store(request, name, args, value):
+    """Cache the usage returned by an API function for its arguments.
+
+    :param name: the name of the decorated API function, such as
+        ``nova.usage_get``.
+    :param args: the arguments of the call after the request, the end of
+        the period being the last one.
+    :param value: the usage or the list of usages returned by the call.
+    """
+    if not is_cacheable(args[-1]):
+        return
+    key = _get_key(request, name, args)
+    data = json.dumps(_dump(value)).encode('utf-8')
+    # The chunks of each value have their own keys, so that the chunks of
+    # a value stored concurrently for the same usage are never mixed up.
+    entry = {'token': uuid.uuid4().hex,
+             'chunks': (len(data) + CHUNK_SIZE - 1) // CHUNK_SIZE,
+             'fetched_at': time.time()}
+    chunk_keys = _get_chunk_keys(key, entry)
+    cache.set_many({chunk_key: data[index * CHUNK_SIZE:
+                                    (index + 1) * CHUNK_SIZE]
+                    for index, chunk_key in enumerate(chunk_keys)},
+                   settings.USAGE_CACHE_TIMEOUT)
+    cache.set(key, entry, settings.USAGE_CACHE_TIMEOUT)
+
+
+def is_stored(request, name, args):
+    """Whether the usage of an API function for its arguments is cached.
+
+    The cache does not report the values it refuses to store, so this
+    checks that the entry and all of its chunks can be read back.
+    """
+    key = _get_key(request, name, args)
+    entry = cache.get(key)
+    if entry is None:
+        return False
+    chunk_keys = _get_chunk_keys(key, entry)
+    return len(cache.get_many(chunk_keys)) == len(chunk_keys)
+
+
+def cached(wrapper):
+    """Decorate an API function which returns the usage of a period.
+
+    The positional arguments of the function after the request identify
+    the usage, and the last one is the naive UTC end of the period.
+
+    :param wrapper: the class the usages returned by the function are
+        wrapped in, such as ``NovaUsage``.
+    """
+    def decorate(func):
+        name = '%s.%s' % (func.__module__.rsplit('.', 1)[-1], func.__name__)
+
+        @functools.wraps(func)
+        def wrapped(request, *args):
+            value = get(request, name, args, wrapper)
+            if value is not None:
+                return value
+            value = func(request, *args)
+            store(request, name, args, value)
+            return value
+        return wrapped
+    return decorate
@@ -27,3 +27,8 @@ os.environ['DJANGO_SETTINGS_MODULE'] = 'openstack_dashboard.settings'
 sys.stdout = sys.stderr
 
 application = get_wsgi_application()
+
+# Load the policy rules before the first request rather than under load.
+from openstack_dashboard import policy  # noqa: E402
+
+policy.init()
@@ -0,0 +1,85 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tool to time the policy checks of the row actions of the instances table.
+
+The checks done when the row actions are rendered are timed with and
+without the results remembered by openstack_auth.policy.check() for the
+rest of the request. Nothing is asserted: the timings depend on the host.
+
+    PYTHONPATH=. python tools/policy-benchmark.py --rows 500
+"""
+
+import argparse
+import os
+import timeit
+import types
+
+import django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200,
+                        help='Number of instances in the table')
+    parser.add_argument('--projects', type=int, default=2,
+                        help='Number of projects owning the instances')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of times the rendering is timed')
+    parsed_args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                          'openstack_dashboard.test.settings')
+    django.setup()
+
+    from django.test import client
+    from openstack_auth import policy
+    from openstack_auth import user
+
+    from openstack_dashboard.dashboards.project.instances import tables
+
+    request = client.RequestFactory().get('/')
+    request.session = {}
+    # The user is looked up once per request and token by the policy
+    # check, and there is no token here.
+    request._policy_user = (None, user.User(
+        id='user', project_id='project-0',
+        roles=[{'id': '1', 'name': 'member'}]))
+    servers = [types.SimpleNamespace(id='server-%s' % i,
+                                     tenant_id='project-%s' %
+                                     (i % parsed_args.projects),
+                                     user_id='user')
+               for i in range(parsed_args.rows)]
+    actions = [action for action in
+               tables.InstancesTable(request, servers).base_actions.values()
+               if action.policy_rules]
+
+    def render_row_actions(remembered):
+        request.__dict__.pop('_policy_check_results', None)
+        for server in servers:
+            for action in actions:
+                if not remembered:
+                    request.__dict__.pop('_policy_check_results', None)
+                policy.check(action.policy_rules, request,
+                             action.get_policy_target(request, server))
+
+    policy.init()
+    for remembered in (False, True):
+        timing = min(timeit.repeat(lambda: render_row_actions(remembered),
+                                   number=1, repeat=parsed_args.repeat))
+        print('%-12s %d rows, %d actions: %.4fs' % (
+            'remembered' if remembered else 'baseline',
+            len(servers), len(actions), timing))
+
+
+if __name__ == '__main__':
+    main()